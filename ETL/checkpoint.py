@@ -0,0 +1,158 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+DEFAULT_STATE_DIR = Path(".etl_state")
+
+
+def file_fingerprint(file_path: Path, block_size: int = 1024 * 1024) -> str:
+    """
+    Compute the SHA-256 fingerprint of a file, reading it by blocks.
+
+    Args:
+        file_path (Path): Path to the file.
+        block_size (int): Number of bytes read at once.
+
+    Returns:
+        str: Hex SHA-256 digest of the file content.
+    """
+    digest = hashlib.sha256()
+    with file_path.open("rb") as f:
+        while block := f.read(block_size):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class IngestState:
+    """
+    Persistent ingestion state of one source file, stored as JSON in the
+    state directory.
+
+    It records the fingerprint of the last fully loaded version of the file
+    and, for each committed chunk, the digest of its content. A load that
+    is interrupted resumes after the last committed chunk, and a chunk whose
+    content did not change since the previous load is skipped.
+
+    Attributes:
+        path (Path): Location of the JSON state file.
+        fingerprint (str | None): Fingerprint of the last complete load.
+        chunk_size (int | None): Chunk size the digests were computed with.
+        chunks (dict[str, str]): Chunk index -> digest of committed chunks.
+        committed_rows (int): Rows committed by the current or last load.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.fingerprint = None
+        self.chunk_size = None
+        self.chunks = {}
+        self.committed_rows = 0
+
+    @classmethod
+    def load(cls, file_path: Path, state_dir: Path = DEFAULT_STATE_DIR):
+        """
+        Load the state of a source file, or an empty state if there is none.
+
+        Args:
+            file_path (Path): Path to the source file.
+            state_dir (Path): Directory holding the state files.
+
+        Returns:
+            IngestState: The ingestion state of the file.
+        """
+        resolved = str(file_path.resolve())
+        key = hashlib.sha1(resolved.encode("utf-8")).hexdigest()[:12]
+        state = cls(state_dir / f"{file_path.stem}-{key}.json")
+
+        if state.path.exists():
+            data = json.loads(state.path.read_text(encoding="utf-8"))
+            state.fingerprint = data.get("fingerprint")
+            state.chunk_size = data.get("chunk_size")
+            state.chunks = data.get("chunks", {})
+            state.committed_rows = data.get("committed_rows", 0)
+        return state
+
+    def is_unchanged(self, fingerprint: str) -> bool:
+        """
+        Tell whether the file was already fully loaded with this content.
+
+        Args:
+            fingerprint (str): Current fingerprint of the file.
+
+        Returns:
+            bool: True if the previous load was complete and identical.
+        """
+        return self.fingerprint == fingerprint
+
+    def start(self, chunk_size: int) -> None:
+        """
+        Prepare the state for a new load. Chunk digests are only reusable
+        when the file is cut in chunks of the same size.
+
+        Args:
+            chunk_size (int): Chunk size of the new load.
+        """
+        if self.chunk_size != chunk_size:
+            self.chunks = {}
+            self.chunk_size = chunk_size
+        self.fingerprint = None
+        self.committed_rows = 0
+
+    def is_committed(self, index: int, digest: str) -> bool:
+        """
+        Tell whether a chunk with this content was already committed.
+
+        Args:
+            index (int): Position of the chunk in the file.
+            digest (str): Digest of the chunk content.
+
+        Returns:
+            bool: True if the chunk can be skipped.
+        """
+        return self.chunks.get(str(index)) == digest
+
+    def commit_chunk(self, index: int, digest: str, rows: int) -> None:
+        """
+        Checkpoint a chunk once its transaction is committed.
+
+        Args:
+            index (int): Position of the chunk in the file.
+            digest (str): Digest of the chunk content.
+            rows (int): Number of rows in the chunk.
+        """
+        self.chunks[str(index)] = digest
+        self.committed_rows += rows
+        self.save()
+
+    def finish(self, fingerprint: str, chunk_count: int) -> None:
+        """
+        Mark the load as complete, dropping digests of chunks beyond the end
+        of the file.
+
+        Args:
+            fingerprint (str): Fingerprint of the loaded file.
+            chunk_count (int): Number of chunks in the file.
+        """
+        self.chunks = {k: v for k, v in self.chunks.items() if int(k) < chunk_count}
+        self.fingerprint = fingerprint
+        self.save()
+
+    def save(self) -> None:
+        """
+        Atomically write the state file.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(
+            json.dumps(
+                {
+                    "fingerprint": self.fingerprint,
+                    "chunk_size": self.chunk_size,
+                    "chunks": self.chunks,
+                    "committed_rows": self.committed_rows,
+                }
+            ),
+            encoding="utf-8",
+        )
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,241 @@
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Awaitable, Callable, List
+
+from msio.backend.core.parser import (
+    DEFAULT_CHUNK_SIZE,
+    MetaboliteInput,
+    UniquenessTracker,
+    check_chunk,
+    iter_raw_chunks,
+    validate_chunk,
+)
+
+# Chunks waiting between two stages. Bounds the memory of the pipeline: a
+# stage blocks when the next one does not keep up.
+DEFAULT_QUEUE_SIZE = 4
+DEFAULT_LOADERS = 2
+
+# Writes one validated chunk to the database, in its own transaction.
+ChunkWriter = Callable[[List[MetaboliteInput]], Awaitable[None]]
+
+
+class StageStats:
+    """
+    Throughput and input queue depth of one pipeline stage.
+
+    Attributes:
+        name (str): Stage name.
+        concurrency (int): Number of tasks or processes running the stage.
+        chunks (int): Chunks processed.
+        rows (int): Rows processed.
+        busy (float): Seconds spent processing, summed over the tasks.
+    """
+
+    def __init__(self, name: str, concurrency: int = 1):
+        self.name = name
+        self.concurrency = concurrency
+        self.chunks = 0
+        self.rows = 0
+        self.busy = 0.0
+        self._depth_total = 0
+        self._depth_max = 0
+
+    def record(self, rows: int, seconds: float) -> None:
+        """
+        Count a processed chunk.
+
+        Args:
+            rows (int): Rows of the chunk.
+            seconds (float): Time spent processing it.
+        """
+        self.chunks += 1
+        self.rows += rows
+        self.busy += seconds
+
+    def sample(self, queue: asyncio.Queue) -> None:
+        """
+        Record the depth of the input queue, when the stage takes a chunk.
+
+        Args:
+            queue (asyncio.Queue): Input queue of the stage.
+        """
+        depth = queue.qsize()
+        self._depth_total += depth
+        self._depth_max = max(self._depth_max, depth)
+
+    @property
+    def rows_per_second(self) -> float:
+        """
+        Rows/s the stage sustains on its own, all its tasks together.
+        """
+        return self.rows * self.concurrency / self.busy if self.busy else 0.0
+
+    def summary(self) -> str:
+        mean_depth = self._depth_total / self.chunks if self.chunks else 0.0
+        return (
+            f"{self.name:<10} x{self.concurrency:<3} {self.rows:>10} rows "
+            f"{self.busy:>8.2f}s busy {self.rows_per_second:>12,.0f} rows/s  "
+            f"queue mean={mean_depth:.1f} max={self._depth_max}"
+        )
+
+
+def timed_validate_chunk(rows: list) -> tuple[list, float]:
+    """
+    `validate_chunk`, also returning its duration as measured in the
+    executor, so time spent waiting for a worker is not counted.
+    """
+    started = time.perf_counter()
+    results = validate_chunk(rows)
+    return results, time.perf_counter() - started
+
+
+def report_stages(stages: List[StageStats], elapsed: float) -> None:
+    """
+    Print the statistics of each stage and the slowest one. The input queue
+    of the bottleneck stays full, the queues after it stay empty.
+
+    Args:
+        stages (List[StageStats]): Statistics of the stages, in order.
+        elapsed (float): Wall-clock duration of the pipeline, in seconds.
+    """
+    for stage in stages:
+        print(stage.summary())
+    slowest = min(stages, key=lambda stage: stage.rows_per_second or float("inf"))
+    print(f"Bottleneck: {slowest.name} ({elapsed:.2f}s wall clock)")
+
+
+async def run_pipeline(
+    csv_path: Path,
+    write_chunk: ChunkWriter,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: int = 1,
+    loaders: int = DEFAULT_LOADERS,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+) -> int:
+    """
+    Load a CSV or .xlsx file through a staged pipeline, so that reading,
+    validation and database writes overlap:
+
+    reader -> validator -> `loaders` loader tasks
+
+    The reader streams raw chunks in a thread. The validator runs
+    `validate_chunk` in an executor (a thread, or `workers` processes) with
+    up to two chunks per worker in flight, then applies the uniqueness
+    checks in file order. Each loader task writes chunks with
+    `write_chunk`. Stages are connected by queues of `queue_size`
+    chunks, so a slow stage holds back the previous ones rather than
+    letting chunks pile up in memory, and the load takes about as long as
+    its slowest stage.
+
+    If a chunk fails, the pipeline is stopped. Whether the chunks already
+    written stay in the database depends on `write_chunk`: they do when it
+    commits each chunk on its own connection (COPY loader), they do not
+    when it writes into a single transaction (ORM loader, one loader).
+
+    Args:
+        csv_path (Path): Path to the CSV or .xlsx file.
+        write_chunk (ChunkWriter): Writes a validated chunk.
+        chunk_size (int): Number of rows per chunk.
+        workers (int): Number of validation processes (1 validates in a
+            thread).
+        loaders (int): Number of concurrent loader tasks.
+        queue_size (int): Capacity of the queues between stages, in chunks.
+
+    Raises:
+        ValueError: If a row is invalid.
+        Exception: The first error raised by a stage.
+
+    Returns:
+        int: Number of rows written.
+    """
+    loop = asyncio.get_running_loop()
+    raw_chunks: asyncio.Queue = asyncio.Queue(queue_size)
+    valid_chunks: asyncio.Queue = asyncio.Queue(queue_size)
+    read_stats = StageStats("read")
+    validate_stats = StageStats("validate", workers)
+    load_stats = StageStats("load", loaders)
+
+    reader_executor = ThreadPoolExecutor(1, thread_name_prefix="etl-reader")
+    validator_executor: Executor = (
+        ProcessPoolExecutor(workers)
+        if workers > 1
+        else ThreadPoolExecutor(1, thread_name_prefix="etl-validator")
+    )
+
+    async def read() -> None:
+        chunks = iter_raw_chunks(csv_path, chunk_size)
+        try:
+            while True:
+                started = time.perf_counter()
+                rows = await loop.run_in_executor(reader_executor, next, chunks, None)
+                if rows is None:
+                    break
+                read_stats.record(len(rows), time.perf_counter() - started)
+                await raw_chunks.put(rows)
+        finally:
+            await loop.run_in_executor(reader_executor, chunks.close)
+        await raw_chunks.put(None)
+
+    async def validate() -> None:
+        tracker = UniquenessTracker()
+        in_flight: deque = deque()
+
+        async def next_done() -> None:
+            rows, future = in_flight.popleft()
+            results, seconds = await future
+            started = time.perf_counter()
+            chunk = check_chunk(rows, results, tracker)
+            seconds += time.perf_counter() - started
+            validate_stats.record(len(rows), seconds)
+            await valid_chunks.put(chunk)
+
+        while True:
+            validate_stats.sample(raw_chunks)
+            rows = await raw_chunks.get()
+            if rows is None:
+                break
+            in_flight.append(
+                (
+                    rows,
+                    loop.run_in_executor(
+                        validator_executor, timed_validate_chunk, rows
+                    ),
+                )
+            )
+            if len(in_flight) >= 2 * workers:
+                await next_done()
+        while in_flight:
+            await next_done()
+        for _ in range(loaders):
+            await valid_chunks.put(None)
+
+    async def load() -> None:
+        while True:
+            load_stats.sample(valid_chunks)
+            chunk = await valid_chunks.get()
+            if chunk is None:
+                return
+            started = time.perf_counter()
+            await write_chunk(chunk)
+            load_stats.record(len(chunk), time.perf_counter() - started)
+
+    started = time.perf_counter()
+    try:
+        async with asyncio.TaskGroup() as group:
+            group.create_task(read())
+            group.create_task(validate())
+            for _ in range(loaders):
+                group.create_task(load())
+    except ExceptionGroup as errors:
+        raise errors.exceptions[0]
+    finally:
+        reader_executor.shutdown(cancel_futures=True)
+        validator_executor.shutdown(cancel_futures=True)
+
+    elapsed = time.perf_counter() - started
+    report_stages([read_stats, validate_stats, load_stats], elapsed)
+    return load_stats.rows
@@ -0,0 +1,309 @@
+import argparse
+import asyncio
+import csv
+import json
+import sys
+from pathlib import Path
+from typing import List, Optional
+from pydantic import ValidationError
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+from msio.backend.core.config import config
+from msio.backend.core.parser import (
+    CSV_COLUMNS,
+    DEFAULT_CHUNK_SIZE,
+    MetaboliteInput,
+    UniqueKeyTracker,
+    iter_raw_chunks,
+)
+from msio.backend.database.models import Metabolite
+from msio.backend.database.validation import validate_batch
+
+# Columns of the report, in the order of the CSV output.
+REPORT_FIELDS = ["line", "kind", "column", "value", "message"]
+
+# Unique metabolite columns looked up in the database, with the file column
+# holding their value.
+DATABASE_KEYS = {
+    "feature": "feature",
+    "inchi_hash": "id_inchi",
+    "cas_number": "cas_number",
+}
+
+
+class ValidationReport:
+    """
+    Every issue found in a file by `validate_file`, with its line number.
+
+    Issue kinds:
+    - invalid: the row does not pass the field validation,
+    - duplicate: a unique identifier of the row (feature, InChI or CAS
+      number) is already used by an earlier row of the file,
+    - database: an identifier of the row already belongs to a metabolite
+      in the database.
+
+    Attributes:
+        file_path (Path): Validated file.
+        rows (int): Rows read.
+        issues (List[dict]): Issues, keyed by `REPORT_FIELDS`.
+    """
+
+    def __init__(self, file_path: Path):
+        self.file_path = file_path
+        self.rows = 0
+        self.issues: List[dict] = []
+
+    def add(
+        self,
+        line: int,
+        kind: str,
+        message: str,
+        column: Optional[str] = None,
+        value=None,
+    ) -> None:
+        """
+        Record an issue.
+
+        Args:
+            line (int): Line number of the row.
+            kind (str): "invalid", "duplicate" or "database".
+            message (str): Description of the issue.
+            column (str | None): Column of the file at fault, if known.
+            value (Any): Value of that column.
+        """
+        self.issues.append(
+            {
+                "line": line,
+                "kind": kind,
+                "column": column,
+                "value": value,
+                "message": message,
+            }
+        )
+
+    def add_validation_error(self, line: int, error: ValidationError) -> None:
+        """
+        Record each field error of a row as its own issue.
+
+        Args:
+            line (int): Line number of the row.
+            error (ValidationError): Validation error of the row.
+        """
+        for detail in error.errors(include_url=False):
+            column = ".".join(str(loc) for loc in detail["loc"]) or None
+            self.add(
+                line,
+                "invalid",
+                detail["msg"],
+                column,
+                detail.get("input") if column else None,
+            )
+
+    @property
+    def invalid_rows(self) -> int:
+        return len({issue["line"] for issue in self.issues})
+
+    def summary(self) -> dict:
+        counts = {}
+        for issue in self.issues:
+            counts[issue["kind"]] = counts.get(issue["kind"], 0) + 1
+        return {
+            "file": str(self.file_path),
+            "rows": self.rows,
+            "invalid_rows": self.invalid_rows,
+            "issues": counts,
+        }
+
+    def write(self, output_path: Path) -> None:
+        """
+        Write the issues sorted by line, as CSV if the output file ends with
+        .csv, otherwise as JSON along with the summary.
+
+        Args:
+            output_path (Path): Report file.
+        """
+        issues = sorted(self.issues, key=lambda issue: issue["line"])
+        if output_path.suffix.lower() == ".csv":
+            with output_path.open("w", newline="", encoding="utf-8") as f:
+                writer = csv.DictWriter(f, fieldnames=REPORT_FIELDS)
+                writer.writeheader()
+                writer.writerows(issues)
+            return
+        with output_path.open("w", encoding="utf-8") as f:
+            json.dump({**self.summary(), "details": issues}, f, indent=2)
+
+
+def check_rows(
+    rows: List[tuple[int, dict]],
+    tracker: UniqueKeyTracker,
+    report: ValidationReport,
+) -> List[tuple[int, MetaboliteInput]]:
+    """
+    Validate a raw chunk, recording every invalid row and uniqueness
+    conflict instead of stopping at the first one.
+
+    Each unique column is checked on its own, as the database does, and a
+    conflict names the line that first used the value.
+
+    Args:
+        rows (List[tuple[int, dict]]): Chunk from `iter_raw_chunks`.
+        tracker (UniqueKeyTracker): Uniqueness state shared by the chunks
+            of the file.
+        report (ValidationReport): Report the issues are added to.
+
+    Returns:
+        List[tuple[int, MetaboliteInput]]: `(line, input)` of the valid rows.
+    """
+    valid = []
+    results = validate_batch(MetaboliteInput, [row for _, row in rows])
+    for (line, _), result in zip(rows, results):
+        if isinstance(result, ValidationError):
+            report.add_validation_error(line, result)
+            continue
+        conflicts = tracker.check(result, line)
+        reported = set()
+        for key, first_line in conflicts.items():
+            if first_line in reported:
+                continue
+            reported.add(first_line)
+            field = DATABASE_KEYS[key]
+            report.add(
+                line,
+                "duplicate",
+                f"{field} already used on line {first_line}",
+                CSV_COLUMNS[field],
+                getattr(result, field),
+            )
+        if not conflicts:
+            valid.append((line, result))
+    return valid
+
+
+async def check_database(
+    engine: AsyncEngine,
+    valid: List[tuple[int, MetaboliteInput]],
+    report: ValidationReport,
+) -> None:
+    """
+    Record the rows whose identifiers already belong to a metabolite in the
+    database, with one query for the whole chunk.
+
+    Args:
+        engine (AsyncEngine): Database engine.
+        valid (List[tuple[int, MetaboliteInput]]): Valid rows of a chunk.
+        report (ValidationReport): Report the issues are added to.
+    """
+    if not valid:
+        return
+
+    values = {
+        key: list({getattr(item, key) for _, item in valid} - {None})
+        for key in DATABASE_KEYS
+    }
+    columns = [Metabolite.__table__.c[key] for key in DATABASE_KEYS]
+    async with engine.connect() as conn:
+        result = await conn.execute(
+            select(Metabolite.id, *columns).where(
+                or_(*(column.in_(values[column.key]) for column in columns))
+            )
+        )
+    owners = {key: {} for key in DATABASE_KEYS}
+    for row in result:
+        for key in DATABASE_KEYS:
+            if getattr(row, key) is not None:
+                owners[key][getattr(row, key)] = row.id
+
+    for line, item in valid:
+        reported = set()
+        for key, field in DATABASE_KEYS.items():
+            value = getattr(item, key)
+            owner = owners[key].get(value) if value is not None else None
+            if owner is None or owner in reported:
+                continue
+            reported.add(owner)
+            report.add(
+                line,
+                "database",
+                f"{field} already used by metabolite {owner}",
+                CSV_COLUMNS[field],
+                getattr(item, field),
+            )
+
+
+async def validate_file(
+    file_path: Path,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    engine: Optional[AsyncEngine] = None,
+) -> ValidationReport:
+    """
+    Validate a whole CSV or .xlsx file in one pass, without loading it.
+
+    Unlike the loaders, which stop at the first error, every invalid row
+    and every uniqueness conflict is recorded, so a single run lists all
+    the corrections to make. With an `engine`, the identifiers of the
+    valid rows are also checked against the database, one query per chunk.
+
+    Args:
+        file_path (Path): Path to the CSV or .xlsx file.
+        chunk_size (int): Number of rows validated and looked up at once.
+        engine (AsyncEngine | None): Database to check identifiers against.
+
+    Returns:
+        ValidationReport: The issues of the file.
+    """
+    report = ValidationReport(file_path)
+    tracker = UniqueKeyTracker()
+    for rows in iter_raw_chunks(file_path, chunk_size):
+        report.rows += len(rows)
+        valid = check_rows(rows, tracker, report)
+        if engine is not None:
+            await check_database(engine, valid, report)
+    return report
+
+
+def parse_args() -> argparse.Namespace:
+    arg_parser = argparse.ArgumentParser(
+        description="Validate a metabolites file and report every issue."
+    )
+    arg_parser.add_argument("csv_path", type=Path)
+    arg_parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("validation_report.json"),
+        help="Report file, written as CSV if it ends with .csv, else JSON.",
+    )
+    arg_parser.add_argument(
+        "--check-db",
+        action="store_true",
+        help="Also report identifiers already used in the database.",
+    )
+    arg_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="Rows validated and looked up per batch.",
+    )
+    return arg_parser.parse_args()
+
+
+async def main(args: argparse.Namespace) -> ValidationReport:
+    if not args.check_db:
+        return await validate_file(args.csv_path, args.batch_size)
+
+    engine = config.create_async_engine()
+    try:
+        return await validate_file(args.csv_path, args.batch_size, engine)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    report = asyncio.run(main(args))
+    report.write(args.output)
+    summary = report.summary()
+    print(
+        f"{summary['rows']} rows, {summary['invalid_rows']} with issues "
+        f"{summary['issues']}. Report written to {args.output}."
+    )
+    sys.exit(1 if report.issues else 0)
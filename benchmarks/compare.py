@@ -0,0 +1,121 @@
+"""
+Compare two benchmark result files written by suite.py.
+
+Every metric present in both files is compared. Throughputs (`*_per_s`)
+regress when they drop, latencies and durations (`*_ms`, `seconds`) when
+they grow, by more than the threshold. The exit status is 1 when a metric
+regresses, so the script can gate a CI job.
+
+Usage:
+    python benchmarks/compare.py benchmarks/results/baseline.json \\
+        benchmarks/results/latest.json --threshold 0.10 --threshold p99_ms=0.25
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+DEFAULT_THRESHOLD = 0.10
+
+
+def direction(metric: str) -> int:
+    """
+    Tell whether a metric is better higher (1), lower (-1) or is not a
+    performance metric (0).
+
+    Args:
+        metric (str): Metric name.
+
+    Returns:
+        int: The direction.
+    """
+    if metric.endswith("_per_s"):
+        return 1
+    if metric.endswith("_ms") or metric == "seconds":
+        return -1
+    return 0
+
+
+def compare(
+    baseline: dict, current: dict, thresholds: dict[str, float], default: float
+) -> tuple[list[tuple], bool]:
+    """
+    Compare the metrics of two result files.
+
+    Args:
+        baseline (dict): Reference results.
+        current (dict): Results to check.
+        thresholds (dict[str, float]): Metric -> tolerated relative change.
+        default (float): Tolerated relative change of the other metrics.
+
+    Returns:
+        tuple[list[tuple], bool]: One (benchmark, metric, baseline, current,
+            relative change, status) row per metric, and whether any metric
+            regressed.
+    """
+    rows = []
+    regressed = False
+    for name in sorted(baseline["results"].keys() & current["results"].keys()):
+        before, after = baseline["results"][name], current["results"][name]
+        for metric in sorted(before.keys() & after.keys()):
+            sign = direction(metric)
+            if sign == 0 or not before[metric]:
+                continue
+            change = (after[metric] - before[metric]) / before[metric]
+            limit = thresholds.get(metric, default)
+            if change * sign < -limit:
+                status = "REGRESSION"
+                regressed = True
+            elif change * sign > limit:
+                status = "improved"
+            else:
+                status = "ok"
+            rows.append((name, metric, before[metric], after[metric], change, status))
+    return rows, regressed
+
+
+def parse_threshold(value: str) -> tuple[str, float]:
+    metric, _, limit = value.rpartition("=")
+    return metric, float(limit)
+
+
+def parse_args() -> argparse.Namespace:
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("baseline", type=Path)
+    arg_parser.add_argument("current", type=Path)
+    arg_parser.add_argument(
+        "--threshold",
+        action="append",
+        type=parse_threshold,
+        default=[],
+        help=(
+            "Tolerated relative change, for every metric (0.10) or for one "
+            "metric (p99_ms=0.25). Can be repeated."
+        ),
+    )
+    return arg_parser.parse_args()
+
+
+def main(args: argparse.Namespace) -> int:
+    thresholds = dict(args.threshold)
+    default = thresholds.pop("", DEFAULT_THRESHOLD)
+    baseline = json.loads(args.baseline.read_text())
+    current = json.loads(args.current.read_text())
+
+    for label, report in (("baseline", baseline), ("current", current)):
+        meta = report["meta"]
+        print(f"{label:<9} {meta.get('commit')} on {meta.get('database')}")
+    if baseline["meta"].get("platform") != current["meta"].get("platform"):
+        print("warning: the results come from different platforms")
+
+    rows, regressed = compare(baseline, current, thresholds, default)
+    for name, metric, before, after, change, status in rows:
+        print(
+            f"{name:<32} {metric:<14} {before:>12.2f} -> {after:>12.2f} "
+            f"{change:>+8.1%}  {status}"
+        )
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(parse_args()))
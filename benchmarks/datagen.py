@@ -0,0 +1,218 @@
+"""
+Synthetic metabolite CSV generator, in the layout of the ETL input files.
+
+Rows mimic the real uploads: mostly InChI identified metabolites of
+variable size, some CAS-only or doubly identified ones, missing
+identification levels, "ND"/"NA" sample data and a few quoted names and
+multi-line InChI. Generation is seeded, so a given size and seed always
+give the same file. Features, InChI and CAS numbers are unique, as the ETL
+requires.
+
+Usage:
+    python benchmarks/datagen.py 1m --output benchmarks/data/metabolites_1m.csv
+"""
+import argparse
+import csv
+import random
+from pathlib import Path
+
+# Named sizes of the benchmark datasets.
+SIZES = {"10k": 10_000, "1m": 1_000_000, "10m": 10_000_000}
+DEFAULT_SEED = 42
+DEFAULT_DATA_DIR = Path("benchmarks/data")
+HEADER = [
+    "Features",
+    "Identification_level",
+    "ID_InChI",
+    "CAS_number",
+    "Method",
+    "Sample Data",
+]
+
+NAME_STEMS = [
+    "L-tyrosine",
+    "L-phenylalanine",
+    "3-(4-hydroxyphenyl)pyruvate",
+    "2-oxoglutarate",
+    "L-glutamate",
+    "oxaloacetate",
+    "3-methylbutanoate",
+    "futalosine",
+    "phenylacetaldehyde",
+    "3-methylbutanoyl-CoA",
+    "ammonium",
+    "(1R,6R)-6-hydroxy-2-succinylcyclohexa-2,4-diene-1-carboxylate",
+    "2 an oxidized ferredoxin [iron-sulfur] cluster",
+]
+METHODS = [
+    f"LINT{1200 + i}_{kind}" for i in range(10) for kind in ("SPME_C", "LC_MS")
+]
+
+
+def cas_number(index: int, rng: random.Random) -> str:
+    """
+    Build a unique CAS registry number with a valid check digit.
+
+    Args:
+        index (int): Row index, makes the number unique.
+        rng (random.Random): Random generator.
+
+    Returns:
+        str: The CAS number, e.g. "56-86-0".
+    """
+    digits = f"{50 + index * 10 + rng.randrange(10)}{rng.randrange(10, 100)}"
+    check = sum(i * int(d) for i, d in enumerate(reversed(digits), start=1)) % 10
+    return f"{digits[:-2]}-{digits[-2:]}-{check}"
+
+
+def inchi(index: int, rng: random.Random) -> str:
+    """
+    Build a unique, InChI-shaped identifier of realistic length.
+
+    Molecule sizes follow a long-tailed distribution. The stereo layer
+    encodes the row index, which makes the identifier unique.
+
+    Args:
+        index (int): Row index, makes the identifier unique.
+        rng (random.Random): Random generator.
+
+    Returns:
+        str: The InChI string.
+    """
+    carbons = min(int(rng.lognormvariate(2.2, 0.6)) + 1, 120)
+    oxygens = rng.randrange(0, carbons // 2 + 2)
+    nitrogens = rng.choice((0, 0, 0, 1, 2))
+    counts = {
+        "C": carbons,
+        "H": carbons * 2 + rng.randrange(-4, 3) + 2,
+        "N": nitrogens,
+        "O": oxygens,
+    }
+    formula = "".join(
+        element + (str(count) if count > 1 else "")
+        for element, count in counts.items()
+        if count
+    )
+
+    atoms = carbons + oxygens + nitrogens
+    chain = "-".join(str(rng.randrange(1, atoms + 1)) for _ in range(atoms // 2 + 1))
+    hydrogens = f"{rng.randrange(1, atoms + 1)}H,{rng.randrange(1, atoms + 1)}H2"
+    stereo = ",".join(
+        f"{position}{'+' if bit == '1' else '-'}"
+        for position, bit in enumerate(f"{index:b}", start=1)
+    )
+    return f"InChI=1S/{formula}/c{chain}/h{hydrogens}/t{stereo}"
+
+
+def metabolite_row(index: int, rng: random.Random) -> list[str]:
+    """
+    Build one CSV row.
+
+    Args:
+        index (int): Row index.
+        rng (random.Random): Random generator.
+
+    Returns:
+        list[str]: Values in `HEADER` order.
+    """
+    feature = f"{rng.choice(NAME_STEMS)}-{index}"
+    if rng.random() < 0.02:
+        feature = f'{feature}, "isomer {rng.randrange(1, 9)}"'
+
+    kind = rng.random()
+    id_inchi = inchi(index, rng) if kind < 0.85 else ""
+    cas = cas_number(index, rng) if kind >= 0.75 else ""
+    if id_inchi and rng.random() < 0.005:
+        cut = len(id_inchi) // 2
+        id_inchi = f"{id_inchi[:cut]}\n{id_inchi[cut:]}"
+
+    level = "" if rng.random() < 0.3 else str(rng.choice((1, 2, 2, 3, 3, 3, 4, 5)))
+
+    sample = rng.random()
+    if sample < 0.4:
+        sample_data = "ND"
+    elif sample < 0.45:
+        sample_data = "NA"
+    elif sample < 0.5:
+        sample_data = ""
+    else:
+        sample_data = f"{rng.lognormvariate(-3, 2):.9g}"
+
+    return [feature, level, id_inchi, cas, rng.choice(METHODS), sample_data]
+
+
+def generate_csv(path: Path, rows: int, seed: int = DEFAULT_SEED) -> Path:
+    """
+    Write a synthetic metabolite CSV file.
+
+    Args:
+        path (Path): Output file, its directory is created if needed.
+        rows (int): Number of data rows.
+        seed (int): Seed of the random generator.
+
+    Returns:
+        Path: The written file.
+    """
+    rng = random.Random(seed)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        batch = []
+        for index in range(rows):
+            batch.append(metabolite_row(index, rng))
+            if len(batch) == 10_000:
+                writer.writerows(batch)
+                batch.clear()
+        writer.writerows(batch)
+    return path
+
+
+def dataset_path(
+    size: str, seed: int = DEFAULT_SEED, data_dir: Path = DEFAULT_DATA_DIR
+) -> Path:
+    """
+    Return the cached dataset of a named size, generating it if missing.
+
+    Args:
+        size (str): Key of `SIZES`, or a number of rows.
+        seed (int): Seed of the random generator.
+        data_dir (Path): Directory of the generated files.
+
+    Returns:
+        Path: The CSV file.
+    """
+    path = data_dir / f"metabolites_{size}_seed{seed}.csv"
+    if not path.exists():
+        generate_csv(path, parse_size(size), seed)
+    return path
+
+
+def parse_size(size: str) -> int:
+    """
+    Convert a named size ("10k", "1m", "10m") or a number into a row count.
+
+    Args:
+        size (str): The size.
+
+    Returns:
+        int: The number of rows.
+    """
+    return SIZES[size] if size in SIZES else int(size)
+
+
+def parse_args() -> argparse.Namespace:
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("size", help="10k, 1m, 10m or a number of rows.")
+    arg_parser.add_argument("--output", type=Path)
+    arg_parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    return arg_parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.output is None:
+        path = dataset_path(args.size, args.seed)
+    else:
+        path = generate_csv(args.output, parse_size(args.size), args.seed)
+    print(f"Wrote {path}")
@@ -0,0 +1,83 @@
+"""
+Event-loop lag benchmark of concurrent logins.
+
+Runs a burst of concurrent password checks, once calling bcrypt directly
+on the event loop (previous behaviour) and once through the dedicated
+thread pool, while a probe task measures how late the event loop wakes it
+up. The lag is what every other request on the worker would wait.
+
+Usage:
+    PYTHONPATH=src python benchmarks/login_event_loop_lag.py --logins 50
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from fastapi import HTTPException
+from msio.backend.core.auth import (
+    get_password_hash,
+    verify_password,
+    verify_password_async,
+)
+
+PROBE_INTERVAL = 0.005
+
+
+async def blocking_login(plain_password: str, hashed_password: str) -> None:
+    verify_password(plain_password, hashed_password)
+
+
+async def pooled_login(plain_password: str, hashed_password: str) -> None:
+    try:
+        await verify_password_async(plain_password, hashed_password)
+    except HTTPException:
+        pass  # rejected by admission control, the loop stayed responsive
+
+
+async def probe(lags: list, stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append(time.perf_counter() - started - PROBE_INTERVAL)
+
+
+async def measure(login, logins: int, hashed_password: str) -> tuple[list, float]:
+    lags = []
+    stop = asyncio.Event()
+    probe_task = asyncio.create_task(probe(lags, stop))
+    await asyncio.sleep(PROBE_INTERVAL)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(login("secret", hashed_password) for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await probe_task
+    return lags, elapsed
+
+
+def report(name: str, lags: list, elapsed: float, logins: int) -> None:
+    samples = lags if len(lags) > 1 else lags * 2
+    percentiles = statistics.quantiles(samples, n=100, method="inclusive")
+    print(
+        f"{name:<22} loop lag p50={percentiles[49] * 1000:7.2f}ms "
+        f"p99={percentiles[98] * 1000:7.2f}ms max={max(lags) * 1000:7.2f}ms "
+        f"logins={logins / elapsed:6.1f}/s"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    hashed_password = get_password_hash("secret")
+    for name, login in [
+        ("bcrypt on event loop", blocking_login),
+        ("bcrypt in thread pool", pooled_login),
+    ]:
+        lags, elapsed = await measure(login, args.logins, hashed_password)
+        report(name, lags, elapsed, args.logins)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logins", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,85 @@
+"""
+Overhead benchmark of the HTTP metrics middleware.
+
+Calls a minimal FastAPI route directly through ASGI, with and without
+`MetricsMiddleware`, and prints the per-request cost of the middleware.
+
+Usage:
+    PYTHONPATH=src python benchmarks/metrics_overhead.py --requests 20000
+"""
+import argparse
+import asyncio
+import time
+
+from fastapi import FastAPI
+from msio.backend.core.metrics import HTTPMetrics, MetricsMiddleware
+
+
+def build_app(with_metrics: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/metabolites/{metabolite_id}")
+    async def get_metabolite(metabolite_id: int):
+        return {"id": metabolite_id}
+
+    if with_metrics:
+        app.add_middleware(MetricsMiddleware, metrics=HTTPMetrics())
+    return app
+
+
+async def call(app: FastAPI, path: str) -> None:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [],
+        "client": ("127.0.0.1", 1234),
+        "server": ("test", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def measure(app: FastAPI, requests: int) -> float:
+    for i in range(100):
+        await call(app, f"/metabolites/{i}")
+    started = time.perf_counter()
+    for i in range(requests):
+        await call(app, f"/metabolites/{i}")
+    return (time.perf_counter() - started) / requests
+
+
+async def main(args: argparse.Namespace) -> None:
+    plain_app = build_app(with_metrics=False)
+    instrumented_app = build_app(with_metrics=True)
+    # Alternate the runs and keep the best of each, to filter out noise.
+    baseline = instrumented = float("inf")
+    for _ in range(args.rounds):
+        baseline = min(baseline, await measure(plain_app, args.requests))
+        instrumented = min(instrumented, await measure(instrumented_app, args.requests))
+    overhead = instrumented - baseline
+    print(f"without metrics  {baseline * 1e6:8.1f} us/request")
+    print(f"with metrics     {instrumented * 1e6:8.1f} us/request")
+    print(
+        f"overhead         {overhead * 1e6:8.1f} us/request "
+        f"({overhead / baseline * 100:.1f}%)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=5)
+    asyncio.run(main(parser.parse_args()))
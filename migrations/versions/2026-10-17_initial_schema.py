@@ -0,0 +1,75 @@
+"""Initial schema
+
+Revision ID: 1e8d5a3c7b40
+Revises:
+Create Date: 2026-10-17 08:47:03.512934
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "1e8d5a3c7b40"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The users and metabolites tables as the models first declared them,
+    # with the names of the naming convention of msio.backend.database.core.
+    # The later revisions drop or replace some of these indexes by name.
+    # The models also declared uniq_id_inchi and uniq_cas_number, but
+    # PostgreSQL keeps only the first of identical unique constraints in a
+    # CREATE TABLE: the *_key ones below are all they ever created.
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("username", sa.String(), nullable=False),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("hashed_password", sa.String(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.PrimaryKeyConstraint("id", name="users_pkey"),
+    )
+    op.create_index("users_id_idx", "users", ["id"])
+    op.create_index("users_username_idx", "users", ["username"], unique=True)
+    op.create_index("users_email_idx", "users", ["email"], unique=True)
+
+    op.create_table(
+        "metabolites",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("feature", sa.String(), nullable=False),
+        sa.Column("identification_level", sa.Integer(), nullable=False),
+        sa.Column("id_inchi", sa.String(), nullable=True),
+        sa.Column("cas_number", sa.String(), nullable=True),
+        sa.Column("method", sa.String(), nullable=False),
+        sa.Column("sample_data", sa.Float(), nullable=True),
+        sa.Column("uploader_id", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["uploader_id"], ["users.id"], name="metabolites_uploader_id_fkey"
+        ),
+        sa.PrimaryKeyConstraint("id", name="metabolites_pkey"),
+        sa.UniqueConstraint("id_inchi", name="metabolites_id_inchi_key"),
+        sa.UniqueConstraint("cas_number", name="metabolites_cas_number_key"),
+    )
+    op.create_index("metabolites_id_idx", "metabolites", ["id"])
+    op.create_index("metabolites_feature_idx", "metabolites", ["feature"], unique=True)
+    op.create_index("idx_id_inchi", "metabolites", ["id_inchi"])
+    op.create_index("idx_cas_number", "metabolites", ["cas_number"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_cas_number", table_name="metabolites")
+    op.drop_index("idx_id_inchi", table_name="metabolites")
+    op.drop_index("metabolites_feature_idx", table_name="metabolites")
+    op.drop_index("metabolites_id_idx", table_name="metabolites")
+    op.drop_table("metabolites")
+    op.drop_index("users_email_idx", table_name="users")
+    op.drop_index("users_username_idx", table_name="users")
+    op.drop_index("users_id_idx", table_name="users")
+    op.drop_table("users")
@@ -0,0 +1,38 @@
+"""Metabolite feature trigram index
+
+Revision ID: 8d3e4a6f1c27
+Revises: 5b1f0c7e2a91
+Create Date: 2026-10-17 14:03:51.902114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8d3e4a6f1c27"
+down_revision: Union[str, None] = "5b1f0c7e2a91"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # GiST rather than GIN: it also serves the `<<->` distance ordering, so
+    # the ranked search reads the nearest rows first instead of scoring
+    # every match.
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "idx_feature_trgm",
+        "metabolites",
+        ["feature"],
+        postgresql_using="gist",
+        postgresql_ops={"feature": "gist_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_feature_trgm", table_name="metabolites")
@@ -0,0 +1,48 @@
+"""Metabolite InChI hash column
+
+Revision ID: 3c9b2e7d4f18
+Revises: 8d3e4a6f1c27
+Create Date: 2026-10-17 16:40:12.587309
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3c9b2e7d4f18"
+down_revision: Union[str, None] = "8d3e4a6f1c27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("metabolites", sa.Column("inchi_hash", sa.String(32), nullable=True))
+    # Same digest as msio.backend.core.identifiers.inchi_hash.
+    op.execute(
+        "UPDATE metabolites "
+        "SET inchi_hash = "
+        "left(encode(sha256(convert_to(id_inchi, 'UTF8')), 'hex'), 32) "
+        "WHERE id_inchi IS NOT NULL"
+    )
+    op.create_unique_constraint("uniq_inchi_hash", "metabolites", ["inchi_hash"])
+
+    # The full InChI was indexed three times: the column level unique
+    # constraint, uniq_id_inchi and idx_id_inchi. The hash now carries the
+    # uniqueness and the lookups.
+    op.execute("DROP INDEX IF EXISTS idx_id_inchi")
+    op.execute("ALTER TABLE metabolites DROP CONSTRAINT IF EXISTS uniq_id_inchi")
+    op.execute(
+        "ALTER TABLE metabolites DROP CONSTRAINT IF EXISTS metabolites_id_inchi_key"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_unique_constraint("uniq_id_inchi", "metabolites", ["id_inchi"])
+    op.create_index("idx_id_inchi", "metabolites", ["id_inchi"])
+    op.drop_constraint("uniq_inchi_hash", "metabolites", type_="unique")
+    op.drop_column("metabolites", "inchi_hash")
@@ -0,0 +1,69 @@
+"""Metabolite index consolidation
+
+Revision ID: 6f4a1d9b2c53
+Revises: 3c9b2e7d4f18
+Create Date: 2026-10-17 18:21:07.145962
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "6f4a1d9b2c53"
+down_revision: Union[str, None] = "3c9b2e7d4f18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The unique constraint on cas_number is the one the models name,
+    # uniq_cas_number. PostgreSQL only created metabolites_cas_number_key
+    # (see 1e8d5a3c7b40), so it is renamed, or added if neither exists,
+    # before the duplicates are dropped in the same transaction.
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM pg_constraint
+                WHERE conrelid = 'metabolites'::regclass
+                AND conname = 'uniq_cas_number'
+            ) THEN
+                IF EXISTS (
+                    SELECT 1 FROM pg_constraint
+                    WHERE conrelid = 'metabolites'::regclass
+                    AND conname = 'metabolites_cas_number_key'
+                ) THEN
+                    ALTER TABLE metabolites RENAME CONSTRAINT
+                        metabolites_cas_number_key TO uniq_cas_number;
+                ELSE
+                    ALTER TABLE metabolites
+                        ADD CONSTRAINT uniq_cas_number UNIQUE (cas_number);
+                END IF;
+            END IF;
+        END $$
+        """
+    )
+
+    # Each of these duplicates another btree on the same column: the
+    # primary key for id, uniq_cas_number for cas_number. Every write paid
+    # for them without any query using them.
+    op.execute("DROP INDEX IF EXISTS metabolites_id_idx")
+    op.execute("DROP INDEX IF EXISTS idx_cas_number")
+    op.execute(
+        "ALTER TABLE metabolites DROP CONSTRAINT IF EXISTS metabolites_cas_number_key"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        "ALTER TABLE metabolites "
+        "RENAME CONSTRAINT uniq_cas_number TO metabolites_cas_number_key"
+    )
+    op.create_index("idx_cas_number", "metabolites", ["cas_number"])
+    op.create_index("metabolites_id_idx", "metabolites", ["id"])
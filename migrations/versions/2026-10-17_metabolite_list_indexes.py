@@ -0,0 +1,38 @@
+"""Metabolite listing indexes
+
+Revision ID: 5b1f0c7e2a91
+Revises: 1e8d5a3c7b40
+Create Date: 2026-10-17 09:12:44.318220
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5b1f0c7e2a91"
+down_revision: Union[str, None] = "1e8d5a3c7b40"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Composite (filter, id) indexes serve both the filter and the keyset
+    # pagination order of GET /metabolites.
+    op.create_index("idx_method_id", "metabolites", ["method", "id"])
+    op.create_index(
+        "idx_identification_level_id", "metabolites", ["identification_level", "id"]
+    )
+    op.create_index("idx_uploader_id_id", "metabolites", ["uploader_id", "id"])
+    op.create_index("idx_sample_data", "metabolites", ["sample_data"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_sample_data", table_name="metabolites")
+    op.drop_index("idx_uploader_id_id", table_name="metabolites")
+    op.drop_index("idx_identification_level_id", table_name="metabolites")
+    op.drop_index("idx_method_id", table_name="metabolites")
@@ -0,0 +1,61 @@
+"""Sample matrices
+
+Revision ID: a7e2c4f91b36
+Revises: 6f4a1d9b2c53
+Create Date: 2026-10-17 19:02:44.918230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a7e2c4f91b36"
+down_revision: Union[str, None] = "6f4a1d9b2c53"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "sample_matrices",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("samples", sa.JSON(), nullable=False),
+        sa.PrimaryKeyConstraint("id", name="sample_matrices_pkey"),
+        sa.UniqueConstraint("name", name="sample_matrices_name_key"),
+    )
+    op.create_table(
+        "sample_vectors",
+        sa.Column("matrix_id", sa.Integer(), nullable=False),
+        sa.Column("metabolite_id", sa.Integer(), nullable=False),
+        sa.Column("sample_values", sa.LargeBinary(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["matrix_id"],
+            ["sample_matrices.id"],
+            name="sample_vectors_matrix_id_fkey",
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["metabolite_id"],
+            ["metabolites.id"],
+            name="sample_vectors_metabolite_id_fkey",
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint(
+            "matrix_id", "metabolite_id", name="sample_vectors_pkey"
+        ),
+    )
+    op.create_index(
+        "sample_vectors_metabolite_id_idx", "sample_vectors", ["metabolite_id"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("sample_vectors_metabolite_id_idx", table_name="sample_vectors")
+    op.drop_table("sample_vectors")
+    op.drop_table("sample_matrices")
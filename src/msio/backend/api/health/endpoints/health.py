@@ -1,4 +1,14 @@
-from fastapi import APIRouter, status
+import asyncio
+
+from fastapi import APIRouter, Response, status
+from fastapi.responses import PlainTextResponse
+from sqlalchemy import text
+from msio.backend.core.auth import user_cache
+from msio.backend.core.cache import metabolite_cache
+from msio.backend.core.metrics import http_metrics
+from msio.backend.database.session import engine, pool_statistics
+
+READINESS_TIMEOUT_SECONDS = 5
 
 router = APIRouter()
 
@@ -6,3 +16,44 @@ router = APIRouter()
 @router.get("/", status_code=status.HTTP_200_OK)
 def perform_healthcheck():
     return {"status": "ok"}
+
+
+@router.get("/ready", status_code=status.HTTP_200_OK)
+async def perform_readiness_check(response: Response):
+    """
+    Check that the database answers, and report the connection pool state.
+
+    Returns 503 if no connection could run `SELECT 1` within
+    `READINESS_TIMEOUT_SECONDS`, for instance when the pool is exhausted.
+    """
+
+    async def ping() -> None:
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    try:
+        await asyncio.wait_for(ping(), READINESS_TIMEOUT_SECONDS)
+        database = "ok"
+    except Exception:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        database = "unavailable"
+    return {
+        "status": "ok" if database == "ok" else "unavailable",
+        "database": database,
+        "pool": pool_statistics(),
+    }
+
+
+@router.get("/caches", status_code=status.HTTP_200_OK)
+def cache_statistics():
+    return {
+        "auth_users": user_cache.stats(),
+        "metabolites": metabolite_cache.stats(),
+    }
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def export_metrics():
+    return PlainTextResponse(
+        http_metrics.render(), media_type="text/plain; version=0.0.4"
+    )
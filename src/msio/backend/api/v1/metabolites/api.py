@@ -1,9 +1,23 @@
 from fastapi import APIRouter
 
-from msio.backend.api.v1.metabolites.endpoints import metabolites
+from msio.backend.api.v1.metabolites.endpoints import (
+    bulk,
+    metabolites,
+    samples,
+    uploads,
+)
 
 api_router_metabolites = APIRouter()
 
+# Registered first: "/bulk" and "/uploads" would otherwise match
+# "/{metabolite_id}".
+api_router_metabolites.include_router(
+    bulk.router, prefix="/metabolites", tags=["metabolites API"]
+)
+api_router_metabolites.include_router(
+    uploads.router, prefix="/metabolites", tags=["metabolites API"]
+)
+api_router_metabolites.include_router(samples.router, tags=["samples API"])
 
 api_router_metabolites.include_router(
     metabolites.router, prefix="/metabolites", tags=["metabolites API"]
@@ -0,0 +1,270 @@
+from typing import Optional
+
+from fastapi import APIRouter, Body, Depends, HTTPException, status
+from sqlalchemy import Result, delete, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from msio.backend.core.auth import get_current_user
+from msio.backend.core.cache import metabolite_cache
+from msio.backend.core.config import config
+from msio.backend.database.models import Metabolite
+from msio.backend.database.session import get_db
+from msio.backend.database.schemas import (
+    AuthenticatedUser,
+    MetaboliteBulkDelete,
+    MetaboliteBulkResult,
+    MetaboliteBulkUpdate,
+    MetaboliteCreate,
+)
+
+
+router = APIRouter()
+
+# Unique metabolite columns checked before a bulk write.
+UNIQUE_FIELDS = ("feature", "inchi_hash", "cas_number")
+
+
+async def find_conflicts(
+    db: AsyncSession,
+    items: list[MetaboliteCreate],
+    item_ids: Optional[list[int]] = None,
+) -> dict[int, str]:
+    """
+    Find the items of a bulk write that would violate a unique constraint,
+    with one query for the whole batch.
+
+    An item conflicts when one of its unique values belongs to another
+    metabolite in the database, or to a previous item of the same batch.
+
+    Args:
+        db (AsyncSession): The asynchronous database session.
+        items (list[MetaboliteCreate]): Items of the batch.
+        item_ids (list[int] | None): ID each item is written to, for updates.
+
+    Returns:
+        dict[int, str]: Index of each conflicting item -> reason.
+    """
+    if not items:
+        return {}
+
+    values = {
+        field: [v for v in {getattr(item, field) for item in items} if v is not None]
+        for field in UNIQUE_FIELDS
+    }
+    columns = [getattr(Metabolite, field) for field in UNIQUE_FIELDS]
+    result = await db.execute(
+        select(Metabolite.id, *columns).where(
+            or_(*(column.in_(values[column.key]) for column in columns))
+        )
+    )
+    owners = {field: {} for field in UNIQUE_FIELDS}
+    for row in result:
+        for field in UNIQUE_FIELDS:
+            owners[field][getattr(row, field)] = row.id
+
+    conflicts = {}
+    seen = {field: set() for field in UNIQUE_FIELDS}
+    for index, item in enumerate(items):
+        item_id = item_ids[index] if item_ids else None
+        for field in UNIQUE_FIELDS:
+            value = getattr(item, field)
+            if value is None:
+                continue
+            owner = owners[field].get(value)
+            if owner is not None and owner != item_id:
+                conflicts[index] = f"{field} already used by metabolite {owner}"
+                break
+            if value in seen[field]:
+                conflicts[index] = f"{field} duplicated in the request"
+                break
+        else:
+            for field in UNIQUE_FIELDS:
+                seen[field].add(getattr(item, field))
+    return conflicts
+
+
+async def write_or_conflict(db: AsyncSession, stmt, rows: list[dict]) -> Result:
+    """
+    Execute a bulk write with all its rows and commit it, turning a
+    constraint violation raised by a concurrent write into a 409 for the
+    whole batch.
+
+    Args:
+        db (AsyncSession): The asynchronous database session.
+        stmt: The INSERT or UPDATE statement.
+        rows (list[dict]): Parameters of each row.
+
+    Raises:
+        HTTPException: Returns 409 if the transaction violates a constraint.
+
+    Returns:
+        Result: The result of the statement.
+    """
+    try:
+        result = await db.execute(stmt, rows)
+        await db.commit()
+    except IntegrityError as exc:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Concurrent write conflict, no item was applied",
+        ) from exc
+    return result
+
+
+@router.post("/bulk", response_model=list[MetaboliteBulkResult])
+async def bulk_create_metabolites(
+    payload: list[MetaboliteCreate] = Body(
+        ..., max_length=config.METABOLITES_BULK_MAX_ITEMS
+    ),
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+):
+    """
+    Create many metabolites in one transaction.
+
+    Items violating a unique constraint are reported as conflicts and
+    skipped, the others are inserted with a single multi-row INSERT.
+
+    Args:
+        payload (list[MetaboliteCreate]): The metabolites to create.
+        db (AsyncSession): The asynchronous database session.
+        current_user (AuthenticatedUser): The currently authenticated user.
+
+    Raises:
+        HTTPException: Returns 409 if a concurrent write conflicts.
+
+    Returns:
+        list[MetaboliteBulkResult]: One result per item, in request order.
+    """
+    conflicts = await find_conflicts(db, payload)
+    valid = [i for i in range(len(payload)) if i not in conflicts]
+
+    created_ids = []
+    if valid:
+        result = await write_or_conflict(
+            db,
+            insert(Metabolite).returning(Metabolite.id, sort_by_parameter_order=True),
+            [
+                {**payload[i].model_dump(), "uploader_id": current_user.id}
+                for i in valid
+            ],
+        )
+        created_ids = result.scalars().all()
+        for i in valid:
+            await metabolite_cache.invalidate(
+                feature=payload[i].feature,
+                inchi_hash=payload[i].inchi_hash,
+                cas_number=payload[i].cas_number,
+            )
+
+    results = [
+        MetaboliteBulkResult(index=i, status="conflict", detail=detail)
+        for i, detail in conflicts.items()
+    ]
+    results += [
+        MetaboliteBulkResult(index=i, id=created_id, status="created")
+        for i, created_id in zip(valid, created_ids)
+    ]
+    return sorted(results, key=lambda r: r.index)
+
+
+@router.put("/bulk", response_model=list[MetaboliteBulkResult])
+async def bulk_update_metabolites(
+    payload: list[MetaboliteBulkUpdate] = Body(
+        ..., max_length=config.METABOLITES_BULK_MAX_ITEMS
+    ),
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+):
+    """
+    Overwrite many metabolites in one transaction.
+
+    Unknown IDs are reported as not found, items violating a unique
+    constraint as conflicts, and the others are updated with a single
+    executemany UPDATE by primary key.
+
+    Args:
+        payload (list[MetaboliteBulkUpdate]): The new data and target IDs.
+        db (AsyncSession): The asynchronous database session.
+        current_user (AuthenticatedUser): The currently authenticated user.
+
+    Raises:
+        HTTPException: Returns 409 if a concurrent write conflicts.
+
+    Returns:
+        list[MetaboliteBulkResult]: One result per item, in request order.
+    """
+    ids = [item.id for item in payload]
+    result = await db.execute(select(Metabolite.id).where(Metabolite.id.in_(ids)))
+    existing = set(result.scalars().all())
+    conflicts = await find_conflicts(db, payload, ids)
+
+    results = []
+    rows = []
+    updated_ids = set()
+    for index, item in enumerate(payload):
+        if item.id not in existing:
+            results.append(
+                MetaboliteBulkResult(index=index, id=item.id, status="not_found")
+            )
+        elif index in conflicts or item.id in updated_ids:
+            detail = conflicts.get(index, "id duplicated in the request")
+            results.append(
+                MetaboliteBulkResult(
+                    index=index, id=item.id, status="conflict", detail=detail
+                )
+            )
+        else:
+            rows.append(item.model_dump())
+            updated_ids.add(item.id)
+            results.append(
+                MetaboliteBulkResult(index=index, id=item.id, status="updated")
+            )
+
+    if rows:
+        await write_or_conflict(db, update(Metabolite), rows)
+        await metabolite_cache.invalidate(*updated_ids)
+    return results
+
+
+@router.post("/bulk/delete", response_model=list[MetaboliteBulkResult])
+async def bulk_delete_metabolites(
+    payload: MetaboliteBulkDelete,
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+):
+    """
+    Delete many metabolites with a single DELETE ... RETURNING.
+
+    Args:
+        payload (MetaboliteBulkDelete): IDs of the metabolites to delete.
+        db (AsyncSession): The asynchronous database session.
+        current_user (AuthenticatedUser): The currently authenticated user.
+
+    Returns:
+        list[MetaboliteBulkResult]: One result per ID, in request order.
+    """
+    if len(payload.ids) > config.METABOLITES_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"At most {config.METABOLITES_BULK_MAX_ITEMS} ids per request",
+        )
+
+    result = await db.execute(
+        delete(Metabolite)
+        .where(Metabolite.id.in_(payload.ids))
+        .returning(Metabolite.id)
+    )
+    deleted = set(result.scalars().all())
+    await db.commit()
+    await metabolite_cache.invalidate(*deleted)
+
+    return [
+        MetaboliteBulkResult(
+            index=index,
+            id=metabolite_id,
+            status="deleted" if metabolite_id in deleted else "not_found",
+        )
+        for index, metabolite_id in enumerate(payload.ids)
+    ]
@@ -1,39 +1,120 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
-from msio.backend.database.models import Metabolite, User
+from sqlalchemy import delete, update
+from msio.backend.database.models import Metabolite
 from msio.backend.core.auth import get_current_user
+from msio.backend.core.cache import metabolite_cache
+from msio.backend.core.config import config
+from msio.backend.core.identifiers import INCHI_HASH_LENGTH, inchi_hash
 from msio.backend.database.session import get_db
-from src.msio.backend.database.schemas import MetaboliteCreate, MetaboliteRead
+from msio.backend.api.v1.metabolites.export import (
+    EXPORT_MEDIA_TYPES,
+    ExportFormat,
+    iter_export,
+)
+from msio.backend.api.v1.metabolites.filters import (
+    MetaboliteFilters,
+    MetaboliteOrdering,
+)
+from msio.backend.api.v1.metabolites.responses import (
+    LOOKUP_STATEMENTS,
+    SELECT_METABOLITES,
+    rows_as_dicts,
+)
+from msio.backend.api.v1.metabolites.search import search_metabolites
+from src.msio.backend.database.schemas import (
+    AuthenticatedUser,
+    MetaboliteCreate,
+    MetabolitePage,
+    MetabolitePatch,
+    MetaboliteRead,
+    MetaboliteSearchPage,
+)
 
 
 router = APIRouter()
 
 
-@router.get("/", response_model=list[MetaboliteRead])
+@router.get("/", response_model=MetabolitePage)
 async def list_metabolites(
+    limit: int = Query(
+        config.METABOLITES_PAGE_SIZE, ge=1, le=config.METABOLITES_MAX_PAGE_SIZE
+    ),
+    filters: MetaboliteFilters = Depends(),
+    ordering: MetaboliteOrdering = Depends(),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
 ):
     """
-    Retrieve all metabolites from the database.
+    Retrieve one page of metabolites from the database.
+
+    Pages are fetched with keyset pagination: pass the `next_cursor` of a
+    page as `cursor` to get the next one, with the same filters and sort.
 
     Args:
+        limit (int): Maximum number of metabolites in the page.
+        filters (MetaboliteFilters): Filters on method, identification
+            level, sample data range and uploader.
+        ordering (MetaboliteOrdering): Sort column, order and cursor.
         db (AsyncSession): SQLAlchemy asynchronous session,
         provided by FastAPI dependency injection.
 
+    Raises:
+        HTTPException: Returns 400 if the cursor is invalid.
+
+    Returns:
+        MetabolitePage: The metabolites of the page and the next cursor.
+    """
+    stmt = ordering.apply(filters.apply(SELECT_METABOLITES), limit)
+    items = rows_as_dicts(await db.execute(stmt))
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = ordering.next_cursor(items[-1])
+    return ORJSONResponse({"items": items, "next_cursor": next_cursor})
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_metabolites(
+    export_format: ExportFormat = Query("ndjson", alias="format"),
+    filters: MetaboliteFilters = Depends(),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+):
+    """
+    Export the metabolites matching the filters as NDJSON or CSV.
+
+    The rows use the column layout of the ETL input files and are streamed
+    from a server-side cursor, so the whole catalogue can be exported with
+    bounded memory.
+
+    Args:
+        export_format (ExportFormat): "ndjson" (default) or "csv".
+        filters (MetaboliteFilters): Same filters as the listing endpoint.
+        current_user (AuthenticatedUser): The currently authenticated user.
+
     Returns:
-        list[MetaboliteRead]: List of metabolite records.
+        StreamingResponse: The streamed export.
     """
-    result = await db.execute(select(Metabolite))
-    return result.scalars().all()
+    return StreamingResponse(
+        iter_export(filters, export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="metabolites.{export_format}"'
+            )
+        },
+    )
 
 
 @router.post("/", response_model=MetaboliteRead, status_code=status.HTTP_201_CREATED)
 async def create_metabolite(
     payload: MetaboliteCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
 ):
     """
     Create a new metabolite in the database.
@@ -44,8 +125,8 @@ async def create_metabolite(
     Args:
         payload (MetaboliteCreate): The data of the metabolite to be created.
         db (AsyncSession): The asynchronous database session.
-        current_user (User): The currently authenticated user, extracted from
-        the JWT token.
+        current_user (AuthenticatedUser): The currently authenticated user,
+            extracted from the JWT token.
 
     Returns:
         MetaboliteRead: The newly created metabolite with its generated ID
@@ -55,36 +136,228 @@ async def create_metabolite(
     db.add(metabolite)
     await db.commit()
     await db.refresh(metabolite)
+    await metabolite_cache.invalidate(
+        feature=metabolite.feature,
+        inchi_hash=metabolite.inchi_hash,
+        cas_number=metabolite.cas_number,
+    )
     return metabolite
 
 
+async def fetch_metabolite(db: AsyncSession, field: str, value) -> dict:
+    """
+    Read-through lookup of a metabolite by one of its unique columns.
+
+    Args:
+        db (AsyncSession): The asynchronous database session.
+        field (str): "id", "feature", "inchi_hash" or "cas_number".
+        value: Looked up value.
+
+    Raises:
+        HTTPException: Returns 404 if the metabolite is not found.
+
+    Returns:
+        dict: The metabolite columns.
+    """
+    metabolite = await metabolite_cache.get(field, value)
+    if metabolite is not None:
+        return metabolite
+
+    result = await db.execute(LOOKUP_STATEMENTS[field], {"value": value})
+    row = result.mappings().first()
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Metabolite not found"
+        )
+    metabolite = dict(row)
+    await metabolite_cache.put(metabolite)
+    return metabolite
+
+
+@router.get("/lookup", response_model=MetaboliteRead)
+async def lookup_metabolite(
+    feature: Optional[str] = Query(None),
+    id_inchi: Optional[str] = Query(None),
+    cas_number: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+):
+    """
+    Retrieve a single metabolite by its feature name, InChI or CAS number.
+
+    Exactly one of the query parameters must be given.
+
+    Args:
+        feature (str | None): Feature name.
+        id_inchi (str | None): InChI identifier.
+        cas_number (str | None): CAS number.
+        db (AsyncSession): The asynchronous database session.
+        current_user (AuthenticatedUser): The currently authenticated user.
+
+    Raises:
+        HTTPException: Returns 422 if not exactly one parameter is given.
+        HTTPException: Returns 404 if the metabolite is not found.
+
+    Returns:
+        MetaboliteRead: The metabolite.
+    """
+    given = {
+        field: value
+        for field, value in (
+            ("feature", feature),
+            ("id_inchi", id_inchi),
+            ("cas_number", cas_number),
+        )
+        if value is not None
+    }
+    if len(given) != 1:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Give exactly one of feature, id_inchi or cas_number",
+        )
+    if id_inchi is not None:
+        # InChIs are only indexed through their hash.
+        given = {"inchi_hash": inchi_hash(id_inchi)}
+    return ORJSONResponse(await fetch_metabolite(db, *given.popitem()))
+
+
+@router.get("/structure", response_model=MetaboliteRead)
+async def lookup_metabolite_by_structure(
+    inchi: Optional[str] = Query(None, min_length=1),
+    digest: Optional[str] = Query(
+        None,
+        alias="inchi_hash",
+        min_length=INCHI_HASH_LENGTH,
+        max_length=INCHI_HASH_LENGTH,
+    ),
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+):
+    """
+    Retrieve a single metabolite by its structure, given as a full InChI or
+    as its `inchi_hash`.
+
+    The lookup goes through the fixed-width unique index on `inchi_hash`,
+    the InChI itself is not indexed.
+
+    Args:
+        inchi (str | None): InChI identifier.
+        digest (str | None): `inchi_hash` of the InChI, as returned with
+            the metabolites.
+        db (AsyncSession): The asynchronous database session.
+        current_user (AuthenticatedUser): The currently authenticated user.
+
+    Raises:
+        HTTPException: Returns 422 if not exactly one parameter is given.
+        HTTPException: Returns 404 if the metabolite is not found.
+
+    Returns:
+        MetaboliteRead: The metabolite.
+    """
+    if (inchi is None) == (digest is None):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Give exactly one of inchi or inchi_hash",
+        )
+    if inchi is not None:
+        digest = inchi_hash(inchi)
+    return ORJSONResponse(await fetch_metabolite(db, "inchi_hash", digest.lower()))
+
+
+@router.get("/search", response_model=MetaboliteSearchPage)
+async def search_metabolites_by_name(
+    q: str = Query(..., min_length=2, max_length=200),
+    limit: int = Query(20, ge=1, le=config.METABOLITES_PAGE_SIZE),
+    offset: int = Query(0, ge=0, le=config.METABOLITES_SEARCH_MAX_OFFSET),
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+):
+    """
+    Search metabolites by partial or misspelled feature name, e.g.
+    "tyrosin" or "L-phenyl".
+
+    Results are ranked by trigram word similarity with the query, best
+    first, and paginated by offset.
+
+    Args:
+        q (str): Searched text.
+        limit (int): Maximum number of results in the page.
+        offset (int): Number of results to skip.
+        db (AsyncSession): The asynchronous database session.
+        current_user (AuthenticatedUser): The currently authenticated user.
+
+    Returns:
+        MetaboliteSearchPage: The results of the page and the next offset.
+    """
+    hits = await search_metabolites(db, q, limit + 1, offset)
+    next_offset = offset + limit if len(hits) > limit else None
+    return ORJSONResponse({"items": hits[:limit], "next_offset": next_offset})
+
+
 @router.get("/{metabolite_id}", response_model=MetaboliteRead)
 async def get_metabolite(
     metabolite_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
 ):
     """
     Retrieve a single metabolite by its ID.
 
     This endpoint returns the metabolite stored in the database.
-    It requires the user to be authenticated.
+    It requires the user to be authenticated. Records are served from the
+    metabolite cache when possible, otherwise selected as a Core row and
+    cached.
 
     Args:
         metabolite_id (int): The ID of the metabolite to retrieve.
         db (AsyncSession): The asynchronous database session.
-        current_user (User): The currently authenticated user,
+        current_user (AuthenticatedUser): The currently authenticated user,
             extracted from the JWT token.
 
     Raises:
         HTTPException: Returns 404 if the metabolite is not found.
     """
-    result = await db.execute(select(Metabolite).where(Metabolite.id == metabolite_id))
-    metabolite = result.scalar_one_or_none()
+    return ORJSONResponse(await fetch_metabolite(db, "id", metabolite_id))
+
+
+async def apply_update(db: AsyncSession, metabolite_id: int, values: dict):
+    """
+    Update a metabolite with a single UPDATE ... RETURNING and commit it.
+
+    Args:
+        db (AsyncSession): The asynchronous database session.
+        metabolite_id (int): The ID of the metabolite to update.
+        values (dict): Columns to update.
+
+    Raises:
+        HTTPException: Returns 404 if the metabolite is not found.
+        HTTPException: Returns 422 if the update leaves the metabolite
+            without InChI and CAS number.
+
+    Returns:
+        Row: The updated metabolite.
+    """
+    result = await db.execute(
+        update(Metabolite)
+        .where(Metabolite.id == metabolite_id)
+        .values(**values)
+        .returning(*Metabolite.__table__.c)
+    )
+    metabolite = result.first()
     if not metabolite:
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Metabolite not found"
         )
+    if not metabolite.id_inchi and not metabolite.cas_number:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Either ID_InChI or CAS_number must be provided.",
+        )
+
+    await db.commit()
+    await metabolite_cache.invalidate(metabolite_id)
     return metabolite
 
 
@@ -93,20 +366,21 @@ async def update_metabolite(
     metabolite_id: int,
     payload: MetaboliteCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
 ):
     """
     Update an existing metabolite by its ID.
 
     This endpoint allows an authenticated user to update a metabolite.
     The metabolite is identified by its unique ID, and all fields
-    provided in the payload will overwrite the current values.
+    provided in the payload will overwrite the current values, in a single
+    UPDATE ... RETURNING statement.
 
     Args:
         metabolite_id (int): The ID of the metabolite to update.
         payload (MetaboliteCreate): The new data for the metabolite.
         db (AsyncSession): The asynchronous database session.
-        current_user (User): The currently authenticated user.
+        current_user (AuthenticatedUser): The currently authenticated user.
 
     Raises:
         HTTPException: Returns 404 if the metabolite is not found.
@@ -114,38 +388,63 @@ async def update_metabolite(
     Returns:
         MetaboliteRead: The updated metabolite data.
     """
-    result = await db.execute(select(Metabolite).where(Metabolite.id == metabolite_id))
-    metabolite = result.scalar_one_or_none()
-    if not metabolite:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Metabolite not found"
-        )
+    return await apply_update(db, metabolite_id, payload.model_dump())
 
-    for key, value in payload.model_dump().items():
-        setattr(metabolite, key, value)
-    await db.commit()
-    await db.refresh(metabolite)
-    return metabolite
+
+@router.patch("/{metabolite_id}", response_model=MetaboliteRead)
+async def patch_metabolite(
+    metabolite_id: int,
+    payload: MetabolitePatch,
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+):
+    """
+    Partially update an existing metabolite by its ID.
+
+    Only the fields present in the payload are written, in a single
+    UPDATE ... RETURNING statement.
+
+    Args:
+        metabolite_id (int): The ID of the metabolite to update.
+        payload (MetabolitePatch): The fields to change.
+        db (AsyncSession): The asynchronous database session.
+        current_user (AuthenticatedUser): The currently authenticated user.
+
+    Raises:
+        HTTPException: Returns 404 if the metabolite is not found.
+        HTTPException: Returns 422 if the update leaves the metabolite
+            without InChI and CAS number.
+
+    Returns:
+        MetaboliteRead: The updated metabolite data.
+    """
+    values = payload.model_dump(exclude_unset=True)
+    if "id_inchi" not in values:
+        # Derived column, only written along with the InChI.
+        del values["inchi_hash"]
+    if not values:
+        return await get_metabolite(metabolite_id, db, current_user)
+    return await apply_update(db, metabolite_id, values)
 
 
 @router.delete("/{metabolite_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_metabolite(
     metabolite_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
 ):
     """
     Delete an existing metabolite by its ID.
 
     This endpoint allows an authenticated user to delete a metabolite
-    from the database.
+    from the database, with a single DELETE ... RETURNING statement.
     The metabolite is identified by its unique ID. If no metabolite is
     found with the provided ID, a 404 error is returned.
 
     Args:
         metabolite_id (int): The ID of the metabolite to delete.
         db (AsyncSession): The asynchronous database session.
-        current_user (User): The currently authenticated user.
+        current_user (AuthenticatedUser): The currently authenticated user.
 
     Raises:
         HTTPException: Returns 404 if the metabolite is not found.
@@ -153,10 +452,14 @@ async def delete_metabolite(
     Returns:
         None: Successful deletion returns a 204 No Content status.
     """
-    result = await db.execute(select(Metabolite).where(Metabolite.id == metabolite_id))
-    metabolite = result.scalar_one_or_none()
-    if not metabolite:
+    result = await db.execute(
+        delete(Metabolite)
+        .where(Metabolite.id == metabolite_id)
+        .returning(Metabolite.id)
+    )
+    if result.scalar_one_or_none() is None:
+        await db.rollback()
         raise HTTPException(status_code=404, detail="Metabolite not found")
 
-    await db.delete(metabolite)
     await db.commit()
+    await metabolite_cache.invalidate(metabolite_id)
@@ -0,0 +1,224 @@
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import BigInteger, LargeBinary, func, literal, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+from msio.backend.core.auth import get_current_user
+from msio.backend.core.samples import SAMPLE_DTYPE, decode_vectors
+from msio.backend.database.models import Metabolite, SampleMatrix, SampleVector
+from msio.backend.database.session import get_db
+from msio.backend.database.schemas import (
+    AuthenticatedUser,
+    MetaboliteSamples,
+    SampleColumnRead,
+    SampleMatrixRead,
+)
+
+
+router = APIRouter()
+
+# The vectors are returned as NumPy arrays, which ORJSONResponse encodes
+# natively (NaN as null): no Python float is created per value.
+
+
+async def get_matrix(db: AsyncSession, matrix_id: int) -> SampleMatrix:
+    matrix = await db.get(SampleMatrix, matrix_id)
+    if matrix is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Sample matrix not found"
+        )
+    return matrix
+
+
+async def read_sample_column(
+    db: AsyncSession, matrix_id: int, offset: int
+) -> tuple[bytes, bytes]:
+    """
+    Read one sample of every vector of a matrix as a single row: the
+    metabolite IDs (big-endian int64) and the sample values
+    (`SAMPLE_DTYPE`), concatenated in ID order by the database.
+
+    On PostgreSQL, the slices are aggregated as bytea. Elsewhere (SQLite
+    stand-in), which has no binary aggregate, they are concatenated as hex.
+
+    Args:
+        db (AsyncSession): The asynchronous database session.
+        matrix_id (int): ID of the matrix.
+        offset (int): Offset of the sample in the vectors, in bytes.
+
+    Returns:
+        tuple[bytes, bytes]: The IDs and the values buffers.
+    """
+    values = func.substr(SampleVector.sample_values, offset + 1, SAMPLE_DTYPE.itemsize)
+    if db.bind.dialect.name == "postgresql":
+        separator = literal(b"", LargeBinary)
+        order = SampleVector.metabolite_id
+        row = (
+            await db.execute(
+                select(
+                    func.string_agg(
+                        func.int8send(SampleVector.metabolite_id.cast(BigInteger)),
+                        aggregate_order_by(separator, order),
+                        type_=LargeBinary,
+                    ),
+                    func.string_agg(
+                        values, aggregate_order_by(separator, order), type_=LargeBinary
+                    ),
+                ).where(SampleVector.matrix_id == matrix_id)
+            )
+        ).one()
+        return row[0] or b"", row[1] or b""
+
+    column = (
+        select(SampleVector.metabolite_id, values.label("sample_value"))
+        .where(SampleVector.matrix_id == matrix_id)
+        .order_by(SampleVector.metabolite_id)
+        .subquery()
+    )
+    row = (
+        await db.execute(
+            select(
+                func.group_concat(func.printf("%016X", column.c.metabolite_id), ""),
+                func.group_concat(func.hex(column.c.sample_value), ""),
+            )
+        )
+    ).one()
+    return bytes.fromhex(row[0] or ""), bytes.fromhex(row[1] or "")
+
+
+@router.get("/sample-matrices/", response_model=list[SampleMatrixRead])
+async def list_sample_matrices(
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+):
+    """
+    List the feature x sample matrices and their samples.
+
+    Args:
+        db (AsyncSession): SQLAlchemy asynchronous session,
+        provided by FastAPI dependency injection.
+        current_user (AuthenticatedUser): The currently authenticated user.
+
+    Returns:
+        list[SampleMatrixRead]: The matrices, by ID.
+    """
+    result = await db.execute(select(SampleMatrix).order_by(SampleMatrix.id))
+    return result.scalars().all()
+
+
+@router.get("/sample-matrices/{matrix_id}", response_model=SampleMatrixRead)
+async def get_sample_matrix(
+    matrix_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+):
+    """
+    Retrieve a feature x sample matrix and its samples.
+
+    Args:
+        matrix_id (int): ID of the matrix.
+        db (AsyncSession): SQLAlchemy asynchronous session,
+        provided by FastAPI dependency injection.
+        current_user (AuthenticatedUser): The currently authenticated user.
+
+    Raises:
+        HTTPException: Returns 404 if the matrix does not exist.
+
+    Returns:
+        SampleMatrixRead: The matrix.
+    """
+    return await get_matrix(db, matrix_id)
+
+
+@router.get(
+    "/sample-matrices/{matrix_id}/samples/{sample}", response_model=SampleColumnRead
+)
+async def get_sample_column(
+    matrix_id: int,
+    sample: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+):
+    """
+    Retrieve the values of one sample for every metabolite of a matrix.
+
+    Only the 8 bytes of the sample are read from each stored vector. The
+    database concatenates them, so the whole column is fetched and decoded
+    as one buffer, without a row or a Python object per metabolite.
+
+    Args:
+        matrix_id (int): ID of the matrix.
+        sample (str): Name of the sample.
+        db (AsyncSession): SQLAlchemy asynchronous session,
+        provided by FastAPI dependency injection.
+        current_user (AuthenticatedUser): The currently authenticated user.
+
+    Raises:
+        HTTPException: Returns 404 if the matrix or the sample does not
+            exist.
+
+    Returns:
+        SampleColumnRead: The metabolite IDs and their values, by ID.
+    """
+    matrix = await get_matrix(db, matrix_id)
+    if sample not in matrix.samples:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Sample not found"
+        )
+
+    offset = matrix.samples.index(sample) * SAMPLE_DTYPE.itemsize
+    metabolite_ids, values = await read_sample_column(db, matrix_id, offset)
+    return ORJSONResponse(
+        {
+            "matrix_id": matrix_id,
+            "sample": sample,
+            # ORJSON only encodes arrays in the native byte order.
+            "metabolite_ids": np.frombuffer(metabolite_ids, dtype=">i8").astype(
+                np.int64
+            ),
+            "values": decode_vectors([values]).ravel(),
+        }
+    )
+
+
+@router.get("/metabolites/{metabolite_id}/samples", response_model=MetaboliteSamples)
+async def get_metabolite_samples(
+    metabolite_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+):
+    """
+    Retrieve the sample vectors of a metabolite, one per matrix holding it.
+
+    Args:
+        metabolite_id (int): ID of the metabolite.
+        db (AsyncSession): SQLAlchemy asynchronous session,
+        provided by FastAPI dependency injection.
+        current_user (AuthenticatedUser): The currently authenticated user.
+
+    Raises:
+        HTTPException: Returns 404 if the metabolite does not exist.
+
+    Returns:
+        MetaboliteSamples: The vectors, by matrix ID.
+    """
+    result = await db.execute(
+        select(SampleMatrix.id, SampleMatrix.samples, SampleVector.sample_values)
+        .join(SampleVector, SampleVector.matrix_id == SampleMatrix.id)
+        .where(SampleVector.metabolite_id == metabolite_id)
+        .order_by(SampleMatrix.id)
+    )
+    vectors = [
+        {
+            "matrix_id": matrix_id,
+            "samples": samples,
+            "values": decode_vectors([sample_values], len(samples))[0],
+        }
+        for matrix_id, samples, sample_values in result
+    ]
+    if not vectors and await db.get(Metabolite, metabolite_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Metabolite not found"
+        )
+    return ORJSONResponse({"metabolite_id": metabolite_id, "vectors": vectors})
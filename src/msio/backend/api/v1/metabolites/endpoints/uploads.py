@@ -0,0 +1,130 @@
+from pathlib import Path
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from msio.backend.api.v1.metabolites.ingest import (
+    UPLOAD_EXTENSIONS,
+    IngestJob,
+    UploadTooLarge,
+    ingest_jobs,
+    save_upload,
+)
+from msio.backend.core.auth import get_current_user
+from msio.backend.core.config import config
+from msio.backend.database.schemas import AuthenticatedUser, IngestJobRead
+
+
+router = APIRouter()
+
+
+def job_status(job: IngestJob) -> IngestJobRead:
+    return IngestJobRead(
+        id=job.id,
+        filename=job.filename,
+        status=job.status,
+        rows_parsed=job.rows_parsed,
+        rows_inserted=job.rows_inserted,
+        rows_rejected=job.rows_rejected,
+        rows_per_second=job.rows_per_second,
+        errors=job.errors,
+        detail=job.detail,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+    )
+
+
+def upload_too_large() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Files are limited to {config.INGEST_MAX_UPLOAD_BYTES} bytes",
+    )
+
+
+@router.post(
+    "/uploads",
+    response_model=IngestJobRead,
+    status_code=status.HTTP_202_ACCEPTED,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/octet-stream": {
+                    "schema": {"type": "string", "format": "binary"}
+                }
+            },
+        }
+    },
+)
+async def upload_metabolites(
+    request: Request,
+    filename: str = Query(..., description="Name of the file, .csv or .xlsx"),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+):
+    """
+    Upload a CSV or .xlsx file of metabolites and start its ingestion.
+
+    The request body is the raw file. It is written to disk as it is
+    received, then parsed, validated and loaded by a background job: the
+    response is sent as soon as the file is stored. Invalid or conflicting
+    rows are rejected and reported in the job status rather than failing
+    the upload.
+
+    Args:
+        request (Request): The request, whose body is the file in the ETL
+            input format.
+        filename (str): Name of the file, its extension gives the format.
+        current_user (AuthenticatedUser): The currently authenticated user.
+
+    Raises:
+        HTTPException: Returns 415 if the file is not a CSV or .xlsx file.
+        HTTPException: Returns 413 if the file is too large, before reading
+            the body when Content-Length announces it, otherwise as soon as
+            the limit is crossed.
+
+    Returns:
+        IngestJobRead: The queued job, poll `/metabolites/uploads/{id}`.
+    """
+    name = Path(filename).name
+    if Path(name).suffix.lower() not in UPLOAD_EXTENSIONS:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Only .csv and .xlsx files are accepted",
+        )
+    max_bytes = config.INGEST_MAX_UPLOAD_BYTES
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > max_bytes:
+        raise upload_too_large()
+
+    job = IngestJob(name, current_user.id)
+    try:
+        await save_upload(request.stream(), job.path, max_bytes)
+    except UploadTooLarge:
+        raise upload_too_large()
+
+    ingest_jobs.submit(job)
+    return job_status(job)
+
+
+@router.get("/uploads/{job_id}", response_model=IngestJobRead)
+async def get_upload_job(
+    job_id: str,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+):
+    """
+    Report the progress of an ingestion job.
+
+    Args:
+        job_id (str): ID returned by the upload.
+        current_user (AuthenticatedUser): The currently authenticated user.
+
+    Raises:
+        HTTPException: Returns 404 if the job does not exist or belongs to
+            another user.
+
+    Returns:
+        IngestJobRead: Row counters, throughput and first rejected rows.
+    """
+    job = ingest_jobs.get(job_id)
+    if job is None or job.uploader_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Upload job not found")
+    return job_status(job)
@@ -0,0 +1,76 @@
+import csv
+import io
+import json
+from typing import AsyncIterator, Literal
+
+from sqlalchemy import select
+from msio.backend.api.v1.metabolites.filters import MetaboliteFilters
+from msio.backend.database.models import Metabolite
+from msio.backend.database.session import AsyncSessionLocal
+
+ExportFormat = Literal["ndjson", "csv"]
+
+# Same layout as the ETL input files, so an export can be loaded back as is.
+EXPORT_COLUMNS = {
+    "Features": Metabolite.feature,
+    "Identification_level": Metabolite.identification_level,
+    "ID_InChI": Metabolite.id_inchi,
+    "CAS_number": Metabolite.cas_number,
+    "Method": Metabolite.method,
+    "Sample Data": Metabolite.sample_data,
+}
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+EXPORT_BATCH_SIZE = 1000
+
+
+def _format_csv(rows, header: bool = False) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if header:
+        writer.writerow(EXPORT_COLUMNS)
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+
+def _format_ndjson(rows) -> str:
+    return "".join(
+        json.dumps(dict(zip(EXPORT_COLUMNS, row))) + "\n" for row in rows
+    )
+
+
+async def iter_export(
+    filters: MetaboliteFilters, export_format: ExportFormat
+) -> AsyncIterator[str]:
+    """
+    Stream the filtered metabolites as CSV or NDJSON text.
+
+    Rows are read from a server-side cursor `EXPORT_BATCH_SIZE` at a time
+    and each batch is formatted and sent before the next one is fetched, so
+    memory and time-to-first-byte do not depend on the table size. The
+    session is opened here rather than injected: the generator outlives the
+    request dependencies.
+
+    Args:
+        filters (MetaboliteFilters): Filters of the exported rows.
+        export_format (ExportFormat): "ndjson" or "csv".
+
+    Yields:
+        str: The next chunk of the export.
+    """
+    stmt = filters.apply(select(*EXPORT_COLUMNS.values())).order_by(Metabolite.id)
+
+    if export_format == "csv":
+        yield _format_csv([], header=True)
+
+    async with AsyncSessionLocal() as session:
+        result = await session.stream(
+            stmt.execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        async for rows in result.partitions():
+            if export_format == "csv":
+                yield _format_csv(rows)
+            else:
+                yield _format_ndjson(rows)
@@ -0,0 +1,155 @@
+import base64
+import json
+from typing import Literal, Optional
+
+from fastapi import HTTPException, Query, status
+from sqlalchemy import Select, tuple_
+from msio.backend.database.models import Metabolite
+from msio.backend.database.validation import (
+    MAX_IDENTIFICATION_LEVEL,
+    MIN_IDENTIFICATION_LEVEL,
+)
+
+SORTABLE_COLUMNS = {
+    "id": Metabolite.id,
+    "feature": Metabolite.feature,
+    "identification_level": Metabolite.identification_level,
+}
+# Columns whose values are unique on their own, no `id` tie-breaker needed.
+UNIQUE_SORT_COLUMNS = {"id", "feature"}
+
+
+class MetaboliteFilters:
+    """
+    Query-string filters shared by the metabolite listing endpoints.
+
+    Attributes:
+        method (str | None): Exact measurement method.
+        identification_level (int | None): Exact identification level.
+        sample_data_min (float | None): Inclusive lower bound of sample data.
+        sample_data_max (float | None): Inclusive upper bound of sample data.
+        uploader_id (int | None): ID of the uploading user.
+    """
+
+    def __init__(
+        self,
+        method: Optional[str] = Query(None),
+        identification_level: Optional[int] = Query(
+            None, ge=MIN_IDENTIFICATION_LEVEL, le=MAX_IDENTIFICATION_LEVEL
+        ),
+        sample_data_min: Optional[float] = Query(None),
+        sample_data_max: Optional[float] = Query(None),
+        uploader_id: Optional[int] = Query(None),
+    ):
+        self.method = method
+        self.identification_level = identification_level
+        self.sample_data_min = sample_data_min
+        self.sample_data_max = sample_data_max
+        self.uploader_id = uploader_id
+
+    def apply(self, stmt: Select) -> Select:
+        """
+        Add the WHERE clauses of the set filters to a statement.
+
+        Args:
+            stmt (Select): Statement selecting from `metabolites`.
+
+        Returns:
+            Select: The filtered statement.
+        """
+        if self.method is not None:
+            stmt = stmt.where(Metabolite.method == self.method)
+        if self.identification_level is not None:
+            stmt = stmt.where(
+                Metabolite.identification_level == self.identification_level
+            )
+        if self.sample_data_min is not None:
+            stmt = stmt.where(Metabolite.sample_data >= self.sample_data_min)
+        if self.sample_data_max is not None:
+            stmt = stmt.where(Metabolite.sample_data <= self.sample_data_max)
+        if self.uploader_id is not None:
+            stmt = stmt.where(Metabolite.uploader_id == self.uploader_id)
+        return stmt
+
+
+class MetaboliteOrdering:
+    """
+    Sort options and keyset cursor of the metabolite listing endpoint.
+
+    The cursor is an opaque token holding the sort value and the `id` of
+    the last row of the previous page, so each page is fetched with an
+    index range scan instead of an OFFSET.
+
+    Attributes:
+        sort (str): Column to sort on.
+        order (str): "asc" or "desc".
+        cursor (str | None): Cursor returned with the previous page.
+    """
+
+    def __init__(
+        self,
+        sort: Literal["id", "feature", "identification_level"] = Query("id"),
+        order: Literal["asc", "desc"] = Query("asc"),
+        cursor: Optional[str] = Query(None),
+    ):
+        self.sort = sort
+        self.order = order
+        self.cursor = cursor
+
+    def apply(self, stmt: Select, limit: int) -> Select:
+        """
+        Add the ORDER BY, keyset condition and LIMIT to a statement. One
+        extra row is fetched to know whether there is a next page.
+
+        Args:
+            stmt (Select): Statement selecting from `metabolites`.
+            limit (int): Page size.
+
+        Raises:
+            HTTPException: Returns 400 if the cursor is invalid.
+
+        Returns:
+            Select: The ordered and bounded statement.
+        """
+        column = SORTABLE_COLUMNS[self.sort]
+        descending = self.order == "desc"
+
+        if self.cursor is not None:
+            value, last_id = self._decode_cursor()
+            if self.sort in UNIQUE_SORT_COLUMNS:
+                key, bound = column, value
+            else:
+                key, bound = tuple_(column, Metabolite.id), tuple_(value, last_id)
+            stmt = stmt.where(key < bound if descending else key > bound)
+
+        order_by = [column.desc() if descending else column.asc()]
+        if self.sort not in UNIQUE_SORT_COLUMNS:
+            order_by.append(Metabolite.id.desc() if descending else Metabolite.id)
+        return stmt.order_by(*order_by).limit(limit + 1)
+
+    def next_cursor(self, last_row) -> str:
+        """
+        Build the cursor pointing after the given row.
+
+        Args:
+            last_row (dict): Last row of the current page.
+
+        Returns:
+            str: Opaque cursor for the next page.
+        """
+        payload = [last_row[self.sort], last_row["id"]]
+        return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+    def _decode_cursor(self) -> tuple:
+        invalid_cursor = HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+        try:
+            value, last_id = json.loads(base64.urlsafe_b64decode(self.cursor))
+        except (ValueError, TypeError) as exc:
+            raise invalid_cursor from exc
+
+        value_type = str if self.sort == "feature" else int
+        if not isinstance(value, value_type) or not isinstance(last_id, int):
+            raise invalid_cursor
+        return value, last_id
@@ -0,0 +1,251 @@
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from msio.backend.api.v1.metabolites.endpoints.bulk import find_conflicts
+from msio.backend.core.cache import metabolite_cache
+from msio.backend.core.config import config
+from msio.backend.core.parser import iter_csv_chunks
+from msio.backend.database.models import Metabolite
+from msio.backend.database.session import AsyncSessionLocal
+
+UPLOAD_EXTENSIONS = {".csv", ".xlsx"}
+# Rejected rows listed in the job status, the others are only counted.
+MAX_REPORTED_ERRORS = 100
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# Parsing runs in these threads (and in worker processes with
+# INGEST_PARSE_WORKERS > 1), never on the event loop. The semaphore bounds
+# the number of jobs running at once, the others stay queued.
+ingest_executor = ThreadPoolExecutor(
+    max_workers=config.INGEST_MAX_CONCURRENT_JOBS, thread_name_prefix="ingest"
+)
+ingest_slots = asyncio.Semaphore(config.INGEST_MAX_CONCURRENT_JOBS)
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+class IngestJob:
+    """
+    State and progress of the ingestion of one uploaded file.
+
+    Attributes:
+        id (str): Job ID.
+        filename (str): Name of the uploaded file.
+        path (Path): Where the upload is stored until the job ends, in
+            `INGEST_UPLOAD_DIR`.
+        uploader_id (int): ID of the uploading user.
+        status (str): queued, running, succeeded or failed.
+    """
+
+    def __init__(self, filename: str, uploader_id: int):
+        self.id = uuid.uuid4().hex
+        self.filename = filename
+        suffix = Path(filename).suffix.lower()
+        self.path = config.INGEST_UPLOAD_DIR / f"{self.id}{suffix}"
+        self.uploader_id = uploader_id
+        self.status = "queued"
+        self.rows_parsed = 0
+        self.rows_inserted = 0
+        self.rows_rejected = 0
+        self.errors: list[str] = []
+        self.detail: Optional[str] = None
+        self.created_at = datetime.now(timezone.utc)
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self._started = 0.0
+        self._elapsed = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        elapsed = self._elapsed
+        if self.status == "running":
+            elapsed = time.perf_counter() - self._started
+        return self.rows_inserted / elapsed if elapsed > 0 else 0.0
+
+    def reject(self, count: int, reasons: list[str]) -> None:
+        """
+        Count rejected rows, keeping the first reasons.
+
+        Args:
+            count (int): Number of rejected rows.
+            reasons (list[str]): Why they were rejected.
+        """
+        self.rows_rejected += count
+        self.errors += reasons[: MAX_REPORTED_ERRORS - len(self.errors)]
+
+
+class IngestJobRegistry:
+    """
+    In-process registry of the ingestion jobs, keeping the last
+    `max_jobs` of them.
+    """
+
+    def __init__(self, max_jobs: int):
+        self.max_jobs = max_jobs
+        self._jobs: OrderedDict[str, IngestJob] = OrderedDict()
+        self._tasks: set[asyncio.Task] = set()
+
+    def get(self, job_id: str) -> Optional[IngestJob]:
+        return self._jobs.get(job_id)
+
+    def submit(self, job: IngestJob) -> None:
+        """
+        Register a job and schedule it on the event loop.
+
+        Args:
+            job (IngestJob): The job, its file already saved.
+        """
+        self._jobs[job.id] = job
+        while len(self._jobs) > self.max_jobs:
+            oldest = next(iter(self._jobs.values()))
+            if oldest.status in ("queued", "running"):
+                break
+            self._jobs.popitem(last=False)
+
+        # The loop only keeps weak references to tasks.
+        task = asyncio.create_task(run_job(job))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+
+ingest_jobs = IngestJobRegistry(config.INGEST_JOB_HISTORY)
+
+
+async def save_upload(
+    stream: AsyncIterator[bytes], destination: Path, max_bytes: int
+) -> int:
+    """
+    Write a request body to disk as it is received.
+
+    The blocks are gathered up to `COPY_BUFFER_SIZE` bytes and written in a
+    worker thread. The body is neither spooled nor kept in memory.
+
+    Args:
+        stream (AsyncIterator[bytes]): The request body, `request.stream()`.
+        destination (Path): Where to store it.
+        max_bytes (int): Maximum accepted size.
+
+    Raises:
+        UploadTooLarge: As soon as more than `max_bytes` are received, the
+            partial copy is removed.
+
+    Returns:
+        int: Size of the file, in bytes.
+    """
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    size = 0
+    buffer = bytearray()
+    try:
+        with destination.open("wb") as f:
+            async for block in stream:
+                size += len(block)
+                if size > max_bytes:
+                    raise UploadTooLarge
+                buffer += block
+                if len(buffer) >= COPY_BUFFER_SIZE:
+                    await run_in_threadpool(f.write, buffer)
+                    buffer = bytearray()
+            await run_in_threadpool(f.write, buffer)
+    except BaseException:
+        destination.unlink(missing_ok=True)
+        raise
+    return size
+
+
+async def insert_chunk(job: IngestJob, chunk: list) -> None:
+    """
+    Insert one validated chunk in its own transaction. Rows conflicting
+    with existing metabolites are rejected, the others are inserted with a
+    single executemany INSERT.
+
+    Args:
+        job (IngestJob): The job being run.
+        chunk (list[MetaboliteInput]): Validated rows.
+    """
+    async with AsyncSessionLocal() as db:
+        conflicts = await find_conflicts(db, chunk)
+        rows = [
+            {**item.model_dump(), "uploader_id": job.uploader_id}
+            for index, item in enumerate(chunk)
+            if index not in conflicts
+        ]
+        job.reject(
+            len(conflicts),
+            [f"{chunk[i].feature}: {detail}" for i, detail in conflicts.items()],
+        )
+        if not rows:
+            return
+        try:
+            await db.execute(insert(Metabolite), rows)
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            job.reject(len(rows), ["Concurrent write conflict, chunk skipped"])
+            return
+
+    job.rows_inserted += len(rows)
+    for row in rows:
+        await metabolite_cache.invalidate(
+            feature=row["feature"],
+            inchi_hash=row["inchi_hash"],
+            cas_number=row["cas_number"],
+        )
+
+
+async def run_job(job: IngestJob) -> None:
+    """
+    Parse, validate and load an uploaded file, updating the job progress.
+
+    Invalid rows are rejected and counted rather than failing the job.
+    Each chunk is parsed in `ingest_executor` and committed on its own, so
+    the rows loaded before a failure stay in the database.
+
+    Args:
+        job (IngestJob): The job to run.
+    """
+    loop = asyncio.get_running_loop()
+    async with ingest_slots:
+        job.status = "running"
+        job.started_at = datetime.now(timezone.utc)
+        job._started = time.perf_counter()
+        parse_errors: list[tuple[int, str]] = []
+        chunks = iter_csv_chunks(
+            job.path,
+            config.INGEST_CHUNK_SIZE,
+            config.INGEST_PARSE_WORKERS,
+            parse_errors,
+        )
+        try:
+            while True:
+                chunk = await loop.run_in_executor(ingest_executor, next, chunks, None)
+                job.rows_parsed += len(chunk or []) + len(parse_errors)
+                job.reject(
+                    len(parse_errors),
+                    [f"line {line}: {error}" for line, error in parse_errors],
+                )
+                parse_errors.clear()
+                if chunk is None:
+                    break
+                await insert_chunk(job, chunk)
+            outcome = "succeeded"
+        except Exception as e:
+            outcome = "failed"
+            job.detail = str(e)
+        finally:
+            await loop.run_in_executor(ingest_executor, chunks.close)
+            job.path.unlink(missing_ok=True)
+
+        job._elapsed = time.perf_counter() - job._started
+        job.finished_at = datetime.now(timezone.utc)
+        job.status = outcome
@@ -0,0 +1,35 @@
+from sqlalchemy import Result, bindparam, select
+from msio.backend.database.models import Metabolite
+from msio.backend.database.schemas import MetaboliteRead
+
+# Read endpoints select these columns as Core rows and return them in an
+# ORJSONResponse: the rows already match the declared response model, so
+# returning a response skips its validation and the jsonable_encoder pass,
+# and orjson encodes the dicts directly. Columns in the order of
+# `MetaboliteRead`.
+READ_COLUMNS = [Metabolite.__table__.c[name] for name in MetaboliteRead.model_fields]
+
+# Statements built once at import: the endpoints only add their filters,
+# order and limit, or bind the looked up value.
+SELECT_METABOLITES = select(*READ_COLUMNS)
+LOOKUP_STATEMENTS = {
+    field: SELECT_METABOLITES.where(
+        Metabolite.__table__.c[field] == bindparam("value")
+    )
+    for field in ("id", "feature", "inchi_hash", "cas_number")
+}
+
+
+def rows_as_dicts(result: Result) -> list[dict]:
+    """
+    Turn the rows of a Core select into plain dicts, ready for JSON.
+
+    Args:
+        result (Result): Result of a select of columns.
+
+    Returns:
+        list[dict]: One dict per row, keyed by column name.
+    """
+    keys = list(result.keys())
+    return [dict(zip(keys, row)) for row in result]
+
@@ -0,0 +1,187 @@
+import re
+import threading
+from collections import Counter, defaultdict
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import event, func, literal, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+from msio.backend.api.v1.metabolites.responses import READ_COLUMNS
+from msio.backend.database.models import Metabolite
+
+# Same default as pg_trgm.word_similarity_threshold.
+MIN_WORD_SIMILARITY = 0.6
+WORD_PATTERN = re.compile(r"[^\W_]+")
+
+
+def trigrams(text: str) -> set[str]:
+    """
+    Split a text into trigrams the way pg_trgm does: lowercased words of
+    alphanumeric characters, padded with two spaces in front and one after.
+
+    Args:
+        text (str): Text to split.
+
+    Returns:
+        set[str]: The trigrams.
+    """
+    grams = set()
+    for word in WORD_PATTERN.findall(text.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TrigramIndex:
+    """
+    In-process trigram index of the feature names, used to search when the
+    database has no pg_trgm (SQLite stand-in).
+
+    A feature scores the share of the query trigrams it contains, which
+    approximates pg_trgm `word_similarity`. The index is built from the
+    database on first use and rebuilt after any write to `metabolites`
+    through its engine (see `trigram_index_for`).
+    """
+
+    def __init__(self):
+        self.dirty = True
+        self._postings: dict[str, list[int]] = {}
+        self._lock = threading.Lock()
+
+    def mark_dirty(self) -> None:
+        self.dirty = True
+
+    def after_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ) -> None:
+        # ORM and Core writes to `metabolites` alike invalidate the index.
+        if context is None or not (
+            context.isinsert or context.isupdate or context.isdelete
+        ):
+            return
+        table = getattr(getattr(context.compiled, "statement", None), "table", None)
+        if table is Metabolite.__table__:
+            self.mark_dirty()
+
+    def build(self, rows) -> None:
+        """
+        Replace the index content.
+
+        Args:
+            rows: `(id, feature)` pairs.
+        """
+        postings = defaultdict(list)
+        for metabolite_id, feature in rows:
+            for gram in trigrams(feature):
+                postings[gram].append(metabolite_id)
+        with self._lock:
+            self._postings = dict(postings)
+
+    def search(self, query: str) -> list[tuple[int, float]]:
+        """
+        Return the features similar enough to the query, best first.
+
+        Args:
+            query (str): Searched text.
+
+        Returns:
+            list[tuple[int, float]]: `(id, score)` pairs.
+        """
+        grams = trigrams(query)
+        if not grams:
+            return []
+        with self._lock:
+            postings = self._postings
+        counts = Counter()
+        for gram in grams:
+            counts.update(postings.get(gram, ()))
+
+        matches = [
+            (metabolite_id, shared / len(grams))
+            for metabolite_id, shared in counts.items()
+            if shared / len(grams) >= MIN_WORD_SIMILARITY
+        ]
+        matches.sort(key=lambda match: (-match[1], match[0]))
+        return matches
+
+
+# Index of each engine searched without pg_trgm, dropped with the engine.
+trigram_indexes: WeakKeyDictionary[Engine, TrigramIndex] = WeakKeyDictionary()
+
+
+def trigram_index_for(engine: Engine) -> TrigramIndex:
+    """
+    Return the trigram index of an engine, creating it on first use.
+
+    Only this engine's writes are listened to, the PostgreSQL engine of
+    the API never pays for the listener.
+
+    Args:
+        engine (Engine): The (sync) engine of the searched database.
+
+    Returns:
+        TrigramIndex: The index of its `metabolites` table.
+    """
+    index = trigram_indexes.get(engine)
+    if index is None:
+        index = trigram_indexes[engine] = TrigramIndex()
+        event.listen(engine, "after_cursor_execute", index.after_cursor_execute)
+    return index
+
+
+async def search_metabolites(
+    db: AsyncSession, query: str, limit: int, offset: int
+) -> list[dict]:
+    """
+    Rank the metabolites whose feature name resembles the query.
+
+    On PostgreSQL, the pg_trgm GiST index filters on `<%` and returns the
+    rows nearest first (`<<->`, word similarity distance), without scoring
+    every row. Elsewhere, the engine's `TrigramIndex` is used.
+
+    Args:
+        db (AsyncSession): The asynchronous database session.
+        query (str): Searched text, e.g. a partial or misspelled name.
+        limit (int): Maximum number of results.
+        offset (int): Number of results to skip.
+
+    Returns:
+        list[dict]: Metabolite columns and `score` (1 is a perfect match),
+            best first.
+    """
+    if db.bind.dialect.name == "postgresql":
+        searched = literal(query)
+        stmt = (
+            select(
+                *READ_COLUMNS,
+                func.word_similarity(searched, Metabolite.feature).label("score"),
+            )
+            .where(searched.op("<%")(Metabolite.feature))
+            .order_by(searched.op("<<->")(Metabolite.feature), Metabolite.id)
+            .limit(limit)
+            .offset(offset)
+        )
+        result = await db.execute(stmt)
+        return [dict(row._mapping) for row in result]
+
+    trigram_index = trigram_index_for(db.bind.sync_engine)
+    if trigram_index.dirty:
+        # Cleared before reading, so writes made meanwhile trigger a rebuild.
+        trigram_index.dirty = False
+        result = await db.execute(select(Metabolite.id, Metabolite.feature))
+        trigram_index.build(result.all())
+
+    matches = trigram_index.search(query)[offset : offset + limit]
+    if not matches:
+        return []
+    result = await db.execute(
+        select(*READ_COLUMNS).where(
+            Metabolite.id.in_([metabolite_id for metabolite_id, _ in matches])
+        )
+    )
+    rows: dict[int, dict] = {row.id: dict(row._mapping) for row in result}
+    return [
+        {**rows[metabolite_id], "score": score}
+        for metabolite_id, score in matches
+        if metabolite_id in rows
+    ]
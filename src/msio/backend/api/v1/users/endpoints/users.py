@@ -6,8 +6,8 @@ from msio.backend.database.schemas import UserCreate, UserRead
 from msio.backend.database.models import User
 from msio.backend.database.session import get_db
 from src.msio.backend.core.auth import (
-    get_password_hash,
-    verify_password,
+    get_password_hash_async,
+    verify_password_async,
     create_access_token,
 )
 
@@ -31,6 +31,7 @@ async def register(user_in: UserCreate, db: AsyncSession = Depends(get_db)):
 
     Raises:
         HTTPException: 400 error if the username is already registered.
+        HTTPException: 503 error if too many passwords are being hashed.
 
     Returns:
         UserRead: The created user, excluding sensitive fields such as the
@@ -39,7 +40,7 @@ async def register(user_in: UserCreate, db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(User).where(User.username == user_in.username))
     if result.scalars().first():
         raise HTTPException(status_code=400, detail="Username already registered")
-    hashed_pw = get_password_hash(user_in.password)
+    hashed_pw = await get_password_hash_async(user_in.password)
     user = User(
         username=user_in.username, email=user_in.email, hashed_password=hashed_pw
     )
@@ -66,13 +67,16 @@ async def login(
 
     Raises:
         HTTPException: 400 error if username or password is incorrect.
+        HTTPException: 503 error if too many passwords are being checked.
 
     Returns:
         dict: Access token and token type (bearer).
     """
     result = await db.execute(select(User).where(User.username == form_data.username))
     user = result.scalars().first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user or not await verify_password_async(
+        form_data.password, user.hashed_password
+    ):
         raise HTTPException(status_code=400, detail="Incorrect username or password")
     access_token = create_access_token(data={"sub": user.username})
     return {"access_token": access_token, "token_type": "bearer"}
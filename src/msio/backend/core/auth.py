@@ -1,12 +1,17 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from msio.backend.database.models import User
+from msio.backend.database.schemas import AuthenticatedUser
 from msio.backend.database.session import get_db
+from msio.backend.core.cache import TTLCache
 from msio.backend.core.config import config
 
 # Configuration
@@ -17,6 +22,35 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 60
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/users/auth/token")
 
+# bcrypt runs in a small dedicated pool so it never blocks the event loop,
+# and at most PASSWORD_HASH_MAX_PENDING calls may wait for it.
+password_executor = ThreadPoolExecutor(
+    max_workers=config.PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt"
+)
+password_slots = asyncio.Semaphore(config.PASSWORD_HASH_MAX_PENDING)
+
+# Authenticated users (`AuthenticatedUser` snapshots) by username, saves a
+# query per authenticated request. The listener below only sees the changes
+# made in this process: other workers keep an entry until its TTL expires.
+user_cache = TTLCache(config.AUTH_CACHE_MAX_SIZE, config.AUTH_CACHE_TTL_SECONDS)
+
+
+def invalidate_user(username: str) -> None:
+    """
+    Drop a user from the authentication cache, so that the next request
+    reloads it from the database.
+
+    Args:
+        username (str): Username of the user.
+    """
+    user_cache.invalidate(username)
+
+
+@event.listens_for(User.is_active, "set")
+def _invalidate_on_activation_change(target, value, oldvalue, initiator):
+    if target.username is not None and value != oldvalue:
+        invalidate_user(target.username)
+
 
 def verify_password(plain_password, hashed_password):
     """
@@ -45,6 +79,62 @@ def get_password_hash(password):
     return pwd_context.hash(password)
 
 
+async def run_password_task(func, *args):
+    """
+    Run a bcrypt function in the dedicated thread pool.
+
+    Calls beyond the worker count queue up to `PASSWORD_HASH_MAX_PENDING`,
+    further calls are rejected instead of piling up, so a login storm can
+    not starve the other requests.
+
+    Args:
+        func (Callable): `verify_password` or `get_password_hash`.
+        *args: Arguments of the function.
+
+    Raises:
+        HTTPException: Returns 503 if too many calls are already pending.
+
+    Returns:
+        Any: The result of the function.
+    """
+    if password_slots.locked():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many authentication requests, retry later",
+            headers={"Retry-After": "1"},
+        )
+    async with password_slots:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(password_executor, func, *args)
+
+
+async def verify_password_async(plain_password, hashed_password):
+    """
+    Same as `verify_password`, without blocking the event loop.
+
+    Args:
+        plain_password (str): The plain text password input by the user.
+        hashed_password (str): The hashed password stored in the database.
+
+    Returns:
+        bool: True if the password is correct, False otherwise.
+    """
+    return await run_password_task(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password):
+    """
+    Same as `get_password_hash`, without blocking the event loop.
+
+    Args:
+        password (str): The plain text password to hash.
+
+    Returns:
+        str: The securely hashed password string.
+    """
+    return await run_password_task(get_password_hash, password)
+
+
 def create_access_token(data: dict) -> str:
     """
     Create a JWT access token using the configured expiration time.
@@ -65,19 +155,25 @@ def create_access_token(data: dict) -> str:
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)
-) -> User:
+) -> AuthenticatedUser:
     """
     Extract and return the current authenticated user from the JWT token.
 
+    Users are cached for `AUTH_CACHE_TTL_SECONDS` (60 at most). The cache
+    entry is dropped as soon as `is_active` changes in this process; a user
+    deactivated by another worker or directly in the database is still
+    accepted until the entry expires.
+
     Args:
         token (str): Bearer token from the Authorization header.
         db (AsyncSession): Database session.
 
     Raises:
-        HTTPException: If the token is invalid or user not found.
+        HTTPException: If the token is invalid, the user not found or
+        inactive.
 
     Returns:
-        User: Authenticated user object.
+        AuthenticatedUser: Snapshot of the authenticated user.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -92,8 +188,19 @@ async def get_current_user(
     except JWTError as exc:
         raise credentials_exception from exc
 
-    result = await db.execute(select(User).where(User.username == username))
-    user = result.scalars().first()
+    user = user_cache.get(username)
     if user is None:
+        result = await db.execute(
+            select(User.id, User.username, User.is_active).where(
+                User.username == username
+            )
+        )
+        row = result.first()
+        if row is None:
+            raise credentials_exception
+        user = AuthenticatedUser.model_validate(row)
+        user_cache.set(username, user)
+
+    if not user.is_active:
         raise credentials_exception
     return user
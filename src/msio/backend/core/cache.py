@@ -0,0 +1,263 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+from msio.backend.core.config import config
+
+
+class TTLCache:
+    """
+    In-process LRU cache whose entries expire after a fixed time to live.
+
+    Lookups and insertions are O(1). Hit, miss and eviction counters are
+    kept so the effect of the cache can be observed.
+
+    Attributes:
+        max_size (int): Maximum number of entries, the least recently used
+            one is evicted beyond it.
+        ttl (float): Time to live of an entry, in seconds.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Return the cached value of a key, or None if it is missing or expired.
+
+        Args:
+            key (Hashable): Cache key.
+
+        Returns:
+            Any | None: The cached value.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Cache a value, evicting the least recently used entries if needed.
+
+        Args:
+            key (Hashable): Cache key.
+            value (Any): Value to cache.
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """
+        Drop a key from the cache, if present.
+
+        Args:
+            key (Hashable): Cache key.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Drop every entry, keeping the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Return the cache counters.
+
+        Returns:
+            dict[str, Any]: Hits, misses, hit ratio, evictions and size.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+        }
+
+
+class LocalCacheBackend:
+    """
+    Cache backend storing the entries in an in-process `TTLCache`.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.cache = TTLCache(max_size, ttl)
+
+    async def get(self, key: str) -> Optional[Any]:
+        return self.cache.get(key)
+
+    async def set(self, key: str, value: Any) -> None:
+        self.cache.set(key, value)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self.cache.invalidate(key)
+
+
+class RedisCacheBackend:
+    """
+    Cache backend shared by every worker, stored in Redis as JSON.
+
+    Requires the optional `redis` package.
+    """
+
+    def __init__(self, url: str, ttl: float):
+        try:
+            from redis import asyncio as redis
+        except ImportError as exc:
+            raise RuntimeError(
+                "The redis package is required for the redis cache backend"
+            ) from exc
+        self.client = redis.from_url(url)
+        self.ttl = ttl
+
+    async def get(self, key: str) -> Optional[Any]:
+        raw = await self.client.get(key)
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: Any) -> None:
+        # Milliseconds, a sub-second TTL would round down to 0 in seconds.
+        ttl_ms = max(1, round(self.ttl * 1000))
+        await self.client.set(key, json.dumps(value), px=ttl_ms)
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self.client.delete(*keys)
+
+
+class MetaboliteCache:
+    """
+    Read-through cache of metabolite records, on top of a cache backend.
+
+    Records are stored once, under their `id`. The other lookup fields
+    (`feature`, `inchi_hash`, `cas_number`) map to that id, and a record
+    found through them is checked against the looked up value, so a stale
+    mapping is a miss rather than a wrong answer. Invalidating a record
+    therefore only needs its id.
+
+    Attributes:
+        backend: `LocalCacheBackend`, `RedisCacheBackend` or any object
+            with the same async get/set/delete methods.
+    """
+
+    LOOKUP_FIELDS = ("feature", "inchi_hash", "cas_number")
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, field: str, value: Any) -> Optional[dict]:
+        """
+        Return the cached record whose `field` equals `value`.
+
+        Args:
+            field (str): "id" or one of `LOOKUP_FIELDS`.
+            value (Any): Looked up value.
+
+        Returns:
+            dict | None: The cached record, None on a miss.
+        """
+        metabolite_id = value
+        if field != "id":
+            metabolite_id = await self.backend.get(f"metabolite:{field}:{value}")
+
+        record = None
+        if metabolite_id is not None:
+            record = await self.backend.get(f"metabolite:id:{metabolite_id}")
+        if record is not None and record[field] != value:
+            record = None
+
+        if record is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return record
+
+    async def put(self, record: dict) -> None:
+        """
+        Cache a record under its id and its lookup fields.
+
+        Args:
+            record (dict): Metabolite columns.
+        """
+        await self.backend.set(f"metabolite:id:{record['id']}", record)
+        for field in self.LOOKUP_FIELDS:
+            if record[field] is not None:
+                key = f"metabolite:{field}:{record[field]}"
+                await self.backend.set(key, record["id"])
+
+    async def invalidate(self, *metabolite_ids: int, **values: Any) -> None:
+        """
+        Drop cached records by id, and lookup mappings by value.
+
+        Args:
+            *metabolite_ids (int): IDs of the modified or deleted records.
+            **values (Any): Lookup field -> value whose mapping is dropped,
+                for created records.
+        """
+        keys = [f"metabolite:id:{id_}" for id_ in metabolite_ids]
+        keys += [
+            f"metabolite:{field}:{value}"
+            for field, value in values.items()
+            if value is not None
+        ]
+        await self.backend.delete(*keys)
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Return the cache counters.
+
+        Returns:
+            dict[str, Any]: Hits, misses and hit ratio.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def build_cache_backend():
+    """
+    Create the metabolite cache backend selected in the configuration.
+
+    Returns:
+        LocalCacheBackend | RedisCacheBackend: The cache backend.
+    """
+    if config.METABOLITE_CACHE_BACKEND == "redis":
+        return RedisCacheBackend(
+            config.REDIS_URL, config.METABOLITE_CACHE_TTL_SECONDS
+        )
+    return LocalCacheBackend(
+        config.METABOLITE_CACHE_MAX_SIZE, config.METABOLITE_CACHE_TTL_SECONDS
+    )
+
+
+metabolite_cache = MetaboliteCache(build_cache_backend())
@@ -1,5 +1,12 @@
+import tempfile
+from pathlib import Path
+from typing import Any, Literal, Optional
+from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from msio.backend.database.pool import InstrumentedAsyncPool
 
 
 class Config(BaseSettings):
@@ -11,11 +18,39 @@ class Config(BaseSettings):
     POSTGRES_DB: str
     SQLALCHEMY_ECHO: bool = False
     SQLALCHEMY_TRACK_MODIFICATIONS: bool = False
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_QUERY_BUDGET: int = 20
+    DB_SERVER_TIMING: bool = False
     CORS_ORIGIN: str = "*"
     VERSION: str = "0.1.0"
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
+    # Also the longest a user deactivated by another worker, or directly in
+    # the database, keeps authenticating: bounded for that reason.
+    AUTH_CACHE_TTL_SECONDS: float = Field(30, ge=0, le=60)
+    AUTH_CACHE_MAX_SIZE: int = 1024
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    METABOLITE_CACHE_BACKEND: Literal["local", "redis"] = "local"
+    METABOLITE_CACHE_TTL_SECONDS: float = 60
+    METABOLITE_CACHE_MAX_SIZE: int = 10000
+    REDIS_URL: Optional[str] = None
+    METABOLITES_PAGE_SIZE: int = 100
+    METABOLITES_MAX_PAGE_SIZE: int = 1000
+    METABOLITES_BULK_MAX_ITEMS: int = 5000
+    METABOLITES_SEARCH_MAX_OFFSET: int = 1000
+    INGEST_UPLOAD_DIR: Path = Path(tempfile.gettempdir()) / "msio_uploads"
+    INGEST_MAX_UPLOAD_BYTES: int = 2 * 1024**3
+    INGEST_MAX_CONCURRENT_JOBS: int = 2
+    INGEST_PARSE_WORKERS: int = 1
+    INGEST_CHUNK_SIZE: int = 5000
+    INGEST_JOB_HISTORY: int = 1000
 
     model_config = SettingsConfigDict(
         env_file="src/../.env", env_file_encoding="utf-8", extra="ignore"
@@ -28,6 +63,41 @@ class Config(BaseSettings):
             f"@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
         )
 
+    def create_async_engine(self, **overrides: Any) -> AsyncEngine:
+        """
+        Create an async engine with the configured pool and statement cache.
+
+        Setting the statement cache size to 0 disables both the SQLAlchemy
+        and the asyncpg prepared statement caches (needed behind pgbouncer in
+        transaction mode).
+
+        Args:
+            **overrides (Any): `create_async_engine` options overriding the
+                configured ones. With a `poolclass` override, the queue pool
+                options are not applied.
+
+        Returns:
+            AsyncEngine: The new engine.
+        """
+        url = make_url(self.SQLALCHEMY_DATABASE_URI).update_query_dict(
+            {"prepared_statement_cache_size": str(self.DB_STATEMENT_CACHE_SIZE)}
+        )
+        options = {
+            "echo": self.SQLALCHEMY_ECHO,
+            "connect_args": {"statement_cache_size": self.DB_STATEMENT_CACHE_SIZE},
+        }
+        if "poolclass" not in overrides:
+            options.update(
+                poolclass=InstrumentedAsyncPool,
+                pool_size=self.DB_POOL_SIZE,
+                max_overflow=self.DB_MAX_OVERFLOW,
+                pool_timeout=self.DB_POOL_TIMEOUT,
+                pool_recycle=self.DB_POOL_RECYCLE,
+                pool_pre_ping=self.DB_POOL_PRE_PING,
+            )
+        options.update(overrides)
+        return create_async_engine(url, **options)
+
 
 @lru_cache()
 def get_config() -> Config:
@@ -0,0 +1,26 @@
+import hashlib
+from typing import Optional
+
+# Hex digits kept from the SHA-256 of an InChI (128 bits).
+INCHI_HASH_LENGTH = 32
+
+
+def inchi_hash(inchi: Optional[str]) -> Optional[str]:
+    """
+    Derive the fixed-width key under which an InChI is indexed.
+
+    InChI strings can be hundreds of characters long, so the unique index
+    and the structure lookups use this digest instead of the full string.
+    The migration backfilling `metabolites.inchi_hash` computes the same
+    value in SQL, keep both in sync.
+
+    Args:
+        inchi (str | None): InChI identifier, as stored.
+
+    Returns:
+        str | None: First 32 hex digits of the SHA-256 of the UTF-8 InChI,
+            None if there is no InChI.
+    """
+    if not inchi:
+        return None
+    return hashlib.sha256(inchi.encode("utf-8")).hexdigest()[:INCHI_HASH_LENGTH]
@@ -0,0 +1,199 @@
+import time
+from bisect import bisect_left
+from collections import defaultdict
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from structlog import get_logger
+from structlog.contextvars import bind_contextvars, unbind_contextvars
+from msio.backend.core.config import config
+from msio.backend.database.instrumentation import QueryStats, track_queries
+
+# Upper bounds of the latency histogram buckets, in seconds.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Label of the requests that did not match any route, to bound cardinality.
+UNMATCHED_ROUTE = "unmatched"
+
+logger = get_logger(__name__)
+
+
+class HTTPMetrics:
+    """
+    In-process HTTP metrics, rendered in the Prometheus text format.
+
+    Requests are labelled by method and route template (not the raw path),
+    so the number of series stays bounded. Recording a request is a few
+    dict updates and one bisect.
+    """
+
+    def __init__(self):
+        self.in_flight = 0
+        self.requests = defaultdict(int)
+        self.bucket_counts = defaultdict(lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+        self.latency_sums = defaultdict(float)
+
+    def observe(self, method: str, route: str, status: int, latency: float) -> None:
+        """
+        Record a finished request.
+
+        Args:
+            method (str): HTTP method.
+            route (str): Route template.
+            status (int): Response status code.
+            latency (float): Request duration, in seconds.
+        """
+        self.requests[(method, route, status)] += 1
+        self.bucket_counts[(method, route)][bisect_left(LATENCY_BUCKETS, latency)] += 1
+        self.latency_sums[(method, route)] += latency
+
+    def render(self) -> str:
+        """
+        Render the metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: The metrics.
+        """
+        lines = [
+            "# HELP http_requests_in_flight Requests currently being served.",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {self.in_flight}",
+            "# HELP http_requests_total Requests served, by route and status.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (method, route, status), count in sorted(self.requests.items()):
+            lines.append(
+                f'http_requests_total{{method="{method}",route="{route}",'
+                f'status="{status}"}} {count}'
+            )
+
+        lines += [
+            "# HELP http_request_duration_seconds Request latency, by route.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route), counts in sorted(self.bucket_counts.items()):
+            labels = f'method="{method}",route="{route}"'
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, counts):
+                cumulative += count
+                lines.append(
+                    f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} '
+                    f"{cumulative}"
+                )
+            total = cumulative + counts[-1]
+            lines += [
+                f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {total}',
+                f"http_request_duration_seconds_sum{{{labels}}} "
+                f"{self.latency_sums[(method, route)]}",
+                f"http_request_duration_seconds_count{{{labels}}} {total}",
+            ]
+        return "\n".join(lines) + "\n"
+
+
+http_metrics = HTTPMetrics()
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware feeding `http_metrics` with every HTTP request.
+    """
+
+    def __init__(self, app: ASGIApp, metrics: HTTPMetrics = http_metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        self.metrics.in_flight += 1
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.metrics.in_flight -= 1
+            # The router stores the matched route in the scope.
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            self.metrics.observe(
+                scope["method"], route, status_code, time.perf_counter() - started
+            )
+
+
+class QueryStatsMiddleware:
+    """
+    Pure ASGI middleware collecting the SQL statements of each HTTP request.
+
+    The query count, DB time and slowest statement are bound to the
+    structlog context when the response starts, so the access log and any
+    later log line of the request carry them. They can also be sent to the
+    client in a `Server-Timing` header. A warning is logged when a request
+    runs more statements than the budget, with the most repeated statement
+    to spot N+1 patterns.
+
+    Attributes:
+        budget (int): Statements allowed per request before warning.
+        server_timing (bool): Whether to add the `Server-Timing` header.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        budget: int = config.DB_QUERY_BUDGET,
+        server_timing: bool = config.DB_SERVER_TIMING,
+    ):
+        self.app = app
+        self.budget = budget
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+
+            async def send_with_stats(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    bind_contextvars(**stats.summary())
+                    if self.server_timing:
+                        MutableHeaders(scope=message).append(
+                            "Server-Timing", self.server_timing_value(stats)
+                        )
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_stats)
+            finally:
+                if stats.count > self.budget:
+                    statement, repeats = stats.most_repeated()
+                    logger.warning(
+                        "query_budget_exceeded",
+                        method=scope["method"],
+                        path=scope["path"],
+                        budget=self.budget,
+                        most_repeated_statement=statement,
+                        most_repeated_count=repeats,
+                        **stats.summary(),
+                    )
+                unbind_contextvars(*stats.summary())
+
+    @staticmethod
+    def server_timing_value(stats: QueryStats) -> str:
+        """
+        Format the statistics as a `Server-Timing` header value.
+
+        Args:
+            stats (QueryStats): Statistics of the request so far.
+
+        Returns:
+            str: The header value.
+        """
+        return f'db;dur={stats.total_time * 1000:.3f};desc="{stats.count} queries"'
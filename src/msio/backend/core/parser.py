@@ -0,0 +1,705 @@
+import csv
+import hashlib
+import io
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator, List, Optional
+import numpy as np
+from openpyxl import load_workbook
+from pydantic import AliasGenerator, ConfigDict, ValidationError
+from msio.backend.core.samples import parse_sample_matrix
+from msio.backend.database.validation import MetaboliteFields, validate_batch
+
+
+# Field of `MetaboliteInput` -> column of the input files.
+CSV_COLUMNS = {
+    "feature": "Features",
+    "identification_level": "Identification_level",
+    "id_inchi": "ID_InChI",
+    "cas_number": "CAS_number",
+    "method": "Method",
+    "sample_data": "Sample Data",
+}
+
+
+class MetaboliteInput(MetaboliteFields):
+    """
+    Pydantic model for validating and parsing a single row of metabolite
+    data from a CSV file.
+
+    The fields and their validation are shared with the API (see
+    `MetaboliteFields`), only read from the CSV column names.
+
+    Attributes:
+        feature (str): Name of the metabolite feature.
+        identification_level (int): Identification level.
+        id_inchi (str | None): InChI identifier of the metabolite (optional).
+        cas_number (str | None): CAS number of the metabolite (optional).
+        method (str): identify the metabolite.
+        sample_data (float | None): Sample quantity;
+                    can be a float, "ND", "NA", or empty (converted to None).
+        inchi_hash (str | None): Digest of `id_inchi`, derived.
+
+    Raises:
+        ValueError: If both `id_inchi` and `cas_number` are missing.
+        ValueError: If `sample_data` cannot be converted to
+                    float.
+    """
+
+    model_config = ConfigDict(
+        alias_generator=AliasGenerator(validation_alias=CSV_COLUMNS.get)
+    )
+
+
+DEFAULT_CHUNK_SIZE = 5_000
+DEFAULT_CHUNK_BYTES = 8 * 1024 * 1024
+# Sheet holding the rows in the upload template workbook.
+DEFAULT_XLSX_SHEET = "Data to upload"
+# Workbook headers spelled differently from the CSV ones.
+XLSX_HEADER_ALIASES = {"Sample_Data": "Sample Data"}
+
+
+def _key_digest(value: str) -> int:
+    """
+    Hash an identifier (feature name, InChI or CAS number) into a compact
+    64-bit integer so uniqueness checks do not keep the full strings alive.
+
+    Args:
+        value (str): Identifier to hash.
+
+    Returns:
+        int: 64-bit digest of the identifier.
+    """
+    return int.from_bytes(
+        hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big"
+    )
+
+
+class UniquenessTracker:
+    """
+    Enforces the feature <-> ID one-to-one rule across the rows of a file.
+
+    Only 64-bit digests of the feature names and identifiers are stored, so
+    memory grows by a few dozen bytes per distinct row instead of by the
+    size of the InChI strings.
+    """
+
+    def __init__(self):
+        self.seen_features: dict[int, int] = {}
+        self.seen_ids: dict[int, int] = {}
+
+    def check(self, input_data: MetaboliteInput, line: int) -> None:
+        """
+        Register a validated row, checking it against the previous ones.
+
+        Args:
+            input_data (MetaboliteInput): The validated row.
+            line (int): Line number of the row in the source file.
+
+        Raises:
+            ValueError: If the ID is already used for another feature.
+            ValueError: If the feature is already linked to another ID.
+        """
+        self.check_keys(
+            input_data.feature, input_data.id_inchi or input_data.cas_number, line
+        )
+
+    def check_raw(self, row: dict, line: int) -> None:
+        """
+        Register a raw CSV row that is known to be valid, without running
+        the pydantic validation (used for chunks skipped by the incremental
+        loader).
+
+        Args:
+            row (dict): Raw CSV row.
+            line (int): Line number of the row in the source file.
+        """
+        id_inchi = row["ID_InChI"]
+        id_key = id_inchi if id_inchi and id_inchi.strip() else row["CAS_number"]
+        self.check_keys(row["Features"], id_key, line)
+
+    def check_keys(self, feature: str, id_key: str, line: int) -> None:
+        """
+        Register a feature/ID pair, checking it against the previous ones.
+
+        Args:
+            feature (str): Feature name.
+            id_key (str): InChI, or CAS number when there is no InChI.
+            line (int): Line number of the row in the source file.
+
+        Raises:
+            ValueError: If the ID is already used for another feature.
+            ValueError: If the feature is already linked to another ID.
+        """
+        id_key = _key_digest(id_key)
+        feature_key = _key_digest(feature)
+
+        if id_key in self.seen_ids and self.seen_ids[id_key] != feature_key:
+            raise ValueError(f"[Line {line}] ID already used for another feature")
+        if (
+            feature_key in self.seen_features
+            and self.seen_features[feature_key] != id_key
+        ):
+            raise ValueError(f"[Line {line}] Feature already linked to another ID")
+
+        self.seen_ids[id_key] = feature_key
+        self.seen_features[feature_key] = id_key
+
+
+class UniqueKeyTracker:
+    """
+    Tracks each unique column of `metabolites` (feature, inchi_hash,
+    cas_number) on its own across the rows of a file, with the line that
+    first used each value.
+
+    Stricter than `UniquenessTracker`, as the database is: a repeated row,
+    or a CAS number shared by rows of different features and InChIs, is a
+    conflict. Only 64-bit digests of the values are stored.
+    """
+
+    KEYS = ("feature", "inchi_hash", "cas_number")
+
+    def __init__(self):
+        self.first_lines: dict[str, dict[int, int]] = {key: {} for key in self.KEYS}
+
+    def check(self, input_data: MetaboliteInput, line: int) -> dict[str, int]:
+        """
+        Register a validated row, unless one of its unique values was
+        already used by a previous row.
+
+        Args:
+            input_data (MetaboliteInput): The validated row.
+            line (int): Line number of the row in the source file.
+
+        Returns:
+            dict[str, int]: Line that first used the value of each
+                conflicting column, empty if the row was registered.
+        """
+        digests = {
+            key: _key_digest(value)
+            for key in self.KEYS
+            if (value := getattr(input_data, key)) is not None
+        }
+        conflicts = {
+            key: self.first_lines[key][digest]
+            for key, digest in digests.items()
+            if digest in self.first_lines[key]
+        }
+        if not conflicts:
+            for key, digest in digests.items():
+                self.first_lines[key][digest] = line
+        return conflicts
+
+
+def is_xlsx(file_path: Path) -> bool:
+    """
+    Tell whether a file is an Excel workbook rather than a CSV file.
+
+    Args:
+        file_path (Path): Path to the file.
+
+    Returns:
+        bool: True for .xlsx files.
+    """
+    return file_path.suffix.lower() == ".xlsx"
+
+
+def _xlsx_cell_to_str(value) -> str:
+    """
+    Converts a workbook cell to the text a CSV file would hold.
+
+    Args:
+        value (Any): Cell value.
+
+    Returns:
+        str: "" for empty cells, integral floats without decimals.
+    """
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def iter_raw_xlsx_chunks(
+    file_path: Path,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    sheet_name: str = DEFAULT_XLSX_SHEET,
+) -> Iterator[List[tuple[int, dict]]]:
+    """
+    Streams the rows of an Excel workbook sheet, unvalidated, in chunks of
+    at most `chunk_size` items.
+
+    The workbook is opened in read-only mode, which parses the sheet as it
+    is iterated instead of loading it whole. Cells are converted to text
+    and headers to the CSV names, so rows validate exactly like CSV rows.
+    Empty rows, as left in the upload template, are skipped.
+
+    Args:
+        file_path (Path): Path to the .xlsx file.
+        chunk_size (int): Maximum number of rows per yielded chunk.
+        sheet_name (str): Sheet holding the header and the rows.
+
+    Raises:
+        ValueError: If the sheet does not exist.
+
+    Yields:
+        List[tuple[int, dict]]: `(row number, raw row)` pairs.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer")
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        if sheet_name not in workbook.sheetnames:
+            raise ValueError(f"Sheet '{sheet_name}' not found in {file_path}")
+        rows = workbook[sheet_name].iter_rows(values_only=True)
+
+        header = [_xlsx_cell_to_str(cell).strip() for cell in next(rows, ())]
+        columns = [
+            (index, XLSX_HEADER_ALIASES.get(name, name))
+            for index, name in enumerate(header)
+            if name
+        ]
+        chunk = []
+
+        for line, values in enumerate(rows, start=2):
+            if all(cell is None for cell in values):
+                continue
+            row = {
+                name: _xlsx_cell_to_str(values[index] if index < len(values) else None)
+                for index, name in columns
+            }
+            chunk.append((line, row))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+
+        if chunk:
+            yield chunk
+    finally:
+        workbook.close()
+
+
+def iter_raw_chunks(
+    file_path: Path, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[List[tuple[int, dict]]]:
+    """
+    Streams the rows of a CSV file or Excel workbook, unvalidated, in
+    chunks of at most `chunk_size` items.
+
+    Args:
+        file_path (Path): Path to the CSV or .xlsx file.
+        chunk_size (int): Maximum number of rows per yielded chunk.
+
+    Yields:
+        List[tuple[int, dict]]: `(line number, raw row)` pairs.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer")
+    if is_xlsx(file_path):
+        yield from iter_raw_xlsx_chunks(file_path, chunk_size)
+        return
+
+    with file_path.open(newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f, delimiter=",")
+        chunk = []
+
+        for row in reader:
+            chunk.append((reader.line_num, row))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+
+        if chunk:
+            yield chunk
+
+
+def chunk_digest(rows: List[tuple[int, dict]]) -> str:
+    """
+    Fingerprint the content of a raw chunk, ignoring line numbers.
+
+    Args:
+        rows (List[tuple[int, dict]]): Chunk from `iter_raw_chunks`.
+
+    Returns:
+        str: Hex SHA-256 digest of the chunk values.
+    """
+    digest = hashlib.sha256()
+    for _, row in rows:
+        digest.update("\x1f".join(v or "" for v in row.values()).encode("utf-8"))
+        digest.update(b"\x1e")
+    return digest.hexdigest()
+
+
+def validate_chunk(rows: List[tuple[int, dict]]) -> List[MetaboliteInput | str]:
+    """
+    Validates the rows of a raw chunk as one batch (see `validate_batch`),
+    without the cross-row checks. Errors are returned as messages, so the
+    function can run in a worker process.
+
+    Args:
+        rows (List[tuple[int, dict]]): Chunk from `iter_raw_chunks`.
+
+    Returns:
+        List[MetaboliteInput | str]: For each row, the validated input or
+        the validation error message.
+    """
+    return [
+        str(result) if isinstance(result, ValidationError) else result
+        for result in validate_batch(MetaboliteInput, [row for _, row in rows])
+    ]
+
+
+def check_chunk(
+    rows: List[tuple[int, dict]],
+    results: List[MetaboliteInput | str],
+    tracker: UniquenessTracker,
+    errors: Optional[list] = None,
+) -> List[MetaboliteInput]:
+    """
+    Applies the cross-row uniqueness checks to a validated chunk, in file
+    order.
+
+    Args:
+        rows (List[tuple[int, dict]]): Chunk from `iter_raw_chunks`.
+        results (List[MetaboliteInput | str]): `validate_chunk` of the rows.
+        tracker (UniquenessTracker): Uniqueness state shared by the chunks
+            of the file.
+        errors (list | None): If given, invalid rows are skipped and their
+            `(line, message)` appended to it instead of raising.
+
+    Raises:
+        ValueError: If a row has invalid.
+        ValueError: If a feature is linked to multiple IDs.
+
+    Returns:
+        List[MetaboliteInput]: The valid metabolite inputs.
+    """
+    data = []
+    for (i, _), input_data in zip(rows, results):
+        try:
+            if isinstance(input_data, str):
+                raise ValueError(input_data)
+            tracker.check(input_data, i)
+            data.append(input_data)
+        except Exception as e:
+            if errors is None:
+                raise ValueError(f"Error in line {i}: {e}")
+            errors.append((i, str(e)))
+    return data
+
+
+def validate_rows(
+    rows: List[tuple[int, dict]],
+    tracker: UniquenessTracker,
+    errors: Optional[list] = None,
+) -> List[MetaboliteInput]:
+    """
+    Validates a raw chunk and applies the cross-row uniqueness checks.
+
+    Args:
+        rows (List[tuple[int, dict]]): Chunk from `iter_raw_chunks`.
+        tracker (UniquenessTracker): Uniqueness state shared by the chunks
+            of the file.
+        errors (list | None): If given, invalid rows are skipped and their
+            `(line, message)` appended to it instead of raising.
+
+    Raises:
+        ValueError: If a row has invalid.
+        ValueError: If a feature is linked to multiple IDs.
+
+    Returns:
+        List[MetaboliteInput]: The valid metabolite inputs.
+    """
+    return check_chunk(rows, validate_chunk(rows), tracker, errors)
+
+
+def iter_csv_chunks(
+    file_path: Path,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: int = 1,
+    errors: Optional[list] = None,
+) -> Iterator[List[MetaboliteInput]]:
+    """
+    Streams a CSV file (or .xlsx workbook) of metabolite data, yielding
+    validated rows in chunks of at most `chunk_size` items.
+
+    Only the current chunk and the compact uniqueness digests are held in
+    memory, so the peak memory usage does not depend on the file size.
+    With `workers` > 1 the rows of a CSV file are validated in parallel
+    processes, see `iter_csv_chunks_parallel`. Workbooks are always read
+    sequentially.
+
+    Args:
+        file_path (Path): Path to the CSV or .xlsx file.
+        chunk_size (int): Maximum number of rows per yielded chunk.
+        workers (int): Number of validation processes.
+        errors (list | None): If given, invalid rows are skipped and their
+            `(line, message)` appended to it instead of raising.
+
+    Raises:
+        ValueError: If a row has invalid.
+        ValueError: If a feature is linked to multiple IDs.
+
+    Yields:
+        List[MetaboliteInput]: The next chunk of valid metabolite inputs.
+    """
+    if workers > 1 and not is_xlsx(file_path):
+        yield from iter_csv_chunks_parallel(
+            file_path, chunk_size, workers, errors=errors
+        )
+        return
+
+    tracker = UniquenessTracker()
+    for rows in iter_raw_chunks(file_path, chunk_size):
+        yield validate_rows(rows, tracker, errors)
+
+
+def iter_matrix_chunks(
+    file_path: Path, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[tuple[List[str], List[MetaboliteInput], np.ndarray]]:
+    """
+    Streams a wide CSV file (or .xlsx workbook) of metabolite data, with
+    one column per sample after the metabolite columns of `CSV_COLUMNS`.
+
+    The metabolite columns are validated as in `iter_csv_chunks`, the
+    sample columns are converted with `parse_sample_matrix`: "ND", "NA"
+    and empty cells become NaN.
+
+    Args:
+        file_path (Path): Path to the CSV or .xlsx file.
+        chunk_size (int): Maximum number of rows per yielded chunk.
+
+    Raises:
+        ValueError: If the file has no sample column.
+        ValueError: If a row has invalid.
+        ValueError: If a feature is linked to multiple IDs.
+        ValueError: If a sample value is not a number.
+
+    Yields:
+        tuple[List[str], List[MetaboliteInput], np.ndarray]: The sample
+            names, the metabolites of the chunk and their values, one row
+            per metabolite and one column per sample.
+    """
+    tracker = UniquenessTracker()
+    samples = None
+    for rows in iter_raw_chunks(file_path, chunk_size):
+        if samples is None:
+            metabolite_columns = set(CSV_COLUMNS.values())
+            samples = [name for name in rows[0][1] if name not in metabolite_columns]
+            if not samples:
+                raise ValueError(f"No sample column in {file_path}")
+
+        chunk = validate_rows(rows, tracker)
+        values, invalid = parse_sample_matrix(
+            [[row[name] for name in samples] for _, row in rows]
+        )
+        if invalid.any():
+            i, j = np.argwhere(invalid)[0]
+            line, row = rows[i]
+            raise ValueError(
+                f"Error in line {line}: invalid value {row[samples[j]]!r} "
+                f"for sample {samples[j]}"
+            )
+        yield samples, chunk, values
+
+
+def split_byte_ranges(
+    file_path: Path, chunk_bytes: int = DEFAULT_CHUNK_BYTES
+) -> tuple[List[str], List[tuple[int, int]]]:
+    """
+    Splits the data part of a CSV file into byte ranges of roughly
+    `chunk_bytes`, each one ending on a record boundary.
+
+    A range is extended line by line while it holds an odd number of
+    quotes, so it never ends inside a quoted field spanning several lines
+    (e.g. a wrapped InChI). Escaped quotes come in pairs and do not change
+    the parity.
+
+    Args:
+        file_path (Path): Path to the CSV file.
+        chunk_bytes (int): Target size of a range, in bytes.
+
+    Returns:
+        tuple[List[str], List[tuple[int, int]]]: The CSV header and the
+        `(start, end)` byte offsets of each range.
+    """
+    size = file_path.stat().st_size
+    ranges = []
+
+    with file_path.open("rb") as f:
+        header = next(csv.reader([f.readline().decode("utf-8")]))
+        start = f.tell()
+        while start < size:
+            quotes = f.read(chunk_bytes).count(b'"')
+            line = f.readline()
+            quotes += line.count(b'"')
+            while line and quotes % 2:
+                line = f.readline()
+                quotes += line.count(b'"')
+            end = f.tell()
+            ranges.append((start, end))
+            start = end
+
+    return header, ranges
+
+
+def _validate_byte_range(
+    file_path: str, fieldnames: List[str], start: int, end: int
+) -> tuple[int, list]:
+    """
+    Validates the rows of one byte range, in a worker process.
+
+    Args:
+        file_path (str): Path to the CSV file.
+        fieldnames (List[str]): CSV header.
+        start (int): Offset of the first byte of the range.
+        end (int): Offset just past the last byte of the range.
+
+    Returns:
+        tuple[int, list]: The number of lines in the range and, for each
+        row, a `(relative line, MetaboliteInput | None, error | None)` tuple.
+    """
+    with open(file_path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    reader = csv.DictReader(
+        io.StringIO(data.decode("utf-8"), newline=""), fieldnames=fieldnames
+    )
+    lines, rows = [], []
+    for row in reader:
+        lines.append(reader.line_num)
+        rows.append(row)
+
+    results = []
+    for line, input_data in zip(lines, validate_batch(MetaboliteInput, rows)):
+        if isinstance(input_data, Exception):
+            results.append((line, None, str(input_data)))
+        else:
+            results.append((line, input_data, None))
+    return data.count(b"\n"), results
+
+
+def iter_csv_chunks_parallel(
+    file_path: Path,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: int | None = None,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    errors: Optional[list] = None,
+) -> Iterator[List[MetaboliteInput]]:
+    """
+    Same contract as `iter_csv_chunks`, but the rows are validated in a
+    `ProcessPoolExecutor`.
+
+    The file is split into byte ranges aligned on record boundaries, each
+    range is validated by a worker, and the results are merged back in file
+    order: the cross-row uniqueness checks run in this process and errors
+    report the original line numbers. At most two ranges per worker are in
+    flight, so memory stays bounded.
+
+    Args:
+        file_path (Path): Path to the CSV file.
+        chunk_size (int): Maximum number of rows per yielded chunk.
+        workers (int | None): Number of processes, defaults to the CPU count.
+        chunk_bytes (int): Target size of a byte range sent to a worker.
+        errors (list | None): If given, invalid rows are skipped and their
+            `(line, message)` appended to it instead of raising.
+
+    Raises:
+        ValueError: If a row has invalid.
+        ValueError: If a feature is linked to multiple IDs.
+
+    Yields:
+        List[MetaboliteInput]: The next chunk of valid metabolite inputs.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer")
+
+    workers = workers or os.cpu_count() or 1
+    fieldnames, ranges = split_byte_ranges(file_path, chunk_bytes)
+    pending_ranges = iter(ranges)
+    tracker = UniquenessTracker()
+    first_line = 2
+    chunk = []
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    in_flight = deque()
+
+    def submit_next() -> None:
+        byte_range = next(pending_ranges, None)
+        if byte_range is not None:
+            in_flight.append(
+                executor.submit(
+                    _validate_byte_range, str(file_path), fieldnames, *byte_range
+                )
+            )
+
+    try:
+        for _ in range(2 * workers):
+            submit_next()
+
+        while in_flight:
+            line_count, results = in_flight.popleft().result()
+            submit_next()
+
+            for relative_line, input_data, error in results:
+                i = first_line + relative_line - 1
+                try:
+                    if error is not None:
+                        raise ValueError(error)
+                    tracker.check(input_data, i)
+                except Exception as e:
+                    if errors is None:
+                        raise ValueError(f"Error in line {i}: {e}")
+                    errors.append((i, str(e)))
+                    continue
+
+                chunk.append(input_data)
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+
+            first_line += line_count
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+    if chunk:
+        yield chunk
+
+
+def parse_csv(file_path: Path) -> List[MetaboliteInput]:
+    """
+    Parses and validates a CSV file of metabolite data into a list of
+    MetaboliteInput instances.
+
+    Prefer `iter_csv_chunks` for large files, this function keeps every
+    row in memory. To list every invalid row of a file rather than stop at
+    the first one, see `validate_file` in ETL/report.py.
+
+    Args:
+        file_path (Path): Path to the CSV file.
+
+    Raises:
+        ValueError: If a row has invalid.
+        ValueError: If a feature is linked to multiple IDs.
+
+    Returns:
+        List[MetaboliteInput]: A list of valid metabolite inputs.
+    """
+    return [row for chunk in iter_csv_chunks(file_path) for row in chunk]
+
+
+if __name__ == "__main__":
+    csv_path = Path("data/MetabolitesData_inputDataForTEst.csv")
+
+    try:
+        datas = parse_csv(csv_path)
+        print(f"Parsed {len(datas)} rows successfully.")
+        for data in datas[:5]:
+            print(data.model_dump())
+    except Exception as e:
+        print(f"Error while parsing: {e}")
@@ -0,0 +1,84 @@
+from itertools import product
+from typing import Iterable, Sequence
+import numpy as np
+from msio.backend.database.validation import MISSING_SAMPLE_DATA
+
+# Storage type of the sample vectors: little-endian float64, NaN for a
+# missing value, whatever the byte order of the host.
+SAMPLE_DTYPE = np.dtype("<f8")
+
+# Every spelling of the missing value markers ("ND", "nd", "Nd"...): a
+# membership test against them is much cheaper than upper-casing the cells.
+_MISSING_MARKERS = np.array(
+    sorted(
+        "".join(spelling)
+        for marker in MISSING_SAMPLE_DATA
+        for spelling in product(*({c.lower(), c.upper()} for c in marker))
+    ),
+    dtype=np.str_,
+)
+
+
+def parse_sample_matrix(
+    cells: Sequence[Sequence[str]]
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Convert the raw sample cells of a wide file into a float matrix.
+
+    The missing value markers of `MISSING_SAMPLE_DATA` ("ND", "NA", empty)
+    become NaN and the other cells are parsed by NumPy, one array operation
+    for the whole chunk. Cells are only parsed one by one when the chunk
+    holds invalid values, to locate them.
+
+    Args:
+        cells (Sequence[Sequence[str]]): Rows of sample cells, all the same
+            length.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The `SAMPLE_DTYPE` matrix, one row
+            per input row, and the boolean mask of the invalid cells (NaN
+            in the matrix).
+    """
+    text = np.char.strip(np.asarray(cells, dtype=np.str_))
+    text[np.isin(text, _MISSING_MARKERS)] = "nan"
+    invalid = np.zeros(text.shape, dtype=bool)
+    try:
+        return text.astype(SAMPLE_DTYPE), invalid
+    except ValueError:
+        pass
+
+    values = np.full(text.shape, np.nan, dtype=SAMPLE_DTYPE)
+    for index, cell in np.ndenumerate(text):
+        try:
+            values[index] = float(cell)
+        except ValueError:
+            invalid[index] = True
+    return values, invalid
+
+
+def encode_vector(values: np.ndarray) -> bytes:
+    """
+    Serialize a vector of sample values for the `sample_values` column.
+
+    Args:
+        values (np.ndarray): Sample values.
+
+    Returns:
+        bytes: The values as `SAMPLE_DTYPE`.
+    """
+    return np.asarray(values, dtype=SAMPLE_DTYPE).tobytes()
+
+
+def decode_vectors(blobs: Iterable[bytes], width: int = 1) -> np.ndarray:
+    """
+    Read stored sample vectors (or slices of them) back into one matrix,
+    without creating a Python float per value.
+
+    Args:
+        blobs (Iterable[bytes]): `SAMPLE_DTYPE` buffers of `width` values.
+        width (int): Number of values per buffer.
+
+    Returns:
+        np.ndarray: A matrix of one row per buffer.
+    """
+    return np.frombuffer(b"".join(blobs), dtype=SAMPLE_DTYPE).reshape(-1, width)
@@ -0,0 +1,135 @@
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Length at which statements are cut in the collected statistics.
+STATEMENT_PREVIEW_LENGTH = 200
+
+
+class QueryStats:
+    """
+    Statistics of the SQL statements executed during one unit of work,
+    usually one HTTP request.
+
+    Attributes:
+        count (int): Number of statements executed.
+        total_time (float): Cumulated execution time, in seconds.
+        slowest_time (float): Execution time of the slowest statement.
+        slowest_statement (str | None): Beginning of the slowest statement.
+        statements (Counter): Executions of each distinct statement, a
+            statement repeated many times usually reveals an N+1 pattern.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.statements: Counter[str] = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        """
+        Record an executed statement.
+
+        Args:
+            statement (str): SQL text of the statement.
+            duration (float): Execution time, in seconds.
+        """
+        self.count += 1
+        self.total_time += duration
+        self.statements[statement] += 1
+        if duration >= self.slowest_time:
+            self.slowest_time = duration
+            self.slowest_statement = statement[:STATEMENT_PREVIEW_LENGTH]
+
+    def most_repeated(self) -> tuple[Optional[str], int]:
+        """
+        Return the statement executed the most times.
+
+        Returns:
+            tuple[str | None, int]: Beginning of the statement and its number
+                of executions, (None, 0) if nothing was executed.
+        """
+        if not self.statements:
+            return None, 0
+        statement, repeats = self.statements.most_common(1)[0]
+        return statement[:STATEMENT_PREVIEW_LENGTH], repeats
+
+    def summary(self) -> dict[str, Any]:
+        """
+        Return the statistics as flat log fields.
+
+        Returns:
+            dict[str, Any]: Query count, total and slowest times in
+                milliseconds, and the slowest statement.
+        """
+        return {
+            "db_queries": self.count,
+            "db_time_ms": round(self.total_time * 1000, 3),
+            "db_slowest_ms": round(self.slowest_time * 1000, 3),
+            "db_slowest_statement": self.slowest_statement,
+        }
+
+
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar(
+    "current_query_stats", default=None
+)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """
+    Collect the statements executed in the current context.
+
+    The async engine runs the driver calls in greenlets that share the
+    context of the calling task, so every statement awaited inside the
+    block is recorded.
+
+    Yields:
+        QueryStats: Statistics filled while the block runs.
+    """
+    stats = QueryStats()
+    token = current_query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        current_query_stats.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_times", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_start_times"].pop()
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.record(statement, time.perf_counter() - started)
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute.
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start_times"):
+        conn.info["query_start_times"].pop()
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """
+    Register the engine events feeding `current_query_stats`.
+
+    Statements executed outside of `track_queries` only cost the two
+    timestamps.
+
+    Args:
+        engine (AsyncEngine): Engine to instrument.
+    """
+    sync_engine = engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
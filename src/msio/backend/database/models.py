@@ -4,6 +4,8 @@ from sqlalchemy import (
     ForeignKey,
     Index,
     Integer,
+    JSON,
+    LargeBinary,
     String,
     Boolean,
     UniqueConstraint,
@@ -26,13 +28,18 @@ class User(Base):
 class Metabolite(Base):
     __tablename__ = "metabolites"
 
-    id = Column(Integer, primary_key=True, index=True)
+    # One index per unique column: the primary key, the unique constraints
+    # and the unique index of feature already serve the lookups on them.
+    id = Column(Integer, primary_key=True)
 
     feature = Column(String, nullable=False, unique=True, index=True)
     identification_level = Column(Integer, nullable=False, default=3)
 
-    id_inchi = Column(String, unique=True, nullable=True)
-    cas_number = Column(String, unique=True, nullable=True)
+    id_inchi = Column(String, nullable=True)
+    # Fixed-width digest of id_inchi (msio.backend.core.identifiers), which
+    # carries the InChI uniqueness and the structure lookups.
+    inchi_hash = Column(String(32), nullable=True)
+    cas_number = Column(String, nullable=True)
 
     method = Column(String, nullable=False)
     sample_data = Column(Float, nullable=True)  # could be float or 'ND'/'NA'
@@ -41,8 +48,51 @@ class Metabolite(Base):
     uploader_user_id = relationship("User", back_populates="metabolites")
 
     __table_args__ = (
-        UniqueConstraint("id_inchi", name="uniq_id_inchi"),
+        UniqueConstraint("inchi_hash", name="uniq_inchi_hash"),
         UniqueConstraint("cas_number", name="uniq_cas_number"),
-        Index("idx_id_inchi", "id_inchi"),
-        Index("idx_cas_number", "cas_number"),
+        Index("idx_method_id", "method", "id"),
+        Index("idx_identification_level_id", "identification_level", "id"),
+        Index("idx_uploader_id_id", "uploader_id", "id"),
+        Index("idx_sample_data", "sample_data"),
+        # The pg_trgm index of the feature search (idx_feature_trgm) is only
+        # created by its migration, it needs the extension.
+    )
+
+
+class SampleMatrix(Base):
+    """
+    A wide feature x sample matrix, loaded from one file. The values of
+    each feature are stored as a single vector in `sample_vectors`.
+    """
+
+    __tablename__ = "sample_matrices"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False, unique=True)
+    # Sample (column) names, in the order of the values of the vectors.
+    samples = Column(JSON, nullable=False)
+
+
+class SampleVector(Base):
+    """
+    Values of one feature across the samples of a matrix.
+    """
+
+    __tablename__ = "sample_vectors"
+
+    # The primary key orders the vectors of a matrix by metabolite, which is
+    # the order the sample columns are read in.
+    matrix_id = Column(
+        Integer,
+        ForeignKey("sample_matrices.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    metabolite_id = Column(
+        Integer,
+        ForeignKey("metabolites.id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
     )
+    # msio.backend.core.samples.SAMPLE_DTYPE values, one per sample of the
+    # matrix, NaN for a missing value.
+    sample_values = Column(LargeBinary, nullable=False)
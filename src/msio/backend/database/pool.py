@@ -0,0 +1,58 @@
+import time
+from typing import Any
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """
+    Async queue pool recording how long connection checkouts take.
+
+    The checkout time includes waiting for a free connection, opening a new
+    one and the pre-ping, which is what a request waits before its first
+    query. Checkouts that time out because the pool is exhausted are
+    counted separately.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            wait = time.perf_counter() - started
+            self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def statistics(self) -> dict[str, Any]:
+        """
+        Return the live state of the pool and the checkout counters.
+
+        Returns:
+            dict[str, Any]: Pool size, checked out and overflow connections,
+            checkout count, timeouts and wait times in milliseconds.
+        """
+        return {
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": max(self.overflow(), 0),
+            "max_overflow": self._max_overflow,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "avg_wait_ms": (
+                self.total_wait / self.checkouts * 1000 if self.checkouts else 0.0
+            ),
+            "max_wait_ms": self.max_wait * 1000,
+        }
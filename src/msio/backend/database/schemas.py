@@ -1,5 +1,11 @@
-from typing import Optional
-from pydantic import BaseModel, EmailStr, field_validator, model_validator
+from datetime import datetime
+from typing import Annotated, Literal, Optional
+from pydantic import BaseModel, ConfigDict, EmailStr, model_validator
+from msio.backend.database.validation import (
+    LevelRange,
+    MetaboliteFields,
+    MetaboliteValues,
+)
 
 
 class UserBase(BaseModel):
@@ -39,6 +45,20 @@ class UserRead(UserBase):
         orm_mode = True
 
 
+class AuthenticatedUser(BaseModel):
+    """
+    Immutable snapshot of the authenticated user, cached by
+    `get_current_user` and shared by the concurrent requests, instead of a
+    detached ORM instance.
+    """
+
+    model_config = ConfigDict(frozen=True, from_attributes=True)
+
+    id: int
+    username: str
+    is_active: Optional[bool]
+
+
 class UserInDB(UserRead):
     """
     Internal schema with hashed password (if needed internally).
@@ -60,80 +80,41 @@ class MetaboliteBase(BaseModel):
     sample_data: Optional[float] = None
 
 
-class MetaboliteCreate(MetaboliteBase):
+class MetaboliteCreate(MetaboliteFields):
     """
-    Schema for creating a new metabolite.
-
-    - Ensures sample_data is a float or None
-    - Ensures at least one identifier (InChI or CAS) is present
-    - Cleans empty strings as None
+    Schema for creating a new metabolite, validated by the rules shared
+    with the ETL (see `MetaboliteFields`).
     """
 
-    @field_validator("sample_data", mode="before")
-    @classmethod
-    def parse_sample_data(cls, v):
-        """
-        Converts raw input into a float or None.
-
-        Args:
-            v (Any): Raw value from input.
-
-        Raises:
-            ValueError: If input error string.
 
-        Returns:
-            float | None: Parsed value or None for "ND", "NA", or empty.
-        """
-        if isinstance(v, str):
-            if v.strip().upper() in {"ND", "NA", ""}:
-                return None
-            try:
-                return float(v)
-            except ValueError:
-                raise ValueError(f"Invalid float value for sample_data: {v}")
-        return v
-
-    @field_validator("id_inchi", "cas_number", mode="before")
-    @classmethod
-    def empty_str_to_none(cls, v):
-        """
-        Converts empty string values into None.
-
-        Args:
-            v (str | None): Raw input value.
-
-        Returns:
-            str | None: None if empty, otherwise the input value.
-        """
-        return v if v and v.strip() else None
+class MetabolitePatch(MetaboliteValues):
+    """
+    Schema for a partial update of a metabolite.
 
-    @field_validator("identification_level", mode="before")
-    @classmethod
-    def default_identification_level(cls, v):
-        """
-        Ensures identification_level is cast to int and defaults to 3.
+    Every field is optional, only the fields present in the payload are
+    applied. The InChI / CAS requirement is checked on the updated row, so
+    this schema builds on `MetaboliteValues` rather than `MetaboliteCreate`.
+    """
 
-        Args:
-            v (Any): Raw value.
-
-        Returns:
-            int: Validated identification level.
-        """
-        return int(v) if v else 3
+    feature: Optional[str] = None
+    # No default-to-3 here: an absent level is left unchanged.
+    identification_level: Optional[Annotated[int, LevelRange]] = None
+    method: Optional[str] = None
 
     @model_validator(mode="after")
-    def check_id_or_cas(self):
+    def check_not_null(self):
         """
-        Validates presence of at least one identifier.
+        Rejects explicit nulls on the non nullable fields.
 
         Raises:
-            ValueError: If both id_inchi and cas_number are missing.
+            ValueError: If feature, identification_level or method is null.
 
         Returns:
-            MetaboliteCreate: The validated object.
+            MetabolitePatch: The validated object.
         """
-        if not self.id_inchi and not self.cas_number:
-            raise ValueError("Either ID_InChI or CAS_number must be provided.")
+        for name in ("feature", "identification_level", "method"):
+            if name in self.model_fields_set and getattr(self, name) is None:
+                raise ValueError(f"{name} cannot be null.")
         return self
 
 
@@ -143,11 +124,173 @@ class MetaboliteRead(MetaboliteBase):
 
     Includes all base fields plus:
     - id: Unique DB identifier.
+    - inchi_hash: Digest of the InChI, used by the structure lookup.
     - uploader_id: ID of the user who uploaded the record.
     """
 
     id: int
+    inchi_hash: Optional[str] = None
     uploader_id: Optional[int] = None
 
     class Config:
         orm_mode = True
+
+
+class MetabolitePage(BaseModel):
+    """
+    One page of metabolites from the listing endpoint.
+
+    Includes:
+    - items: The metabolites of the page.
+    - next_cursor: Cursor of the next page, None on the last page.
+    """
+
+    items: list[MetaboliteRead]
+    next_cursor: Optional[str] = None
+
+
+class MetaboliteSearchHit(MetaboliteRead):
+    """
+    A metabolite found by the fuzzy search, with its relevance.
+
+    Includes all read fields plus:
+    - score: Word similarity with the query, 1 for an exact match.
+    """
+
+    score: float
+
+
+class MetaboliteSearchPage(BaseModel):
+    """
+    One page of fuzzy search results, best first.
+
+    Includes:
+    - items: The results of the page.
+    - next_offset: Offset of the next page, None on the last page.
+    """
+
+    items: list[MetaboliteSearchHit]
+    next_offset: Optional[int] = None
+
+
+class MetaboliteBulkUpdate(MetaboliteCreate):
+    """
+    Schema for one item of a bulk update: the new metabolite data and the
+    ID of the metabolite to overwrite.
+    """
+
+    id: int
+
+
+class MetaboliteBulkDelete(BaseModel):
+    """
+    Schema for a bulk deletion request.
+
+    Includes:
+    - ids: IDs of the metabolites to delete.
+    """
+
+    ids: list[int]
+
+
+class MetaboliteBulkResult(BaseModel):
+    """
+    Outcome of one item of a bulk request.
+
+    Includes:
+    - index: Position of the item in the request.
+    - id: ID of the affected metabolite, if any.
+    - status: What happened to the item.
+    - detail: Reason of the failure, if any.
+    """
+
+    index: int
+    id: Optional[int] = None
+    status: Literal["created", "updated", "deleted", "conflict", "not_found"]
+    detail: Optional[str] = None
+
+
+class IngestJobRead(BaseModel):
+    """
+    Progress of a file ingestion job.
+
+    Includes:
+    - id: Job ID.
+    - filename: Name of the uploaded file.
+    - status: queued, running, succeeded or failed.
+    - rows_parsed: Rows read from the file so far.
+    - rows_inserted: Rows written to the database so far.
+    - rows_rejected: Invalid or conflicting rows, skipped.
+    - rows_per_second: Insertion throughput since the job started.
+    - errors: The first rejected rows, as "line N: reason".
+    - detail: Reason of the failure of the job, if any.
+    """
+
+    id: str
+    filename: str
+    status: Literal["queued", "running", "succeeded", "failed"]
+    rows_parsed: int
+    rows_inserted: int
+    rows_rejected: int
+    rows_per_second: float
+    errors: list[str]
+    detail: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class SampleMatrixRead(BaseModel):
+    """
+    A feature x sample matrix.
+
+    Includes:
+    - id: Matrix ID.
+    - name: Matrix name.
+    - samples: Sample names, in the order of the vector values.
+    """
+
+    id: int
+    name: str
+    samples: list[str]
+
+
+class SampleVectorRead(BaseModel):
+    """
+    Values of a metabolite across the samples of one matrix.
+
+    Includes:
+    - matrix_id: Matrix ID.
+    - samples: Sample names.
+    - values: One value per sample, null when missing.
+    """
+
+    matrix_id: int
+    samples: list[str]
+    values: list[Optional[float]]
+
+
+class MetaboliteSamples(BaseModel):
+    """
+    Sample vectors of a metabolite, one per matrix holding it.
+    """
+
+    metabolite_id: int
+    vectors: list[SampleVectorRead]
+
+
+class SampleColumnRead(BaseModel):
+    """
+    Values of one sample of a matrix across its metabolites.
+
+    Includes:
+    - matrix_id: Matrix ID.
+    - sample: Sample name.
+    - metabolite_ids: Metabolites of the matrix, by ID.
+    - values: Value of each metabolite, null when missing.
+    """
+
+    matrix_id: int
+    sample: str
+    metabolite_ids: list[int]
+    values: list[Optional[float]]
@@ -1,10 +1,14 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 from src.msio.backend.core.config import config
+from msio.backend.database.instrumentation import instrument_engine
 
 DATABASE_URL = config.SQLALCHEMY_DATABASE_URI
 
-engine = create_async_engine(DATABASE_URL, echo=False)
+engine = config.create_async_engine()
+instrument_engine(engine)
 
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
@@ -18,4 +22,17 @@ async def get_db() -> AsyncSession:
         yield session
 
 
+def pool_statistics() -> dict[str, Any]:
+    """
+    Return the live statistics of the application connection pool.
+
+    Returns:
+        dict[str, Any]: Pool statistics, see `InstrumentedAsyncPool`.
+    """
+    pool = engine.pool
+    if hasattr(pool, "statistics"):
+        return pool.statistics()
+    return {"status": pool.status()}
+
+
 Base = declarative_base()
@@ -0,0 +1,178 @@
+from functools import lru_cache
+from typing import Annotated, Optional, TypeVar, Union
+
+from pydantic import (
+    BaseModel,
+    BeforeValidator,
+    Field,
+    TypeAdapter,
+    ValidationError,
+    computed_field,
+    model_validator,
+)
+from msio.backend.core.identifiers import inchi_hash
+
+# Sample data markers meaning "no value", compared upper-cased.
+MISSING_SAMPLE_DATA = {"ND", "NA", ""}
+# Accepted identification levels, also the bounds of the listing filter.
+MIN_IDENTIFICATION_LEVEL = 1
+MAX_IDENTIFICATION_LEVEL = 5
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def parse_sample_data(v):
+    """
+    Converts the missing value markers into None. Other values are left to
+    the float validation of pydantic-core.
+
+    Args:
+        v (Any): Raw value from input.
+
+    Returns:
+        Any: None for "ND", "NA" or empty, otherwise the input value.
+    """
+    if isinstance(v, str) and v.strip().upper() in MISSING_SAMPLE_DATA:
+        return None
+    return v
+
+
+def empty_str_to_none(v):
+    """
+    Converts empty string values into None.
+
+    Args:
+        v (str | None): Raw input value.
+
+    Returns:
+        str | None: None if empty, otherwise the input value.
+    """
+    return v if v and v.strip() else None
+
+
+def default_identification_level(v):
+    """
+    Defaults a missing identification level to 3. Other values, 0
+    included, are left to the int and range validation of pydantic-core.
+
+    Args:
+        v (Any): Raw value.
+
+    Returns:
+        Any: 3 if None or a blank string, otherwise the input value.
+    """
+    if v is None or (isinstance(v, str) and not v.strip()):
+        return 3
+    return v
+
+
+SampleData = Annotated[Optional[float], BeforeValidator(parse_sample_data)]
+Identifier = Annotated[Optional[str], BeforeValidator(empty_str_to_none)]
+LevelRange = Field(ge=MIN_IDENTIFICATION_LEVEL, le=MAX_IDENTIFICATION_LEVEL)
+IdentificationLevel = Annotated[
+    int, LevelRange, BeforeValidator(default_identification_level)
+]
+
+
+class MetaboliteValues(BaseModel):
+    """
+    Types and derived values of the metabolite fields, without the
+    row-level identifier check (see `MetaboliteFields`).
+
+    - Ensures sample_data is a float or None
+    - Cleans empty strings as None
+    - Derives inchi_hash from id_inchi
+    """
+
+    feature: str
+    identification_level: IdentificationLevel = 3
+    id_inchi: Identifier = None
+    cas_number: Identifier = None
+    method: str
+    sample_data: SampleData = None
+
+    @computed_field
+    @property
+    def inchi_hash(self) -> Optional[str]:
+        """
+        Fixed-width digest of `id_inchi`, stored alongside it.
+
+        Returns:
+            str | None: The digest, None without InChI.
+        """
+        return inchi_hash(self.id_inchi)
+
+
+class MetaboliteFields(MetaboliteValues):
+    """
+    Validation of the metabolite fields, shared by the API payloads
+    (`MetaboliteCreate`) and the ETL rows (`MetaboliteInput`).
+
+    - Ensures at least one identifier (InChI or CAS) is present
+    - Applies the field rules of `MetaboliteValues`
+
+    The int/float coercions are left to pydantic-core. The sentinel
+    mapping (the small functions above) and the identifier check stay in
+    Python, called once per field or row: `validate_batch` saves the
+    per-row model calls, not these.
+    """
+
+    @model_validator(mode="after")
+    def check_id_or_cas(self):
+        """
+        Validates presence of at least one identifier.
+
+        Raises:
+            ValueError: If both id_inchi and cas_number are missing.
+
+        Returns:
+            MetaboliteFields: The validated object.
+        """
+        if not self.id_inchi and not self.cas_number:
+            raise ValueError("Either ID_InChI or CAS_number must be provided.")
+        return self
+
+
+@lru_cache
+def batch_adapter(model: type[ModelT]) -> TypeAdapter[list[ModelT]]:
+    return TypeAdapter(list[model])
+
+
+def validate_batch(
+    model: type[ModelT], rows: list[dict]
+) -> list[Union[ModelT, ValidationError]]:
+    """
+    Validate many rows with a single call into pydantic-core.
+
+    When some rows are invalid, the valid ones are validated again as one
+    batch and the invalid ones one by one, to get the error of each row.
+
+    Args:
+        model (type[BaseModel]): Model of a row.
+        rows (list[dict]): Raw rows.
+
+    Returns:
+        list[BaseModel | ValidationError]: For each row, in order, the
+            validated model or the validation error.
+    """
+    adapter = batch_adapter(model)
+    try:
+        return adapter.validate_python(rows)
+    except ValidationError as e:
+        invalid = {error["loc"][0] for error in e.errors()}
+
+    valid = iter(
+        adapter.validate_python(
+            [row for index, row in enumerate(rows) if index not in invalid]
+        )
+    )
+    results = []
+    for index, row in enumerate(rows):
+        if index not in invalid:
+            results.append(next(valid))
+            continue
+        try:
+            results.append(model.model_validate(row))
+        except ValidationError as e:
+            results.append(e)
+    return results
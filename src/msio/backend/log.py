@@ -2,6 +2,7 @@ import logging
 import logging.config
 
 from structlog import configure
+from structlog.contextvars import merge_contextvars
 from structlog.processors import JSONRenderer, TimeStamper, add_log_level
 from structlog.stdlib import LoggerFactory, ProcessorFormatter
 
@@ -12,6 +13,7 @@ LOG_FORMAT = "json"
 def configure_logging() -> None:
     configure(
         processors=[
+            merge_contextvars,
             add_log_level,
             TimeStamper(fmt="iso"),
             ProcessorFormatter.wrap_for_formatter,
@@ -26,6 +28,8 @@ def configure_logging() -> None:
             "json": {
                 "()": ProcessorFormatter,
                 "processor": JSONRenderer(),
+                # Request context (e.g. SQL statistics) on the uvicorn logs too.
+                "foreign_pre_chain": [merge_contextvars],
             },
         },
         "handlers": {
@@ -1,7 +1,9 @@
 import uvicorn
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from src.msio.backend.core.config import config
 from fastapi.middleware.cors import CORSMiddleware
+from msio.backend.core.metrics import MetricsMiddleware, QueryStatsMiddleware
 from msio.backend.log import configure_logging
 from msio.backend.api.health.api import api_router_health
 from msio.backend.api.v1.metabolites.api import api_router_metabolites
@@ -15,6 +17,7 @@ app = FastAPI(
     title="test_misio",
     description="Technical test misio",
     version=VERSION,
+    default_response_class=ORJSONResponse,
     contact={
         "name": "Hans",
         "email": "anselmeceril@gmail.com",
@@ -24,6 +27,8 @@ app = FastAPI(
     redoc_url=f"{VERSION_PREFIX}/redoc",
 )
 
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(MetricsMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[config.CORS_ORIGIN],
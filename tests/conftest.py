@@ -0,0 +1,104 @@
+"""
+Shared fixtures: the application served in process on an in-memory SQLite
+database, and the PostgreSQL database of TEST_POSTGRES_URL if it is set.
+"""
+import os
+
+# Settings without default values. The tests never reach PostgreSQL, the
+# database dependency is overridden below.
+for name, value in {
+    "POSTGRES_HOST": "localhost",
+    "POSTGRES_USER": "test",
+    "POSTGRES_PASSWORD": "test",
+    "POSTGRES_DB": "test",
+    "SECRET_KEY": "test",
+    "ALGORITHM": "HS256",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "5",
+}.items():
+    os.environ.setdefault(name, value)
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool, StaticPool
+from msio.backend.core.auth import get_current_user
+from msio.backend.database.models import Base, User
+from msio.backend.database.session import get_db
+from msio.backend.main import app
+
+# Scratch PostgreSQL database, wiped by the tests using it, e.g.
+# postgresql+asyncpg://postgres@localhost/msio_test.
+POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
+
+
+async def empty_postgres_engine():
+    """
+    Engine of the TEST_POSTGRES_URL database, with an empty public schema.
+    Skips the test if the variable is not set.
+    """
+    if POSTGRES_URL is None:
+        pytest.skip("TEST_POSTGRES_URL is not set")
+    engine = create_async_engine(POSTGRES_URL, poolclass=NullPool)
+    async with engine.begin() as connection:
+        await connection.execute(text("DROP SCHEMA public CASCADE"))
+        await connection.execute(text("CREATE SCHEMA public"))
+    return engine
+
+
+@pytest.fixture
+async def engine(request):
+    """
+    Engine of the database with the tables of the models: in-memory SQLite,
+    or PostgreSQL when a test parametrizes it indirectly with "postgresql".
+    """
+    if getattr(request, "param", "sqlite") == "postgresql":
+        engine = await empty_postgres_engine()
+    else:
+        engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def postgres_engine():
+    """
+    The TEST_POSTGRES_URL database without any table, for the migrations.
+    """
+    engine = await empty_postgres_engine()
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    return async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+@pytest.fixture
+async def client(session_factory):
+    async def get_test_db():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = get_test_db
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+async def current_user(session_factory):
+    """
+    A user authenticated on every request, without a token.
+    """
+    async with session_factory() as session:
+        user = User(username="bob", email="bob@example.com", hashed_password="-")
+        session.add(user)
+        await session.commit()
+    app.dependency_overrides[get_current_user] = lambda: user
+    yield user
+    app.dependency_overrides.pop(get_current_user, None)
@@ -0,0 +1,55 @@
+"""
+Cache of the authenticated users in get_current_user.
+"""
+import pytest
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import select
+from msio.backend.core.auth import create_access_token, get_current_user, user_cache
+from msio.backend.core.config import Config
+from msio.backend.database.models import User
+from msio.backend.database.schemas import AuthenticatedUser
+
+
+@pytest.fixture
+async def token(session_factory):
+    async with session_factory() as session:
+        session.add(
+            User(username="alice", email="alice@example.com", hashed_password="-")
+        )
+        await session.commit()
+    user_cache.invalidate("alice")
+    yield create_access_token({"sub": "alice"})
+    user_cache.invalidate("alice")
+
+
+async def test_cached_user_is_an_immutable_snapshot(session_factory, token):
+    async with session_factory() as session:
+        user = await get_current_user(token, session)
+
+    assert isinstance(user, AuthenticatedUser)
+    assert (user.username, user.is_active) == ("alice", True)
+    with pytest.raises(ValidationError):
+        user.is_active = False
+    # Served from the cache: no session is needed.
+    assert await get_current_user(token, None) is user
+
+
+async def test_deactivation_in_this_process_drops_the_cached_user(
+    session_factory, token
+):
+    async with session_factory() as session:
+        await get_current_user(token, session)
+
+        user = await session.scalar(select(User).where(User.username == "alice"))
+        user.is_active = False
+        await session.commit()
+
+        with pytest.raises(HTTPException) as exc_info:
+            await get_current_user(token, session)
+    assert exc_info.value.status_code == 401
+
+
+def test_cache_ttl_is_bounded():
+    with pytest.raises(ValidationError):
+        Config(AUTH_CACHE_TTL_SECONDS=3600)
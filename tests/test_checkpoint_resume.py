@@ -0,0 +1,100 @@
+"""
+Checkpointed upsert loader of the ETL: an interrupted load resumes after the
+last committed chunk, and unchanged chunks are not sent again.
+"""
+import csv
+
+import insert_db
+import pytest
+from checkpoint import IngestState
+from sqlalchemy import select
+from msio.backend.core.parser import CSV_COLUMNS
+from msio.backend.database.models import Metabolite
+
+BATCH_SIZE = 3
+
+pytestmark = pytest.mark.parametrize("engine", ["sqlite", "postgresql"], indirect=True)
+
+
+@pytest.fixture(autouse=True)
+def loader_engine(engine, monkeypatch):
+    monkeypatch.setattr(insert_db, "engine", engine)
+
+
+def metabolite_rows(count: int = 10) -> list[list[str]]:
+    return [
+        [f"feature-{i}", "1", f"InChI=1S/C{i}", "", "LC-MS", str(i)]
+        for i in range(count)
+    ]
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_COLUMNS.values())
+        writer.writerows(rows)
+    return path
+
+
+async def sample_data(engine) -> dict:
+    async with engine.connect() as connection:
+        result = await connection.execute(
+            select(Metabolite.feature, Metabolite.sample_data)
+        )
+        return dict(result.all())
+
+
+async def test_interrupted_load_resumes_after_last_committed_chunk(
+    engine, tmp_path, capsys
+):
+    rows = metabolite_rows()
+    rows[7][5] = "not a number"
+    path = write_csv(tmp_path / "metabolites.csv", rows)
+
+    with pytest.raises(ValueError, match="Error in line 9"):
+        await insert_db.upsert_data(path, BATCH_SIZE, tmp_path)
+    # The first two chunks were committed before the invalid one.
+    assert len(await sample_data(engine)) == 2 * BATCH_SIZE
+    state = IngestState.load(path, tmp_path)
+    assert (state.fingerprint, sorted(state.chunks)) == (None, ["0", "1"])
+
+    rows[7][5] = "7"
+    write_csv(path, rows)
+    capsys.readouterr()
+    await insert_db.upsert_data(path, BATCH_SIZE, tmp_path)
+
+    assert "Skipped 6 unchanged rows." in capsys.readouterr().out
+    assert await sample_data(engine) == {f"feature-{i}": i for i in range(10)}
+    state = IngestState.load(path, tmp_path)
+    assert state.fingerprint is not None
+    assert sorted(state.chunks) == ["0", "1", "2", "3"]
+
+
+async def test_reload_only_sends_changed_chunks(engine, tmp_path, capsys):
+    rows = metabolite_rows()
+    path = write_csv(tmp_path / "metabolites.csv", rows)
+    await insert_db.upsert_data(path, BATCH_SIZE, tmp_path)
+
+    capsys.readouterr()
+    await insert_db.upsert_data(path, BATCH_SIZE, tmp_path)
+    assert "is unchanged since the last load" in capsys.readouterr().out
+
+    rows[4][5] = "40"
+    write_csv(path, rows)
+    await insert_db.upsert_data(path, BATCH_SIZE, tmp_path)
+    out = capsys.readouterr().out
+    assert "Skipped 7 unchanged rows." in out
+    assert "Inserted 3 metabolites" in out
+    assert (await sample_data(engine))["feature-4"] == 40
+
+
+async def test_other_batch_size_reloads_every_chunk(engine, tmp_path, capsys):
+    path = write_csv(tmp_path / "metabolites.csv", metabolite_rows())
+    await insert_db.upsert_data(path, BATCH_SIZE, tmp_path)
+    path.write_text(path.read_text() + "feature-10,1,InChI=1S/C10,,LC-MS,10\n")
+
+    capsys.readouterr()
+    await insert_db.upsert_data(path, BATCH_SIZE + 1, tmp_path)
+
+    assert "Skipped 0 unchanged rows." in capsys.readouterr().out
+    assert len(await sample_data(engine)) == 11
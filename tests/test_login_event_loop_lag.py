@@ -0,0 +1,56 @@
+"""
+Concurrent logins must leave the event loop responsive: bcrypt runs in the
+password thread pool (see benchmarks/login_event_loop_lag.py).
+"""
+import asyncio
+import time
+
+from msio.backend.core.auth import get_password_hash, verify_password
+from msio.backend.database.models import User
+
+LOGINS = 20
+PROBE_INTERVAL = 0.005
+
+
+async def probe(lags: list, stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append(time.perf_counter() - started - PROBE_INTERVAL)
+
+
+async def test_concurrent_logins_keep_event_loop_lag_low(client, session_factory):
+    hashed_password = get_password_hash("secret")
+    async with session_factory() as session:
+        session.add(
+            User(
+                username="alice",
+                email="alice@example.com",
+                hashed_password=hashed_password,
+            )
+        )
+        await session.commit()
+
+    started = time.perf_counter()
+    verify_password("secret", hashed_password)
+    bcrypt_seconds = time.perf_counter() - started
+
+    lags = []
+    stop = asyncio.Event()
+    probe_task = asyncio.create_task(probe(lags, stop))
+    responses = await asyncio.gather(
+        *(
+            client.post(
+                "/users/auth/token",
+                data={"username": "alice", "password": "secret"},
+            )
+            for _ in range(LOGINS)
+        )
+    )
+    stop.set()
+    await probe_task
+
+    assert [response.status_code for response in responses] == [200] * LOGINS
+    # A password check on the event loop would delay the probe by a whole
+    # bcrypt call at least.
+    assert max(lags) < bcrypt_seconds / 2
@@ -0,0 +1,156 @@
+"""
+Bulk create, update and delete of metabolites: one result per item, and a
+single query to find the conflicting items.
+"""
+import pytest
+from sqlalchemy import event, select
+from msio.backend.api.v1.metabolites.endpoints.bulk import find_conflicts
+from msio.backend.core.identifiers import inchi_hash
+from msio.backend.database.models import Metabolite
+from msio.backend.database.schemas import MetaboliteCreate
+
+pytestmark = pytest.mark.parametrize("engine", ["sqlite", "postgresql"], indirect=True)
+
+
+@pytest.fixture
+async def tyrosine_id(session_factory, current_user):
+    async with session_factory() as session:
+        metabolite = Metabolite(
+            feature="L-Tyrosine",
+            identification_level=1,
+            id_inchi="InChI=1S/tyrosine",
+            inchi_hash=inchi_hash("InChI=1S/tyrosine"),
+            cas_number="60-18-4",
+            method="LC-MS",
+        )
+        session.add(metabolite)
+        await session.commit()
+        return metabolite.id
+
+
+def item(feature, cas_number=None, id_inchi=None, **fields) -> dict:
+    return {
+        "feature": feature,
+        "identification_level": 2,
+        "id_inchi": id_inchi,
+        "cas_number": cas_number,
+        "method": "LC-MS",
+        **fields,
+    }
+
+
+async def features(session_factory) -> dict:
+    async with session_factory() as session:
+        result = await session.execute(select(Metabolite.id, Metabolite.feature))
+        return dict(result.all())
+
+
+@pytest.fixture
+def queries(engine):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+async def test_bulk_create_reports_each_item(client, session_factory, tyrosine_id):
+    response = await client.post(
+        "/metabolites/bulk",
+        json=[
+            item("L-Alanine", "56-41-7"),
+            item("L-Tyrosine", "0-00-0"),
+            item("Glycine", "56-40-6"),
+            item("Tyrosine", "60-18-4"),
+            item("Tyrosine methyl ester", id_inchi="InChI=1S/tyrosine"),
+            item("Glycine", "1-11-1"),
+            item("Serine", "56-40-6"),
+        ],
+    )
+    assert response.status_code == 200
+    results = response.json()
+
+    assert [result["index"] for result in results] == list(range(7))
+    assert [(result["status"], result["detail"]) for result in results] == [
+        ("created", None),
+        ("conflict", f"feature already used by metabolite {tyrosine_id}"),
+        ("created", None),
+        ("conflict", f"cas_number already used by metabolite {tyrosine_id}"),
+        ("conflict", f"inchi_hash already used by metabolite {tyrosine_id}"),
+        ("conflict", "feature duplicated in the request"),
+        ("conflict", "cas_number duplicated in the request"),
+    ]
+    stored = await features(session_factory)
+    assert stored[results[0]["id"]] == "L-Alanine"
+    assert stored[results[2]["id"]] == "Glycine"
+    assert len(stored) == 3
+
+
+async def test_bulk_update_reports_each_item(client, session_factory, tyrosine_id):
+    created = await client.post(
+        "/metabolites/bulk", json=[item("L-Alanine", "56-41-7")]
+    )
+    alanine_id = created.json()[0]["id"]
+
+    response = await client.put(
+        "/metabolites/bulk",
+        json=[
+            # Keeping its own unique values is not a conflict.
+            item("L-Tyrosine", "60-18-4", "InChI=1S/tyrosine", id=tyrosine_id),
+            item("Alanine", "60-18-4", id=alanine_id),
+            item("Glycine", "56-40-6", id=9999),
+            item("Alanine", "56-41-7", id=alanine_id),
+            item("beta-Alanine", "107-95-9", id=alanine_id),
+        ],
+    )
+    assert response.status_code == 200
+
+    assert [
+        (result["index"], result["id"], result["status"], result["detail"])
+        for result in response.json()
+    ] == [
+        (0, tyrosine_id, "updated", None),
+        (
+            1,
+            alanine_id,
+            "conflict",
+            f"cas_number already used by metabolite {tyrosine_id}",
+        ),
+        (2, 9999, "not_found", None),
+        (3, alanine_id, "updated", None),
+        (4, alanine_id, "conflict", "id duplicated in the request"),
+    ]
+    stored = await features(session_factory)
+    assert stored == {tyrosine_id: "L-Tyrosine", alanine_id: "Alanine"}
+
+
+async def test_bulk_delete_reports_each_id(client, session_factory, tyrosine_id):
+    response = await client.post(
+        "/metabolites/bulk/delete", json={"ids": [9999, tyrosine_id]}
+    )
+    assert response.status_code == 200
+    assert response.json() == [
+        {"index": 0, "id": 9999, "status": "not_found", "detail": None},
+        {"index": 1, "id": tyrosine_id, "status": "deleted", "detail": None},
+    ]
+    assert await features(session_factory) == {}
+
+
+async def test_find_conflicts_runs_one_query(
+    session_factory, tyrosine_id, queries
+):
+    items = [
+        MetaboliteCreate(**item(f"feature-{i}", f"cas-{i}", f"InChI=1S/C{i}"))
+        for i in range(50)
+    ]
+    items.append(MetaboliteCreate(**item("other", "60-18-4")))
+
+    async with session_factory() as session:
+        queries.clear()
+        conflicts = await find_conflicts(session, items)
+
+    assert conflicts == {50: f"cas_number already used by metabolite {tyrosine_id}"}
+    assert len(queries) == 1
@@ -0,0 +1,138 @@
+"""
+Read-through metabolite cache on the Redis backend, with a fake client.
+"""
+import sys
+import types
+
+import pytest
+from sqlalchemy import update
+from msio.backend.core.cache import RedisCacheBackend, metabolite_cache
+from msio.backend.database.models import Metabolite
+
+
+class FakeRedis:
+    """
+    In-memory stand-in for `redis.asyncio.Redis`, on a manual clock.
+    """
+
+    def __init__(self):
+        self.now_ms = 0
+        self.entries = {}
+
+    async def get(self, key):
+        expires_at, value = self.entries.get(key, (None, None))
+        if expires_at is not None and expires_at <= self.now_ms:
+            del self.entries[key]
+            return None
+        return value
+
+    async def set(self, key, value, ex=None, px=None):
+        # Redis rejects a null or negative expiration.
+        if (ex is not None and ex <= 0) or (px is not None and px <= 0):
+            raise ValueError("invalid expire time in 'set' command")
+        ttl_ms = px if px is not None else ex * 1000 if ex is not None else None
+        expires_at = self.now_ms + ttl_ms if ttl_ms is not None else None
+        self.entries[key] = (expires_at, value.encode())
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.entries.pop(key, None)
+
+    def advance(self, seconds: float) -> None:
+        self.now_ms += round(seconds * 1000)
+
+
+@pytest.fixture
+def redis_client(monkeypatch):
+    client = FakeRedis()
+    redis = types.ModuleType("redis")
+    redis.asyncio = types.SimpleNamespace(from_url=lambda url: client)
+    monkeypatch.setitem(sys.modules, "redis", redis)
+    return client
+
+
+@pytest.fixture
+def cache(redis_client, monkeypatch):
+    monkeypatch.setattr(
+        metabolite_cache, "backend", RedisCacheBackend("redis://test", 0.5)
+    )
+    monkeypatch.setattr(metabolite_cache, "hits", 0)
+    monkeypatch.setattr(metabolite_cache, "misses", 0)
+    return metabolite_cache
+
+
+@pytest.fixture
+async def metabolite_id(session_factory, current_user):
+    async with session_factory() as session:
+        metabolite = Metabolite(
+            feature="L-Tyrosine",
+            identification_level=1,
+            cas_number="60-18-4",
+            method="LC-MS",
+        )
+        session.add(metabolite)
+        await session.commit()
+        return metabolite.id
+
+
+async def set_feature_in_database(session_factory, metabolite_id, feature):
+    async with session_factory() as session:
+        await session.execute(
+            update(Metabolite)
+            .where(Metabolite.id == metabolite_id)
+            .values(feature=feature)
+        )
+        await session.commit()
+
+
+async def test_sub_second_ttl_expires(redis_client):
+    backend = RedisCacheBackend("redis://test", 0.25)
+    await backend.set("key", {"a": 1})
+    redis_client.advance(0.2)
+    assert await backend.get("key") == {"a": 1}
+    redis_client.advance(0.05)
+    assert await backend.get("key") is None
+
+
+async def test_read_through(client, cache, session_factory, metabolite_id):
+    response = await client.get(f"/metabolites/{metabolite_id}")
+    assert response.status_code == 200
+    assert response.json()["feature"] == "L-Tyrosine"
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    # A change behind the API's back is not seen while the entry lives.
+    await set_feature_in_database(session_factory, metabolite_id, "Tyrosine")
+    response = await client.get(f"/metabolites/{metabolite_id}")
+    assert response.json()["feature"] == "L-Tyrosine"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    response = await client.get("/metabolites/lookup", params={"cas_number": "60-18-4"})
+    assert response.json()["id"] == metabolite_id
+    assert cache.hits == 2
+
+
+async def test_write_invalidates(client, cache, session_factory, metabolite_id):
+    await client.get(f"/metabolites/{metabolite_id}")
+    await set_feature_in_database(session_factory, metabolite_id, "Tyrosine")
+
+    response = await client.patch(
+        f"/metabolites/{metabolite_id}", json={"method": "GC-MS"}
+    )
+    assert response.status_code == 200
+
+    response = await client.get(f"/metabolites/{metabolite_id}")
+    assert response.json()["feature"] == "Tyrosine"
+    assert response.json()["method"] == "GC-MS"
+    assert cache.misses == 2
+
+
+async def test_entries_expire(
+    client, cache, redis_client, session_factory, metabolite_id
+):
+    await client.get(f"/metabolites/{metabolite_id}")
+    await set_feature_in_database(session_factory, metabolite_id, "Tyrosine")
+
+    redis_client.advance(0.5)
+    response = await client.get(f"/metabolites/{metabolite_id}")
+    assert response.json()["feature"] == "Tyrosine"
+    assert (cache.hits, cache.misses) == (0, 2)
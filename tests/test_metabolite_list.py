@@ -0,0 +1,143 @@
+"""
+Keyset pagination of GET /metabolites/ and the identification level range
+shared by the listing filter and the writes.
+"""
+import base64
+import json
+
+import pytest
+from msio.backend.database.models import Metabolite
+
+# Identification levels with ties, so the `id` tie-breaker is needed.
+LEVELS = {
+    "alanine": 2,
+    "arginine": 1,
+    "cysteine": 3,
+    "glycine": 2,
+    "histidine": 1,
+    "leucine": 2,
+    "lysine": 5,
+    "serine": 2,
+    "tyrosine": 1,
+    "valine": 3,
+}
+
+pytestmark = pytest.mark.parametrize("engine", ["sqlite", "postgresql"], indirect=True)
+
+
+@pytest.fixture
+async def metabolites(session_factory, current_user):
+    async with session_factory() as session:
+        # Inserted out of name order, so the id and feature orders differ.
+        session.add_all(
+            Metabolite(
+                feature=feature,
+                identification_level=level,
+                cas_number=f"cas-{feature}",
+                method="LC-MS",
+            )
+            for feature, level in sorted(LEVELS.items(), key=lambda item: item[1])
+        )
+        await session.commit()
+
+
+def cursor(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+async def list_page(client, **params):
+    response = await client.get("/metabolites/", params=params)
+    assert response.status_code == 200
+    return response.json()
+
+
+async def list_all(client, **params) -> list[dict]:
+    items, page_cursor = [], None
+    while True:
+        if page_cursor is not None:
+            params["cursor"] = page_cursor
+        page = await list_page(client, limit=3, **params)
+        assert len(page["items"]) <= 3
+        items += page["items"]
+        page_cursor = page["next_cursor"]
+        if page_cursor is None:
+            return items
+
+
+@pytest.mark.parametrize("order", ["asc", "desc"])
+@pytest.mark.parametrize("sort", ["id", "feature", "identification_level"])
+async def test_pages_follow_the_sort_order(client, metabolites, sort, order):
+    items = await list_all(client, sort=sort, order=order)
+
+    keys = [(item[sort], item["id"]) for item in items]
+    assert keys == sorted(keys, reverse=order == "desc")
+    assert sorted(item["feature"] for item in items) == sorted(LEVELS)
+
+
+async def test_cursor_holds_the_last_sort_value_and_id(client, metabolites):
+    page = await list_page(client, sort="identification_level", limit=2)
+
+    last = page["items"][-1]
+    decoded = json.loads(base64.urlsafe_b64decode(page["next_cursor"]))
+    assert decoded == [last["identification_level"], last["id"]]
+
+    # Only the last page has no cursor.
+    page = await list_page(client, limit=len(LEVELS))
+    assert page["next_cursor"] is None
+
+
+async def test_filters_apply_to_every_page(client, metabolites):
+    items = await list_all(client, sort="feature", identification_level=2)
+    assert [item["feature"] for item in items] == [
+        "alanine",
+        "glycine",
+        "leucine",
+        "serine",
+    ]
+
+
+@pytest.mark.parametrize(
+    "sort, page_cursor",
+    [
+        ("id", "not base64!"),
+        ("id", base64.urlsafe_b64encode(b"not json").decode()),
+        ("id", cursor([1])),
+        ("id", cursor(["1", 1])),
+        ("feature", cursor([1, 1])),
+        ("identification_level", cursor([2, "1"])),
+    ],
+    ids=["base64", "json", "length", "id-type", "feature-type", "last-id-type"],
+)
+async def test_invalid_cursor_is_rejected(client, metabolites, sort, page_cursor):
+    response = await client.get(
+        "/metabolites/", params={"sort": sort, "cursor": page_cursor}
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+@pytest.mark.parametrize("level", [0, 6])
+async def test_identification_level_out_of_range(client, metabolites, level):
+    response = await client.get("/metabolites/", params={"identification_level": level})
+    assert response.status_code == 422
+
+    payload = {"feature": "proline", "cas_number": "147-85-3", "method": "LC-MS"}
+    response = await client.post(
+        "/metabolites/", json={**payload, "identification_level": level}
+    )
+    assert response.status_code == 422
+
+    metabolite_id = (await list_page(client, limit=1))["items"][0]["id"]
+    response = await client.patch(
+        f"/metabolites/{metabolite_id}", json={"identification_level": level}
+    )
+    assert response.status_code == 422
+
+
+async def test_missing_identification_level_defaults_to_3(client, metabolites):
+    payload = {"feature": "proline", "cas_number": "147-85-3", "method": "LC-MS"}
+    response = await client.post(
+        "/metabolites/", json={**payload, "identification_level": ""}
+    )
+    assert response.status_code == 201
+    assert response.json()["identification_level"] == 3
@@ -0,0 +1,107 @@
+"""
+Ranking and pagination of GET /metabolites/search, on SQLite (in-process
+trigram index).
+"""
+import pytest
+from msio.backend.database.models import Metabolite
+
+FEATURES = [
+    "L-Tyrosine",
+    "Tyrosine methyl ester",
+    "3-Nitro-L-tyrosine",
+    "Tyramine",
+    "L-Phenylalanine",
+    "Phenylacetaldehyde",
+    "N-Acetyl-L-phenylalanine",
+    "Glucose",
+    "L-Phenylalanyl-L-tyrosine",
+    "Tyrosol",
+]
+
+
+@pytest.fixture
+async def metabolites(session_factory, current_user):
+    async with session_factory() as session:
+        session.add_all(
+            Metabolite(
+                feature=feature,
+                identification_level=1,
+                cas_number=f"cas-{index}",
+                method="LC-MS",
+            )
+            for index, feature in enumerate(FEATURES)
+        )
+        await session.commit()
+
+
+async def search(client, q, limit=20, offset=0):
+    response = await client.get(
+        "/metabolites/search", params={"q": q, "limit": limit, "offset": offset}
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.mark.parametrize(
+    "q, expected",
+    [
+        (
+            "tyrosin",
+            [
+                "L-Tyrosine",
+                "Tyrosine methyl ester",
+                "3-Nitro-L-tyrosine",
+                "L-Phenylalanyl-L-tyrosine",
+                "Tyrosol",
+            ],
+        ),
+        (
+            "L-phenyl",
+            [
+                "N-Acetyl-L-phenylalanine",
+                "L-Phenylalanyl-L-tyrosine",
+                "L-Phenylalanine",
+                "Phenylacetaldehyde",
+            ],
+        ),
+    ],
+)
+async def test_search_ranking(client, metabolites, q, expected):
+    page = await search(client, q)
+    assert [item["feature"] for item in page["items"]] == expected
+    scores = [item["score"] for item in page["items"]]
+    assert scores == sorted(scores, reverse=True)
+    assert page["next_offset"] is None
+
+
+@pytest.mark.parametrize("q", ["tyrosin", "L-phenyl"])
+async def test_search_pagination(client, metabolites, q):
+    ranked = [item["feature"] for item in (await search(client, q))["items"]]
+
+    features = []
+    offset = 0
+    while offset is not None:
+        page = await search(client, q, limit=2, offset=offset)
+        assert len(page["items"]) <= 2
+        features += [item["feature"] for item in page["items"]]
+        offset = page["next_offset"]
+    assert features == ranked
+
+
+async def test_search_sees_writes(client, metabolites):
+    page = await search(client, "tyrosin")
+    assert "Tyrosinamide" not in [item["feature"] for item in page["items"]]
+
+    response = await client.post(
+        "/metabolites/",
+        json={
+            "feature": "Tyrosinamide",
+            "identification_level": 2,
+            "cas_number": "cas-new",
+            "method": "LC-MS",
+        },
+    )
+    assert response.status_code == 201
+
+    page = await search(client, "tyrosin")
+    assert "Tyrosinamide" in [item["feature"] for item in page["items"]]
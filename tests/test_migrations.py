@@ -0,0 +1,89 @@
+"""
+Alembic migrations on PostgreSQL, the only database they support.
+
+Skipped unless TEST_POSTGRES_URL is set (see conftest.py). The pg_trgm
+extension must be available.
+"""
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+
+ROOT = Path(__file__).resolve().parents[1]
+
+INSERT_METABOLITE = text(
+    "INSERT INTO metabolites (feature, identification_level, cas_number, method) "
+    "VALUES (:feature, 1, :cas_number, 'LC-MS')"
+)
+
+
+def run_alembic(connection, name: str, revision: str) -> None:
+    alembic_config = Config(str(ROOT / "alembic.ini"))
+    alembic_config.set_main_option("script_location", str(ROOT / "migrations"))
+    alembic_config.attributes["connection"] = connection
+    getattr(command, name)(alembic_config, revision)
+
+
+async def migrate(engine, name: str, revision: str) -> None:
+    async with engine.begin() as connection:
+        await connection.run_sync(run_alembic, name, revision)
+
+
+async def unique_constraints(engine) -> set:
+    async with engine.connect() as connection:
+        result = await connection.execute(
+            text(
+                "SELECT conname FROM pg_constraint "
+                "WHERE conrelid = 'metabolites'::regclass AND contype = 'u'"
+            )
+        )
+        return set(result.scalars())
+
+
+async def assert_cas_number_unique(engine) -> None:
+    async with engine.begin() as connection:
+        await connection.execute(
+            INSERT_METABOLITE, {"feature": "formaldehyde", "cas_number": "50-00-0"}
+        )
+    with pytest.raises(IntegrityError):
+        async with engine.begin() as connection:
+            await connection.execute(
+                INSERT_METABOLITE, {"feature": "methanal", "cas_number": "50-00-0"}
+            )
+    async with engine.begin() as connection:
+        await connection.execute(text("DELETE FROM metabolites"))
+
+
+async def test_upgrade_keeps_cas_number_unique(postgres_engine):
+    await migrate(postgres_engine, "upgrade", "head")
+
+    assert await unique_constraints(postgres_engine) == {
+        "uniq_inchi_hash",
+        "uniq_cas_number",
+    }
+    await assert_cas_number_unique(postgres_engine)
+
+
+async def test_downgrade_keeps_cas_number_unique(postgres_engine):
+    await migrate(postgres_engine, "upgrade", "head")
+    await migrate(postgres_engine, "downgrade", "3c9b2e7d4f18")
+
+    assert "metabolites_cas_number_key" in await unique_constraints(postgres_engine)
+    await assert_cas_number_unique(postgres_engine)
+
+    await migrate(postgres_engine, "upgrade", "head")
+    await assert_cas_number_unique(postgres_engine)
+
+
+async def test_upgrade_adds_missing_cas_number_constraint(postgres_engine):
+    await migrate(postgres_engine, "upgrade", "3c9b2e7d4f18")
+    async with postgres_engine.begin() as connection:
+        await connection.execute(
+            text("ALTER TABLE metabolites DROP CONSTRAINT metabolites_cas_number_key")
+        )
+    await migrate(postgres_engine, "upgrade", "head")
+
+    await assert_cas_number_unique(postgres_engine)
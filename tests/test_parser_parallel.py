@@ -0,0 +1,97 @@
+"""
+Parallel CSV validation (byte ranges validated in worker processes) must
+yield the same rows and errors as the sequential parser.
+"""
+import csv
+import io
+
+import pytest
+from msio.backend.core.parser import (
+    CSV_COLUMNS,
+    iter_csv_chunks,
+    iter_csv_chunks_parallel,
+    split_byte_ranges,
+)
+
+ROW_COUNT = 300
+
+
+def metabolite_rows() -> list[list[str]]:
+    rows = []
+    for i in range(ROW_COUNT):
+        inchi = f"InChI=1S/C{i}H{i + 1}O/c{i}"
+        if i % 7 == 0:
+            # Wrapped InChI: a quoted field spanning two lines.
+            inchi = f"InChI=1S/C{i}H{i + 1}O\n/c{i}-wrapped"
+        method = f'LC "{i % 3}" MS' if i % 11 == 0 else "LC-MS"
+        sample_data = "ND" if i % 5 == 0 else f"{i / 10}"
+        if i % 37 == 0:
+            sample_data = "not a number"
+        rows.append([f"feature-{i}", str(i % 5 + 1), inchi, "", method, sample_data])
+    # Same feature, another InChI: rejected by the uniqueness check.
+    rows.append(["feature-1", "1", "InChI=1S/other", "", "LC-MS", "1"])
+    return rows
+
+
+@pytest.fixture(params=["\n", "\r\n"], ids=["lf", "crlf"])
+def csv_path(request, tmp_path):
+    output = io.StringIO(newline="")
+    writer = csv.writer(output, lineterminator=request.param)
+    writer.writerow(CSV_COLUMNS.values())
+    writer.writerows(metabolite_rows())
+    path = tmp_path / "metabolites.csv"
+    path.write_bytes(output.getvalue().encode("utf-8"))
+    return path
+
+
+def test_byte_ranges_cover_the_data_and_end_on_records(csv_path):
+    header, ranges = split_byte_ranges(csv_path, chunk_bytes=512)
+
+    assert header == list(CSV_COLUMNS.values())
+    assert len(ranges) > 10
+    data = csv_path.read_bytes()
+    assert ranges[0][0] == data.index(b"\n") + 1
+    assert ranges[-1][1] == len(data)
+    assert all(end == start for (_, end), (start, _) in zip(ranges, ranges[1:]))
+
+    records = []
+    for start, end in ranges:
+        text = data[start:end].decode("utf-8")
+        records += list(csv.reader(io.StringIO(text, newline="")))
+    assert records == metabolite_rows()
+
+
+@pytest.mark.parametrize("chunk_bytes", [256, 4096])
+def test_parallel_validation_matches_sequential(csv_path, chunk_bytes):
+    sequential_errors, parallel_errors = [], []
+    sequential = [
+        row.model_dump()
+        for chunk in iter_csv_chunks(csv_path, 64, errors=sequential_errors)
+        for row in chunk
+    ]
+    parallel_chunks = list(
+        iter_csv_chunks_parallel(
+            csv_path, 64, workers=2, chunk_bytes=chunk_bytes, errors=parallel_errors
+        )
+    )
+
+    assert [len(chunk) for chunk in parallel_chunks[:-1]] == [64] * (
+        len(parallel_chunks) - 1
+    )
+    assert [row.model_dump() for chunk in parallel_chunks for row in chunk] == (
+        sequential
+    )
+    assert parallel_errors == sequential_errors
+    # Invalid sample data, and the repeated feature on the last line.
+    assert len(sequential_errors) == len(range(0, ROW_COUNT, 37)) + 1
+
+
+def test_parallel_validation_raises_on_first_invalid_line(csv_path):
+    with pytest.raises(ValueError) as sequential:
+        list(iter_csv_chunks(csv_path, 64))
+    with pytest.raises(ValueError) as parallel:
+        list(iter_csv_chunks_parallel(csv_path, 64, workers=2, chunk_bytes=256))
+
+    assert str(parallel.value) == str(sequential.value)
+    # The first row, a wrapped InChI, ends on line 3.
+    assert str(sequential.value).startswith("Error in line 3:")
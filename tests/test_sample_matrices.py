@@ -0,0 +1,146 @@
+"""
+Wide feature x sample files: the matrix loader of the ETL and the vector and
+column endpoints, on SQLite and, if TEST_POSTGRES_URL is set, PostgreSQL.
+"""
+import csv
+
+import insert_db
+import pytest
+from sqlalchemy import func, select
+from msio.backend.database.models import Metabolite, SampleMatrix, SampleVector
+
+HEADER = ["Features", "Identification_level", "ID_InChI", "CAS_number", "Method"]
+SAMPLES = ["S1", "S2", "S3"]
+
+ROWS = [
+    ["alanine", "1", "InChI=1S/alanine", "56-41-7", "LC-MS", "1.5", "ND", "2"],
+    ["glycine", "2", "", "56-40-6", "LC-MS", "0.25", "3", ""],
+    ["serine", "1", "InChI=1S/serine", "", "GC-MS", "NA", "4.5", "1e3"],
+    ["valine", "3", "", "72-18-4", "LC-MS", "7", "8", "9"],
+]
+
+
+# Every test runs on both databases (see the engine fixture).
+pytestmark = pytest.mark.parametrize("engine", ["sqlite", "postgresql"], indirect=True)
+
+
+@pytest.fixture(autouse=True)
+def loader_engine(engine, monkeypatch):
+    monkeypatch.setattr(insert_db, "engine", engine)
+
+
+def write_matrix(path, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER + SAMPLES)
+        writer.writerows(rows)
+    return path
+
+
+async def count(engine, model) -> int:
+    async with engine.connect() as connection:
+        return await connection.scalar(select(func.count()).select_from(model))
+
+
+async def metabolite_ids(engine) -> dict:
+    async with engine.connect() as connection:
+        result = await connection.execute(select(Metabolite.feature, Metabolite.id))
+        return dict(result.all())
+
+
+async def test_load_matrix_stores_one_vector_per_feature(
+    engine, client, current_user, tmp_path
+):
+    await insert_db.load_matrix(write_matrix(tmp_path / "m.csv", ROWS), "m", 3)
+    ids = await metabolite_ids(engine)
+
+    response = await client.get("/sample-matrices/")
+    assert response.status_code == 200
+    [matrix] = response.json()
+    assert (matrix["name"], matrix["samples"]) == ("m", SAMPLES)
+
+    response = await client.get(f"/metabolites/{ids['serine']}/samples")
+    assert response.status_code == 200
+    assert response.json() == {
+        "metabolite_id": ids["serine"],
+        "vectors": [
+            {"matrix_id": matrix["id"], "samples": SAMPLES, "values": [None, 4.5, 1e3]}
+        ],
+    }
+
+    response = await client.get(f"/sample-matrices/{matrix['id']}/samples/S2")
+    assert response.status_code == 200
+    by_id = sorted((ids[row[0]], row[6]) for row in ROWS)
+    assert response.json() == {
+        "matrix_id": matrix["id"],
+        "sample": "S2",
+        "metabolite_ids": [metabolite_id for metabolite_id, _ in by_id],
+        "values": [None if value == "ND" else float(value) for _, value in by_id],
+    }
+
+
+async def test_sample_column_of_unknown_sample_or_matrix(
+    client, current_user, tmp_path
+):
+    await insert_db.load_matrix(write_matrix(tmp_path / "m.csv", ROWS), "m")
+
+    response = await client.get("/sample-matrices/1/samples/S9")
+    assert response.status_code == 404
+    response = await client.get("/sample-matrices/9/samples/S1")
+    assert response.status_code == 404
+
+
+async def test_load_matrix_reuses_matching_metabolites(engine, tmp_path):
+    path = write_matrix(tmp_path / "m.csv", ROWS)
+    await insert_db.load_matrix(path, "first", 3)
+    await insert_db.load_matrix(path, "second", 3)
+
+    assert await count(engine, Metabolite) == len(ROWS)
+    assert await count(engine, SampleMatrix) == 2
+    assert await count(engine, SampleVector) == 2 * len(ROWS)
+
+
+async def test_load_matrix_rejects_repeated_feature(engine, tmp_path):
+    # The repeat is in the second batch: the first one is not kept either.
+    path = write_matrix(tmp_path / "m.csv", ROWS + [ROWS[0]])
+
+    with pytest.raises(ValueError, match="repeated in the file: alanine"):
+        await insert_db.load_matrix(path, "m", 3)
+
+    assert await count(engine, SampleMatrix) == 0
+    assert await count(engine, Metabolite) == 0
+
+
+@pytest.mark.parametrize("column", [2, 3], ids=["inchi", "cas_number"])
+async def test_load_matrix_rejects_identifiers_of_other_metabolites(
+    engine, tmp_path, column
+):
+    await insert_db.load_matrix(write_matrix(tmp_path / "m.csv", ROWS[:1]), "first")
+    row = ["beta-alanine", "1", "", "", "LC-MS", "1", "2", "3"]
+    row[column] = ROWS[0][column]
+    path = write_matrix(tmp_path / "other.csv", ROWS[1:] + [row])
+
+    with pytest.raises(ValueError, match="already used by other metabolites"):
+        await insert_db.load_matrix(path, "second", 2)
+
+    assert await count(engine, SampleMatrix) == 1
+    assert set(await metabolite_ids(engine)) == {"alanine"}
+
+
+@pytest.mark.parametrize(
+    "column, value",
+    [(2, ""), (3, "50-00-0"), (4, "GC-MS")],
+    ids=["inchi", "cas_number", "method"],
+)
+async def test_load_matrix_rejects_mismatched_metabolite(
+    engine, tmp_path, column, value
+):
+    await insert_db.load_matrix(write_matrix(tmp_path / "m.csv", ROWS), "first")
+    row = list(ROWS[0])
+    row[column] = value
+    path = write_matrix(tmp_path / "other.csv", [row])
+
+    with pytest.raises(ValueError, match="other identifiers or method: alanine"):
+        await insert_db.load_matrix(path, "second")
+
+    assert await count(engine, SampleMatrix) == 1
@@ -0,0 +1,147 @@
+"""
+Upload ingestion jobs: POST /metabolites/uploads stores the file and a
+background job parses and loads it, reported by GET /metabolites/uploads/{id}.
+"""
+import asyncio
+import csv
+import io
+
+import pytest
+from sqlalchemy import func, select
+from msio.backend.api.v1.metabolites import ingest
+from msio.backend.core.config import config
+from msio.backend.core.parser import CSV_COLUMNS
+from msio.backend.database.models import Metabolite
+
+
+@pytest.fixture(autouse=True)
+def ingest_config(session_factory, tmp_path, monkeypatch):
+    monkeypatch.setattr(ingest, "AsyncSessionLocal", session_factory)
+    monkeypatch.setattr(config, "INGEST_UPLOAD_DIR", tmp_path)
+    monkeypatch.setattr(config, "INGEST_CHUNK_SIZE", 2)
+    monkeypatch.setattr(config, "INGEST_PARSE_WORKERS", 1)
+
+
+@pytest.fixture
+async def existing_metabolite(session_factory, current_user):
+    async with session_factory() as session:
+        session.add(
+            Metabolite(
+                feature="L-Tyrosine",
+                identification_level=1,
+                cas_number="60-18-4",
+                method="LC-MS",
+            )
+        )
+        await session.commit()
+
+
+def csv_body(rows) -> bytes:
+    output = io.StringIO(newline="")
+    writer = csv.writer(output)
+    writer.writerow(CSV_COLUMNS.values())
+    writer.writerows(rows)
+    return output.getvalue().encode("utf-8")
+
+
+async def upload(client, body: bytes, filename: str = "metabolites.csv"):
+    return await client.post(
+        "/metabolites/uploads", params={"filename": filename}, content=body
+    )
+
+
+async def wait_for_job(client, job_id: str) -> dict:
+    for _ in range(500):
+        response = await client.get(f"/metabolites/uploads/{job_id}")
+        assert response.status_code == 200
+        job = response.json()
+        if job["status"] in ("succeeded", "failed"):
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"job still {job['status']}")
+
+
+async def metabolite_count(session_factory) -> int:
+    async with session_factory() as session:
+        return await session.scalar(select(func.count()).select_from(Metabolite))
+
+
+async def test_job_loads_valid_rows_and_counts_rejected_ones(
+    client, session_factory, existing_metabolite, tmp_path
+):
+    body = csv_body(
+        [
+            ["alanine", "1", "", "56-41-7", "LC-MS", "1.5"],
+            ["glycine", "2", "", "56-40-6", "LC-MS", "ND"],
+            ["serine", "1", "", "", "LC-MS", "2"],
+            ["tyrosine", "1", "", "60-18-4", "LC-MS", "3"],
+            ["valine", "3", "", "72-18-4", "GC-MS", "4"],
+        ]
+    )
+    response = await upload(client, body)
+    assert response.status_code == 202
+    queued = response.json()
+    assert (queued["status"], queued["filename"]) == ("queued", "metabolites.csv")
+
+    job = await wait_for_job(client, queued["id"])
+
+    assert job["status"] == "succeeded"
+    assert (job["rows_parsed"], job["rows_inserted"], job["rows_rejected"]) == (
+        5,
+        3,
+        2,
+    )
+    assert job["errors"][0].startswith("line 4: ")
+    assert job["errors"][1] == "tyrosine: cas_number already used by metabolite 1"
+    assert job["started_at"] is not None and job["finished_at"] is not None
+    assert await metabolite_count(session_factory) == 4
+    # The upload is removed once the job ends.
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_chunk_rejected_by_the_database_is_counted(
+    client, session_factory, existing_metabolite, monkeypatch
+):
+    async def no_conflicts(db, items):
+        return {}
+
+    # A row written by someone else between the check and the insert.
+    monkeypatch.setattr(ingest, "find_conflicts", no_conflicts)
+    body = csv_body(
+        [
+            ["alanine", "1", "", "56-41-7", "LC-MS", "1.5"],
+            ["glycine", "2", "", "56-40-6", "LC-MS", "ND"],
+            ["tyrosine", "1", "", "60-18-4", "LC-MS", "3"],
+        ]
+    )
+    job = await wait_for_job(client, (await upload(client, body)).json()["id"])
+
+    assert job["status"] == "succeeded"
+    assert (job["rows_inserted"], job["rows_rejected"]) == (2, 1)
+    assert job["errors"] == ["Concurrent write conflict, chunk skipped"]
+    assert await metabolite_count(session_factory) == 3
+
+
+async def test_unreadable_file_fails_the_job(client, current_user, tmp_path):
+    response = await upload(client, b"not a workbook", "metabolites.xlsx")
+    job = await wait_for_job(client, response.json()["id"])
+
+    assert job["status"] == "failed"
+    assert job["detail"]
+    assert job["rows_inserted"] == 0
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_upload_is_rejected_before_any_job(
+    client, current_user, tmp_path, monkeypatch
+):
+    response = await upload(client, b"", "metabolites.txt")
+    assert response.status_code == 415
+
+    monkeypatch.setattr(config, "INGEST_MAX_UPLOAD_BYTES", 10)
+    response = await upload(client, csv_body([]))
+    assert response.status_code == 413
+    assert list(tmp_path.iterdir()) == []
+
+    response = await client.get("/metabolites/uploads/unknown")
+    assert response.status_code == 404
@@ -0,0 +1,113 @@
+"""
+Validation report of the ETL (report.py) on tests/data/report_issues.csv:
+duplicates within the file and, with --check-db, identifiers already in
+the database.
+"""
+import argparse
+from pathlib import Path
+
+import pytest
+import report
+from msio.backend.core.config import Config
+from msio.backend.core.identifiers import inchi_hash
+from msio.backend.database.models import Metabolite
+
+REPORT_FILE = Path(__file__).parent / "data" / "report_issues.csv"
+
+# Issues of the file on its own, as (line, kind, column, value, message).
+FILE_ISSUES = [
+    (4, "duplicate", "Features", "alanine", "feature already used on line 2"),
+    (5, "invalid", "Identification_level", "high", None),
+    (6, "duplicate", "CAS_number", "56-40-6", "cas_number already used on line 3"),
+    (7, "duplicate", "Features", "alanine", "feature already used on line 2"),
+]
+
+
+@pytest.fixture
+async def stored_ids(session_factory) -> dict:
+    async with session_factory() as session:
+        metabolites = [
+            Metabolite(
+                feature="leucine",
+                identification_level=1,
+                cas_number="61-90-5",
+                method="LC-MS",
+            ),
+            Metabolite(
+                feature="L-Tyrosine",
+                identification_level=1,
+                id_inchi="InChI=1S/tyrosine",
+                inchi_hash=inchi_hash("InChI=1S/tyrosine"),
+                method="LC-MS",
+            ),
+        ]
+        session.add_all(metabolites)
+        await session.commit()
+        return {metabolite.feature: metabolite.id for metabolite in metabolites}
+
+
+def issue_tuples(validation_report) -> list[tuple]:
+    return [
+        (
+            issue["line"],
+            issue["kind"],
+            issue["column"],
+            issue["value"],
+            issue["message"] if issue["kind"] != "invalid" else None,
+        )
+        for issue in sorted(validation_report.issues, key=lambda i: i["line"])
+    ]
+
+
+def cli_args(check_db: bool) -> argparse.Namespace:
+    return argparse.Namespace(csv_path=REPORT_FILE, check_db=check_db, batch_size=2)
+
+
+@pytest.mark.parametrize("chunk_size", [2, 100])
+async def test_duplicates_cite_the_first_line(chunk_size):
+    validation_report = await report.validate_file(REPORT_FILE, chunk_size)
+
+    # One issue per conflicting line, even when every column is repeated.
+    assert issue_tuples(validation_report) == FILE_ISSUES
+    assert validation_report.summary() == {
+        "file": str(REPORT_FILE),
+        "rows": 9,
+        "invalid_rows": 4,
+        "issues": {"duplicate": 3, "invalid": 1},
+    }
+
+
+@pytest.mark.parametrize("engine", ["sqlite", "postgresql"], indirect=True)
+async def test_check_db_reports_identifiers_of_stored_metabolites(
+    engine, stored_ids, monkeypatch
+):
+    # Without --check-db, the database is not read.
+    validation_report = await report.main(cli_args(check_db=False))
+    assert issue_tuples(validation_report) == FILE_ISSUES
+
+    monkeypatch.setattr(Config, "create_async_engine", lambda self, **overrides: engine)
+    validation_report = await report.main(cli_args(check_db=True))
+
+    leucine, tyrosine = stored_ids["leucine"], stored_ids["L-Tyrosine"]
+    # Feature and CAS number of one metabolite: a single issue.
+    assert issue_tuples(validation_report) == FILE_ISSUES + [
+        (
+            8,
+            "database",
+            "Features",
+            "leucine",
+            f"feature already used by metabolite {leucine}",
+        ),
+        (
+            9,
+            "database",
+            "ID_InChI",
+            "InChI=1S/tyrosine",
+            f"id_inchi already used by metabolite {tyrosine}",
+        ),
+    ]
+    assert validation_report.summary()["issues"] == {
+        "duplicate": 3,
+        "invalid": 1,
+        "database": 2,
+    }